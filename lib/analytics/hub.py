@@ -14,6 +14,22 @@ Usage:
             return {"kind": "scene_patch", "sceneId": self.scene_id, "patch": {...}}
 
     asyncio.run(MySpecialist(bridge_url, scene_id, "my-specialist").reconnect())
+
+Pipeline mode (pipeline_workers > 0) takes process() and emit() off the
+socket reader: messages go into a bounded in-flight queue and N workers
+process them concurrently, keeping arrival order per ordering_key().
+
+    MySpecialist(bridge_url, scene_id, "my-specialist", pipeline_workers=4, queue_depth=64)
+
+CPU-bound specialists subclass CpuBoundSpecialist and implement the
+synchronous process_sync(message) instead; it runs in a thread or process
+pool so heavy math never blocks the socket (and its ping/pong).
+
+    class MyLifter(CpuBoundSpecialist):
+        def process_sync(self, message: dict) -> dict | None:
+            ...
+
+    MyLifter(bridge_url, scene_id, "lifter", pipeline_workers=8, executor="process")
 """
 
 from __future__ import annotations
@@ -22,13 +38,27 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
 
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
 logger = logging.getLogger(__name__)
 
+# Message fields that identify an entity, in the order ordering_key tries them.
+ORDERING_FIELDS = ("trackId", "entityId", "objectId")
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Connection and pipeline state: never pickled (see __getstate__).
+RUNTIME_ATTRIBUTES = ("_ws", "_executor", "_lanes", "_ready", "_slots")
+
+# In a CpuBoundSpecialist's process-pool worker: that worker's copy of the
+# subscriber, installed once when the worker starts.
+_worker_subscriber: CpuBoundSpecialist | None = None
+
 
 class SpecialistSubscriber(ABC):
     """
@@ -39,19 +69,69 @@ class SpecialistSubscriber(ABC):
       - scene_subscribe handshake
       - wait_for_scene_ready (protocolar — no sleep hacks)
       - Echo filtering via fromClientId
-      - Message loop
+      - Message loop (inline, or pipelined across workers)
       - Reconnect with exponential backoff
 
     Subclasses implement only: process(message) -> patch | None
+
+    Args:
+        pipeline_workers: 0 = process and emit each message inline in the
+            read loop. N > 0 = pipeline mode: N concurrent process()
+            workers; messages with the same ordering_key() are processed
+            and emitted in arrival order, other keys run concurrently.
+        queue_depth: Pipeline mode: most messages queued or in process at
+            once. When full, the reader stops reading the socket until a
+            worker finishes one (backpressure).
+        executor: Pool behind run_sync(): "thread" or "process".
+        executor_workers: Pool size; None = the executor's default (one
+            per core for processes).
     """
 
-    def __init__(self, bridge_url: str, scene_id: str, name: str):
+    def __init__(
+        self,
+        bridge_url: str,
+        scene_id: str,
+        name: str,
+        pipeline_workers: int = 0,
+        queue_depth: int = 64,
+        executor: str = "thread",
+        executor_workers: int | None = None,
+    ):
+        if pipeline_workers < 0:
+            raise ValueError("pipeline_workers must be >= 0")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be >= 1")
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(f"executor must be one of {EXECUTOR_KINDS}, got {executor!r}")
         self.bridge_url = bridge_url
         self.scene_id = scene_id
         self.name = name
+        self.pipeline_workers = pipeline_workers
+        self.queue_depth = queue_depth
+        self.executor_kind = executor
+        self.executor_workers = executor_workers
         self._ws = None
         self._running = False
         self._client_id: int | None = None
+        # Pipeline state, rebuilt on every run(): queued messages per key
+        # (a key is present while it has work queued or in process), keys
+        # ready for a worker, and free in-flight slots.
+        self._lanes: dict[Hashable, deque[dict]] = {}
+        self._ready: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        # Created on first run_sync() and kept across reconnects; see close().
+        self._executor: Executor | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Pickle without the connection, pool and pipeline state, so a bound
+        method such as process_sync can be sent to a process pool.
+        """
+        state = self.__dict__.copy()
+        for attribute in RUNTIME_ATTRIBUTES:
+            state[attribute] = None
+        state["_lanes"] = {}
+        return state
 
     # ──────────────────────────────────────────────
     # Abstract — subclasses implement this only
@@ -71,6 +151,19 @@ class SpecialistSubscriber(ABC):
         """
         pass
 
+    def ordering_key(self, message: dict) -> Hashable:
+        """
+        Pipeline mode: messages with equal keys keep their arrival order.
+
+        Default: the message's trackId, entityId or objectId (first one
+        present), else its sceneId. Override for coarser or finer ordering.
+        """
+        for field in ORDERING_FIELDS:
+            value = message.get(field)
+            if value is not None:
+                return (field, value)
+        return ("sceneId", message.get("sceneId"))
+
     # ──────────────────────────────────────────────
     # Network lifecycle (do not override unless needed)
     # ──────────────────────────────────────────────
@@ -129,29 +222,48 @@ class SpecialistSubscriber(ABC):
         """
         Full lifecycle: connect → subscribe → wait_ready → message loop.
         Exits cleanly on ConnectionClosed.
+
+        In pipeline mode, a loop that ends cleanly (stream end or stop())
+        waits for the queued messages; on a connection error they are
+        dropped with the workers.
         """
         self._running = True
         await self.connect()
         await self.subscribe()
         await self.wait_for_scene_ready()
 
+        workers = self._start_pipeline()
+        try:
+            await self._read_loop()
+            if workers:
+                await self._ready.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _read_loop(self) -> None:
         async for raw in self._ws:
             if not self._running:
                 break
             try:
                 message = json.loads(raw)
-                # Skip own echoes — fromClientId is in all bridge_* messages
-                if message.get("fromClientId") == self._client_id:
-                    continue
-                result = await self.process(message)
-                if result is not None:
-                    await self.emit(result)
             except json.JSONDecodeError as e:
                 logger.warning(f"[{self.name}] invalid JSON from bridge: {e}")
-            except Exception as e:
-                logger.error(
-                    f"[{self.name}] process() error: {e}", exc_info=True
-                )
+                continue
+            # Skip own echoes — fromClientId is in all bridge_* messages
+            if message.get("fromClientId") == self._client_id:
+                continue
+            if self.pipeline_workers:
+                try:
+                    key = self.ordering_key(message)
+                    hash(key)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] no ordering key for message: {e}")
+                    continue
+                await self._enqueue(key, message)
+            else:
+                await self._handle(message)
 
     async def reconnect(self, max_retries: int = 0) -> None:
         """
@@ -159,40 +271,129 @@ class SpecialistSubscriber(ABC):
 
         Args:
             max_retries: 0 = infinite retries (recommended for production).
+
+        The executor pool is kept across reconnects and closed on return.
         """
         attempt = 0
-        while max_retries == 0 or attempt < max_retries:
-            try:
-                await self.run()
-                # run() returned cleanly (self._running = False)
-                return
-            except (ConnectionClosed, WebSocketException, OSError) as e:
-                attempt += 1
-                delay = min(2 ** min(attempt, 6), 60)  # cap at 60s
-                logger.warning(
-                    f"[{self.name}] disconnected ({e}). "
-                    f"Reconnecting in {delay}s (attempt {attempt})"
-                )
-                await asyncio.sleep(delay)
-            except Exception as e:
-                logger.error(
-                    f"[{self.name}] unexpected error: {e}", exc_info=True
-                )
-                attempt += 1
-                await asyncio.sleep(5)
-
-        logger.error(
-            f"[{self.name}] max retries ({max_retries}) reached. Giving up."
-        )
+        try:
+            while max_retries == 0 or attempt < max_retries:
+                try:
+                    await self.run()
+                    # run() returned cleanly (self._running = False)
+                    return
+                except (ConnectionClosed, WebSocketException, OSError) as e:
+                    attempt += 1
+                    delay = min(2 ** min(attempt, 6), 60)  # cap at 60s
+                    logger.warning(
+                        f"[{self.name}] disconnected ({e}). "
+                        f"Reconnecting in {delay}s (attempt {attempt})"
+                    )
+                    await asyncio.sleep(delay)
+                except Exception as e:
+                    logger.error(
+                        f"[{self.name}] unexpected error: {e}", exc_info=True
+                    )
+                    attempt += 1
+                    await asyncio.sleep(5)
+
+            logger.error(
+                f"[{self.name}] max retries ({max_retries}) reached. Giving up."
+            )
+        finally:
+            self.close()
 
     def stop(self) -> None:
         """Signal the run loop to stop cleanly."""
         self._running = False
 
+    # ──────────────────────────────────────────────
+    # Executor offload
+    # ──────────────────────────────────────────────
+
+    def get_executor(self) -> Executor:
+        """The subscriber's pool, created on first use; it outlives reconnects."""
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.executor_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.executor_workers,
+                    thread_name_prefix=f"{self.name}-worker",
+                )
+        return self._executor
+
+    async def run_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) in the subscriber's pool and await its result,
+        leaving the event loop free meanwhile. With the process pool, func
+        and args are pickled.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get_executor(), func, *args)
+
+    def close(self) -> None:
+        """Shut the pool down; a later run_sync() starts a new one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     # ──────────────────────────────────────────────
     # Private helpers
     # ──────────────────────────────────────────────
 
+    async def _handle(self, message: dict) -> None:
+        """process() one message and emit its result; errors are logged, not raised."""
+        try:
+            result = await self.process(message)
+            if result is not None:
+                await self.emit(result)
+        except Exception as e:
+            logger.error(
+                f"[{self.name}] process() error: {e}", exc_info=True
+            )
+
+    def _start_pipeline(self) -> list[asyncio.Task]:
+        """Fresh pipeline state and worker tasks for one run(); none when inline."""
+        if not self.pipeline_workers:
+            return []
+        self._lanes = {}
+        self._ready = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.queue_depth)
+        return [
+            asyncio.create_task(self._pipeline_worker())
+            for _ in range(self.pipeline_workers)
+        ]
+
+    async def _enqueue(self, key: Hashable, message: dict) -> None:
+        """Queue a message on its key's lane, waiting for a free slot first."""
+        await self._slots.acquire()
+        lane = self._lanes.get(key)
+        if lane is None:
+            self._lanes[key] = deque([message])
+            self._ready.put_nowait(key)
+        else:
+            lane.append(message)
+
+    async def _pipeline_worker(self) -> None:
+        """
+        Take a ready key, handle the oldest message of its lane, then put
+        the key back at the end of the ready queue if more are waiting.
+        Only one worker holds a key at a time, which keeps per-key order.
+        """
+        while True:
+            key = await self._ready.get()
+            lane = self._lanes[key]
+            try:
+                await self._handle(lane[0])
+            finally:
+                lane.popleft()
+                self._slots.release()
+                if lane:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._lanes[key]
+                self._ready.task_done()
+
     async def _send(self, payload: dict) -> None:
         """Send a JSON payload to the bridge."""
         try:
@@ -200,3 +401,54 @@ class SpecialistSubscriber(ABC):
         except (ConnectionClosed, WebSocketException) as e:
             logger.warning(f"[{self.name}] send failed: {e}")
             raise
+
+
+class CpuBoundSpecialist(SpecialistSubscriber):
+    """
+    Specialist for synchronous, CPU-bound work.
+
+    Subclasses implement process_sync(message) -> patch | None; it runs in
+    the subscriber's pool (see run_sync) and its result is emitted like
+    process()'s. Combine with pipeline_workers to keep several messages in
+    the pool at once.
+
+    With executor="process", each worker process gets one pickled copy of
+    the subscriber when it starts, and only the message is sent per call.
+    process_sync runs on that copy: attributes it changes stay in the
+    worker, and attributes changed on the subscriber after the pool
+    started are not seen by it.
+    """
+
+    def get_executor(self) -> Executor:
+        if self._executor is None and self.executor_kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.executor_workers,
+                initializer=_install_worker_subscriber,
+                initargs=(self,),
+            )
+        return super().get_executor()
+
+    async def process(self, message: dict) -> Optional[dict]:
+        if self.executor_kind == "process":
+            return await self.run_sync(_process_sync_in_worker, message)
+        return await self.run_sync(self.process_sync, message)
+
+    @abstractmethod
+    def process_sync(self, message: dict) -> Optional[dict]:
+        """
+        Process an incoming bridge_* message off the event loop.
+
+        Returns:
+            A patch dict to emit back to the bridge, or None to skip.
+        """
+        pass
+
+
+def _install_worker_subscriber(subscriber: CpuBoundSpecialist) -> None:
+    """Process-pool initializer: keep this worker's copy of the subscriber."""
+    global _worker_subscriber
+    _worker_subscriber = subscriber
+
+
+def _process_sync_in_worker(message: dict) -> Optional[dict]:
+    return _worker_subscriber.process_sync(message)
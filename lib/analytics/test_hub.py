@@ -9,12 +9,15 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import threading
+import time
 from typing import Optional
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from lib.analytics.hub import SpecialistSubscriber
+from lib.analytics.hub import CpuBoundSpecialist, SpecialistSubscriber
 
 
 # ──────────────────────────────────────────────
@@ -199,3 +202,253 @@ async def test_specialist_is_abstract():
     """SpecialistSubscriber cannot be instantiated directly."""
     with pytest.raises(TypeError, match="process"):
         SpecialistSubscriber("ws://localhost", "scene-1", "test")
+
+
+# ──────────────────────────────────────────────
+# Pipeline mode
+# ──────────────────────────────────────────────
+
+class DelaySpecialist(SpecialistSubscriber):
+    """Sleeps message['delay'] seconds in process() and echoes the message id."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = 0
+        self.max_active = 0
+        self.finished: list[str] = []
+
+    async def process(self, message: dict) -> Optional[dict]:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(message.get("delay", 0.0))
+        self.active -= 1
+        self.finished.append(message["id"])
+        return {"kind": "scene_patch", "sceneId": self.scene_id, "patch": {"id": message["id"]}}
+
+
+def prepare_run(specialist: SpecialistSubscriber, ws: AsyncMock) -> None:
+    """Skip the network handshake so run() goes straight to the message loop."""
+    specialist.connect = AsyncMock()
+    specialist.subscribe = AsyncMock()
+    specialist.wait_for_scene_ready = AsyncMock()
+    specialist._ws = ws
+
+
+def sent_ids(ws: AsyncMock) -> list[str]:
+    return [json.loads(call.args[0])["patch"]["id"] for call in ws.send.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_order_per_key_and_runs_keys_concurrently():
+    """Same-track messages stay in order; other tracks overtake a slow one."""
+    specialist = DelaySpecialist("ws://localhost:8765", "scene-1", "test", pipeline_workers=3)
+    ws = make_ws_mock([
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "a1", "delay": 0.05},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "a2"},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "b", "id": "b1", "delay": 0.01},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "sceneId": "scene-1", "id": "s1"},
+    ])
+    prepare_run(specialist, ws)
+
+    await specialist.run()
+
+    ids = sent_ids(ws)
+    assert sorted(ids) == ["a1", "a2", "b1", "s1"]
+    assert ids.index("a1") < ids.index("a2")
+    assert ids.index("b1") < ids.index("a1")
+    assert ids.index("s1") < ids.index("a1")
+    assert specialist.max_active > 1
+    assert specialist._lanes == {}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_queue_depth_applies_backpressure():
+    """With every slot taken, the reader stops pulling from the socket."""
+    gate = asyncio.Event()
+    pulled = []
+
+    class GatedSpecialist(SpecialistSubscriber):
+        async def process(self, message: dict) -> Optional[dict]:
+            await gate.wait()
+            return None
+
+    specialist = GatedSpecialist("ws://localhost:8765", "scene-1", "test", pipeline_workers=1, queue_depth=2)
+    ws = make_ws_mock([])
+
+    async def _aiter_messages():
+        for index in range(6):
+            pulled.append(index)
+            yield json.dumps({"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": index})
+
+    ws.__aiter__ = lambda self: _aiter_messages()
+    prepare_run(specialist, ws)
+
+    run = asyncio.create_task(specialist.run())
+    await asyncio.sleep(0.05)
+    # Two messages fill the queue; the reader holds a third, waiting for a slot.
+    assert pulled == [0, 1, 2]
+    gate.set()
+    await asyncio.wait_for(run, timeout=2.0)
+    assert pulled == [0, 1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_worker_errors_are_logged_and_skipped():
+    """A failing message does not stop its key's later messages."""
+
+    class FlakySpecialist(DelaySpecialist):
+        async def process(self, message: dict) -> Optional[dict]:
+            if message["id"] == "bad":
+                raise RuntimeError("boom")
+            return await super().process(message)
+
+    specialist = FlakySpecialist("ws://localhost:8765", "scene-1", "test", pipeline_workers=2)
+    ws = make_ws_mock([
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "bad"},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "a2"},
+    ])
+    prepare_run(specialist, ws)
+
+    await specialist.run()
+
+    assert sent_ids(ws) == ["a2"]
+
+
+def test_pipeline_arguments_are_validated():
+    with pytest.raises(ValueError, match="pipeline_workers"):
+        EchoSpecialist("ws://localhost", "scene-1", "test", pipeline_workers=-1)
+    with pytest.raises(ValueError, match="queue_depth"):
+        EchoSpecialist("ws://localhost", "scene-1", "test", queue_depth=0)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_messages_without_a_usable_ordering_key():
+    """An unhashable key is logged and skipped without taking a slot."""
+    specialist = DelaySpecialist("ws://localhost:8765", "scene-1", "test", pipeline_workers=1, queue_depth=1)
+    ws = make_ws_mock([
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": ["a", "b"], "id": "bad"},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "a1"},
+    ])
+    prepare_run(specialist, ws)
+
+    await asyncio.wait_for(specialist.run(), timeout=2.0)
+
+    assert sent_ids(ws) == ["a1"]
+    assert specialist._lanes == {}
+
+
+# ──────────────────────────────────────────────
+# Executor offload
+# ──────────────────────────────────────────────
+
+class BusySpecialist(CpuBoundSpecialist):
+    """Blocks in process_sync and reports where it ran."""
+
+    def process_sync(self, message: dict) -> Optional[dict]:
+        time.sleep(message.get("busy", 0.0))
+        return {
+            "kind": "scene_patch",
+            "sceneId": self.scene_id,
+            "patch": {"id": message["id"], "thread": threading.get_ident(), "pid": os.getpid()},
+        }
+
+
+def sent_patches(ws: AsyncMock) -> list[dict]:
+    return [json.loads(call.args[0])["patch"] for call in ws.send.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_process_sync_runs_off_the_event_loop():
+    """The loop keeps ticking while process_sync blocks in the thread pool."""
+    specialist = BusySpecialist("ws://localhost:8765", "scene-1", "test", pipeline_workers=2)
+    ws = make_ws_mock([
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "a", "id": "a1", "busy": 0.1},
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "trackId": "b", "id": "b1", "busy": 0.1},
+    ])
+    prepare_run(specialist, ws)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    await specialist.run()
+    ticking.cancel()
+    specialist.close()
+
+    patches = sent_patches(ws)
+    assert sorted(patch["id"] for patch in patches) == ["a1", "b1"]
+    assert all(patch["thread"] != threading.get_ident() for patch in patches)
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_executor_is_created_once_and_survives_reruns():
+    """One pool serves every run(); close() shuts it down."""
+    specialist = BusySpecialist("ws://localhost:8765", "scene-1", "test", executor_workers=1)
+    prepare_run(specialist, make_ws_mock([{"kind": "bridge_pose", "fromClientId": 99, "id": "p1"}]))
+    await specialist.run()
+    pool = specialist.get_executor()
+
+    prepare_run(specialist, make_ws_mock([{"kind": "bridge_pose", "fromClientId": 99, "id": "p2"}]))
+    await specialist.run()
+    assert specialist.get_executor() is pool
+
+    specialist.close()
+    assert specialist._executor is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+@pytest.mark.asyncio
+async def test_process_sync_in_process_pool():
+    """With executor="process" the subscriber is pickled without its socket."""
+    specialist = BusySpecialist("ws://localhost:8765", "scene-1", "test", executor="process", executor_workers=1)
+    ws = make_ws_mock([{"kind": "bridge_scene_patch", "fromClientId": 99, "id": "p1"}])
+    specialist._ws = ws
+
+    # Patched on the class: instance-level mocks would not pickle.
+    with patch.object(BusySpecialist, "connect", AsyncMock()), \
+            patch.object(BusySpecialist, "subscribe", AsyncMock()), \
+            patch.object(BusySpecialist, "wait_for_scene_ready", AsyncMock()):
+        await specialist.run()
+    specialist.close()
+
+    patches = sent_patches(ws)
+    assert [patch["id"] for patch in patches] == ["p1"]
+    assert patches[0]["pid"] != os.getpid()
+    assert specialist._ws is ws
+
+
+@pytest.mark.asyncio
+async def test_process_pool_pickles_the_subscriber_once_per_worker():
+    """Messages after the first send only themselves to the worker."""
+    specialist = BusySpecialist("ws://localhost:8765", "scene-1", "test", executor="process", executor_workers=1)
+    ws = make_ws_mock([
+        {"kind": "bridge_scene_patch", "fromClientId": 99, "id": f"p{index}"} for index in range(4)
+    ])
+    specialist._ws = ws
+    pickles = []
+    getstate = BusySpecialist.__getstate__
+
+    def counting_getstate(self):
+        pickles.append(1)
+        return getstate(self)
+
+    with patch.object(BusySpecialist, "connect", AsyncMock()), \
+            patch.object(BusySpecialist, "subscribe", AsyncMock()), \
+            patch.object(BusySpecialist, "wait_for_scene_ready", AsyncMock()), \
+            patch.object(BusySpecialist, "__getstate__", counting_getstate):
+        await specialist.run()
+    specialist.close()
+
+    assert [patch["id"] for patch in sent_patches(ws)] == ["p0", "p1", "p2", "p3"]
+    assert len(pickles) <= 1
+
+
+def test_executor_kind_is_validated():
+    with pytest.raises(ValueError, match="executor"):
+        BusySpecialist("ws://localhost", "scene-1", "test", executor="fiber")
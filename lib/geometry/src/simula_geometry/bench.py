@@ -0,0 +1,230 @@
+"""
+Benchmark suite for cuboid lifting.
+
+Runs each case over seeded synthetic scenes (see synthetic.py) and
+reports per-lift latency percentiles, throughput and mean fit
+evaluations as JSON. Given a baseline JSON from an earlier run, cases
+whose median latency grew by more than the tolerance, or whose mean
+evaluations grew at all (same seed and scale), are reported as
+regressions and the run exits with status 1.
+
+Cases:
+    single     anchor ray only, no fit
+    yaw-fit    fitYawFromBBox
+    joint-fit  fitYawFromBBox + fitCenterOffsetFromBBox
+    batch      lift_cuboid_sequence with yaw fit, warm start and smoothing;
+               latencies are per frame, one sample per sequence
+
+Usage:
+    python -m simula_geometry.bench --output bench.json
+    python -m simula_geometry.bench --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+if __package__:
+    from .cuboid_lift import lift_cuboid, lift_cuboid_sequence
+    from .synthetic import synthetic_scenes, synthetic_sequence_payload
+else:  # script mode: bench.py run directly
+    from cuboid_lift import lift_cuboid, lift_cuboid_sequence
+    from synthetic import synthetic_scenes, synthetic_sequence_payload
+
+BENCH_VERSION = 1
+WARMUP_LIFTS = 3
+# Fit evaluations are deterministic for a seed and scale, so any growth
+# beyond float noise in the mean is a real change in search work.
+EVALUATION_TOLERANCE = 0.01
+
+# name: (lifts at scale 1, lift config)
+LIFT_CASES: dict[str, tuple[int, dict[str, Any]]] = {
+    "single": (2000, {}),
+    "yaw-fit": (300, {"fitYawFromBBox": True}),
+    "joint-fit": (40, {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": True}),
+}
+# name: (sequences at scale 1, frame count range, sequence config)
+SEQUENCE_CASES: dict[str, tuple[int, tuple[int, int], dict[str, Any]]] = {
+    "batch": (
+        8,
+        (20, 120),
+        {"fitYawFromBBox": True, "fitWarmStart": True, "smoothCenterAlpha": 0.5},
+    ),
+}
+CASE_NAMES = tuple(LIFT_CASES) + tuple(SEQUENCE_CASES)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Linear-interpolated percentile of an ascending list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def case_report(latencies_ms: list[float], lifts: int, total_seconds: float, evaluations: list[int]) -> dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    return {
+        "lifts": lifts,
+        "samples": len(ordered),
+        "p50Ms": percentile(ordered, 0.50),
+        "p90Ms": percentile(ordered, 0.90),
+        "p99Ms": percentile(ordered, 0.99),
+        "meanMs": sum(ordered) / len(ordered),
+        "maxMs": ordered[-1],
+        "liftsPerSecond": lifts / total_seconds if total_seconds > 0 else None,
+        "evaluationsMean": sum(evaluations) / len(evaluations) if evaluations else None,
+    }
+
+
+def fit_evaluations(result: dict[str, Any]) -> int | None:
+    fit = result.get("fit")
+    if isinstance(fit, dict) and fit.get("enabled"):
+        return fit.get("evaluations")
+    return None
+
+
+def timed(function: Callable[[dict[str, Any]], dict[str, Any]], payload: dict[str, Any]) -> tuple[float, dict[str, Any]]:
+    started = time.perf_counter()
+    output = function(payload)
+    return time.perf_counter() - started, output
+
+
+def run_lift_case(name: str, seed: int, scale: float) -> dict[str, Any]:
+    count, config = LIFT_CASES[name]
+    count = max(2, round(count * scale))
+    payloads: list[dict[str, Any]] = []
+    for scene in synthetic_scenes(seed, count):
+        payloads.extend(scene.payloads(config))
+        if len(payloads) >= count + WARMUP_LIFTS:
+            break
+    for payload in payloads[:WARMUP_LIFTS]:
+        lift_cuboid(payload)
+    latencies: list[float] = []
+    evaluations: list[int] = []
+    for payload in payloads[WARMUP_LIFTS : WARMUP_LIFTS + count]:
+        seconds, output = timed(lift_cuboid, payload)
+        latencies.append(seconds * 1000.0)
+        count_evaluations = fit_evaluations(output["result"])
+        if count_evaluations is not None:
+            evaluations.append(count_evaluations)
+    return case_report(latencies, len(latencies), sum(latencies) / 1000.0, evaluations)
+
+
+def run_sequence_case(name: str, seed: int, scale: float) -> dict[str, Any]:
+    count, (shortest, longest), config = SEQUENCE_CASES[name]
+    count = max(2, round(count * scale))
+    rng = random.Random(seed)
+    payloads = [
+        synthetic_sequence_payload(rng.randrange(2**31), rng.randint(shortest, longest), config)[0]
+        for _ in range(count)
+    ]
+    warmup, _ = synthetic_sequence_payload(seed, shortest, config)
+    lift_cuboid_sequence(warmup)
+    latencies: list[float] = []
+    evaluations: list[int] = []
+    frames = 0
+    total_seconds = 0.0
+    for payload in payloads:
+        seconds, output = timed(lift_cuboid_sequence, payload)
+        total_seconds += seconds
+        frames += len(output["frames"])
+        latencies.append(seconds * 1000.0 / len(output["frames"]))
+        for frame in output["frames"]:
+            count_evaluations = fit_evaluations(frame["raw"])
+            if count_evaluations is not None:
+                evaluations.append(count_evaluations)
+    return case_report(latencies, frames, total_seconds, evaluations)
+
+
+def run_benchmarks(cases: list[str] | None = None, seed: int = 0, scale: float = 1.0) -> dict[str, Any]:
+    """Run the named cases (all by default) and return the report."""
+    selected = list(cases) if cases else list(CASE_NAMES)
+    for name in selected:
+        if name not in CASE_NAMES:
+            raise ValueError(f"caso de benchmark desconocido: {name!r}")
+    report: dict[str, Any] = {
+        "version": BENCH_VERSION,
+        "seed": seed,
+        "scale": scale,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": {},
+    }
+    for name in selected:
+        if name in LIFT_CASES:
+            report["cases"][name] = run_lift_case(name, seed, scale)
+        else:
+            report["cases"][name] = run_sequence_case(name, seed, scale)
+    return report
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.25) -> list[str]:
+    """
+    Regressions of current against baseline, one message each: a case
+    missing from current, median latency above baseline * (1 + tolerance),
+    or, when seed and scale match, more mean fit evaluations.
+    """
+    regressions: list[str] = []
+    same_workload = current.get("seed") == baseline.get("seed") and current.get("scale") == baseline.get("scale")
+    for name, base in baseline.get("cases", {}).items():
+        case = current.get("cases", {}).get(name)
+        if case is None:
+            regressions.append(f"{name}: falta en la corrida actual")
+            continue
+        if case["p50Ms"] > base["p50Ms"] * (1.0 + tolerance):
+            change = (case["p50Ms"] / base["p50Ms"] - 1.0) * 100.0
+            regressions.append(f"{name}: p50Ms {base['p50Ms']:.3f} -> {case['p50Ms']:.3f} (+{change:.0f}%)")
+        base_evaluations = base.get("evaluationsMean")
+        evaluations = case.get("evaluationsMean")
+        if same_workload and base_evaluations and evaluations is not None:
+            if evaluations > base_evaluations * (1.0 + EVALUATION_TOLERANCE):
+                regressions.append(f"{name}: evaluationsMean {base_evaluations:.1f} -> {evaluations:.1f}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark simula_geometry cuboid lifting on synthetic scenes")
+    parser.add_argument("--cases", default=None, help=f"Comma-separated cases (default: all of {', '.join(CASE_NAMES)})")
+    parser.add_argument("--seed", type=int, default=0, help="Scene generator seed")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on every case's lift count")
+    parser.add_argument("--output", default=None, help="Write the report JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="Report JSON of an earlier run to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed median latency growth over the baseline (0.25 = +25%%)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cases = [name.strip() for name in args.cases.split(",")] if args.cases else None
+    report = run_benchmarks(cases, args.seed, args.scale)
+    text = json.dumps(report, ensure_ascii=True, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    regressions = compare_results(report, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
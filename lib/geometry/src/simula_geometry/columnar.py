@@ -0,0 +1,153 @@
+"""
+Columnar recordings for sequence lifting.
+
+A recording is a float array with one row per frame and the columns
+
+    t, trackId, x, y, w, h, u, v
+
+stored as an .npy file (opened memory-mapped, so loading reads nothing but
+the header) or as the "frames" array of an .npz, next to a JSON sidecar
+(<stem>.json by default) with the camera, object and config of a sequence
+payload. Non-finite u/v mean no anchorUV (bottom-center of the bbox); a
+non-finite trackId means no track; rows with a non-finite bbox are skipped
+like frames without a detection.
+
+Rows are read in blocks and turned straight into LiftRequests, so no frame
+dicts are built and memory stays flat however long the recording is.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+if __package__:
+    from .cuboid_lift import (
+        FrameResult,
+        LiftCache,
+        PendingFrame,
+        SequenceLifter,
+        SequenceResult,
+        bbox_anchor_uv,
+        clamp01,
+        lift_prepared_frames,
+    )
+else:  # script mode: cuboid_lift.py run directly
+    from cuboid_lift import (
+        FrameResult,
+        LiftCache,
+        PendingFrame,
+        SequenceLifter,
+        SequenceResult,
+        bbox_anchor_uv,
+        clamp01,
+        lift_prepared_frames,
+    )
+
+COLUMNS = ("t", "trackId", "x", "y", "w", "h", "u", "v")
+
+# Rows converted to Python floats at a time.
+ROW_BLOCK = 4096
+
+
+class ColumnarRecording:
+    """An (N, 8) frame array plus the sequence context from its sidecar."""
+
+    __slots__ = ("rows", "camera", "object", "config")
+
+    def __init__(self, rows: np.ndarray, camera: dict[str, Any], obj: dict[str, Any], config: dict[str, Any]):
+        if rows.ndim != 2 or rows.shape[1] != len(COLUMNS):
+            raise ValueError(f"la grabacion columnar debe tener forma (N, {len(COLUMNS)}): {rows.shape}")
+        if rows.shape[0] == 0:
+            raise ValueError("la grabacion columnar no tiene frames")
+        self.rows = rows
+        self.camera = camera
+        self.object = obj
+        self.config = config
+
+    def __len__(self) -> int:
+        return int(self.rows.shape[0])
+
+
+def load_columnar(path: str, sidecar_path: str | None = None) -> ColumnarRecording:
+    """Open a recording; .npy files are memory-mapped rather than read."""
+    source = Path(path)
+    suffix = source.suffix.lower()
+    if suffix == ".npy":
+        rows = np.load(source, mmap_mode="r")
+    elif suffix == ".npz":
+        with np.load(source) as archive:
+            if "frames" not in archive.files:
+                raise ValueError("el .npz columnar requiere un arreglo 'frames'")
+            rows = archive["frames"]
+    else:
+        raise ValueError(f"formato columnar desconocido: {source.suffix!r}")
+    if not np.issubdtype(rows.dtype, np.floating):
+        rows = rows.astype(np.float64)
+
+    sidecar = Path(sidecar_path) if sidecar_path is not None else source.with_suffix(".json")
+    context = json.loads(sidecar.read_text(encoding="utf-8"))
+    if not isinstance(context, dict):
+        raise ValueError("el sidecar columnar debe ser un objeto JSON")
+    config = context.get("config", {})
+    return ColumnarRecording(
+        rows, context.get("camera"), context.get("object"), config if isinstance(config, dict) else {}
+    )
+
+
+def iter_rows(rows: np.ndarray) -> Iterator[list[float]]:
+    """Rows as lists of Python floats, converted ROW_BLOCK rows at a time."""
+    for start in range(0, rows.shape[0], ROW_BLOCK):
+        yield from rows[start : start + ROW_BLOCK].tolist()
+
+
+def track_value(value: float) -> Any:
+    if not math.isfinite(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def prepare_rows(lifter: SequenceLifter, rows: np.ndarray) -> Iterator[PendingFrame | None]:
+    isfinite = math.isfinite
+    for index, (t, track, x, y, w, h, u, v) in enumerate(iter_rows(rows)):
+        if not (isfinite(x) and isfinite(y) and isfinite(w) and isfinite(h)):
+            yield None
+            continue
+        bbox = {"x": clamp01(x), "y": clamp01(y), "width": clamp01(w), "height": clamp01(h)}
+        anchor_uv = (clamp01(u), clamp01(v)) if isfinite(u) and isfinite(v) else bbox_anchor_uv(x, y, w, h)
+        yield lifter.prepare_row(index, t, track_value(track), bbox, anchor_uv)
+
+
+def iter_columnar_frames(recording: ColumnarRecording, cache: LiftCache | None = None) -> Iterator[FrameResult]:
+    """
+    Lift a recording lazily, one FrameResult per row with a valid bbox.
+    Smoothing is always causal here; lift_columnar_result applies
+    smoothingMode.
+    """
+    lifter = SequenceLifter(recording.camera, recording.object, recording.config, cache)
+    return lift_prepared_frames(lifter, prepare_rows(lifter, recording.rows))
+
+
+def lift_columnar_result(recording: ColumnarRecording, cache: LiftCache | None = None) -> SequenceResult:
+    """lift_cuboid_sequence_result for a columnar recording; frame timestamps are the t column."""
+    lifter = SequenceLifter(recording.camera, recording.object, recording.config, cache)
+    output_frames = list(lift_prepared_frames(lifter, prepare_rows(lifter, recording.rows)))
+    if not output_frames:
+        raise ValueError("no se pudieron procesar frames validos en la grabacion columnar")
+    return lifter.sequence_result(output_frames)
+
+
+def save_columnar(path: str, rows: np.ndarray, camera: dict[str, Any], obj: dict[str, Any], config: dict[str, Any] | None = None) -> None:
+    """Write rows (.npy or .npz) and the <stem>.json sidecar load_columnar reads."""
+    target = Path(path)
+    rows = np.asarray(rows, dtype=np.float64)
+    if target.suffix.lower() == ".npz":
+        np.savez(target, frames=rows)
+    else:
+        np.save(target, rows)
+    sidecar = {"camera": camera, "object": obj, "config": config or {}}
+    target.with_suffix(".json").write_text(json.dumps(sidecar, ensure_ascii=True), encoding="utf-8")
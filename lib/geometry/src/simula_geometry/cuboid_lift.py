@@ -19,10 +19,123 @@ Assumptions:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import math
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+if __package__:
+    from .lift_cache import LiftCache
+    from .local_search import nelder_mead
+else:
+    from lift_cache import LiftCache
+    from local_search import nelder_mead
+
+YAW_SEARCH_MODES = ("scalar", "vectorized")
+YAW_SYMMETRY_MODES = ("off", "auto")
+YAW_SYMMETRY_REFERENCES = ("hint", "previous", "canonical")
+FIT_STRATEGIES = ("grid", "coarse+local")
+# full: the complete payload; pose: pose, anchor and fit summary only;
+# minimal: base center, yaw and fit error.
+OUTPUT_PROFILES = ("full", "pose", "minimal")
+# causal: per-frame EMA (smooth_pose_step); zero-lag: forward-backward EMA
+# over the whole batch once every frame is lifted (see smoothing.py).
+SMOOTHING_MODES = ("causal", "zero-lag")
+# Input files lifted as columnar recordings (see columnar.py).
+COLUMNAR_SUFFIXES = (".npy", ".npz")
+
+# One template per object size; a catalog of a few hundred SKUs fits.
+CORNER_TEMPLATE_CACHE_SIZE = 1024
+# Rotations kept across all templates (about 0.7 KB each). Only yaws on a
+# quarter-degree lattice are cached, which covers the coarse grid of every
+# step in use; fine, local and warm-start yaws are continuous and are
+# computed directly.
+CORNER_ROTATION_CACHE_SIZE = 8192
+CORNER_ROTATION_LATTICE = 4.0
+
+# Slack for branch-and-bound pruning: a candidate is skipped only when its
+# lower bound beats the best error by more than float rounding could explain.
+PRUNE_MARGIN = 1e-9
+
+# Part of every lift cache key; bump it when a fitter change alters results
+# so stale on-disk records stop matching.
+LIFT_CACHE_VERSION = 1
+# Config read only by the sequence layer and the CLI. It never changes a raw
+# lift, so cache keys leave it out (warm-start seeds and previousYawDeg are
+# keyed per frame instead).
+SEQUENCE_CONFIG_KEYS = frozenset(
+    {
+        "smoothCenterAlpha",
+        "smoothingAlpha",
+        "smoothYawAlpha",
+        "smoothingMode",
+        "fitWarmStart",
+        "warmStartErrorJump",
+        "warmStartRefreshFrames",
+        "multiTrack",
+        "trackIdleEvictFrames",
+        "workers",
+        "workerChunkSize",
+        "outputProfile",
+    }
+)
+
+# Stages of a lift timed by config collectTiming (see LiftTiming).
+TIMING_STAGES = ("parse", "ray", "coarseGrid", "fineGrid", "output")
+# World points projected per candidate pose (its corners) and per pruning
+# lower bound (center_fit_lower_bound).
+CORNER_PROJECTIONS = 8
+BOUND_PROJECTIONS = 10
+
+# Functions listed by --profile when no --profile-output is given.
+PROFILE_TOP_FUNCTIONS = 25
+
+# Frames prepared ahead of a pooled sequence lift; bounds memory on long
+# recordings without starving the workers.
+POOL_WINDOW_FRAMES = 65536
+
+ASSUMPTIONS = (
+    "single_camera",
+    "floor_plane_support",
+    "object_pitch_roll_fixed_zero",
+    "anchor_uv_bottom_center_default",
+)
+
+
+def load_vectorized():
+    """Import the numpy kernels lazily so the scalar path stays dependency-free."""
+    try:
+        if __package__:
+            from . import vectorized
+        else:
+            import vectorized
+    except ModuleNotFoundError as error:
+        if error.name != "numpy":
+            raise
+        raise RuntimeError('el modo vectorizado requiere numpy (pip install "simula-geometry[numpy]")') from error
+    return vectorized
+
+
+def load_smoothing():
+    """Import the trajectory smoothing module lazily; only zero-lag smoothing needs numpy."""
+    try:
+        if __package__:
+            from . import smoothing
+        else:
+            import smoothing
+    except ModuleNotFoundError as error:
+        if error.name != "numpy":
+            raise
+        raise RuntimeError('smoothingMode zero-lag requiere numpy (pip install "simula-geometry[numpy]")') from error
+    return smoothing
 
 
 def clamp01(value: float) -> float:
@@ -111,6 +224,11 @@ def parse_anchor_uv(detection: dict[str, Any]) -> tuple[float, float]:
     y = get_number(detection, ["y", "top"], 0.0) or 0.0
     width = get_number(detection, ["width", "w"], 0.0) or 0.0
     height = get_number(detection, ["height", "h"], 0.0) or 0.0
+    return bbox_anchor_uv(x, y, width, height)
+
+
+def bbox_anchor_uv(x: float, y: float, width: float, height: float) -> tuple[float, float]:
+    """Default anchor of a detection without anchorUV: the bottom-center of its bbox."""
     return (clamp01(x + width * 0.5), clamp01(y + height))
 
 
@@ -122,7 +240,9 @@ def parse_bbox(detection: dict[str, Any]) -> dict[str, float]:
     return {"x": x, "y": y, "width": width, "height": height}
 
 
-def camera_basis(camera: dict[str, Any]) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
+def camera_basis(camera: dict[str, Any] | CameraModel) -> tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]:
+    if isinstance(camera, CameraModel):
+        return (camera.right, camera.up, camera.forward)
     yaw_deg = get_number(camera, ["yawDeg", "yaw"], 0.0) or 0.0
     pitch_deg = get_number(camera, ["pitchDeg", "pitch"], -35.0) or -35.0
     roll_deg = get_number(camera, ["rollDeg", "roll"], 0.0) or 0.0
@@ -141,7 +261,9 @@ def camera_basis(camera: dict[str, Any]) -> tuple[tuple[float, float, float], tu
     return (right, up, forward)
 
 
-def camera_origin(camera: dict[str, Any]) -> tuple[float, float, float]:
+def camera_origin(camera: dict[str, Any] | CameraModel) -> tuple[float, float, float]:
+    if isinstance(camera, CameraModel):
+        return camera.origin
     plan_position = camera.get("planPositionM")
     if not isinstance(plan_position, list) or len(plan_position) < 2:
         raise ValueError("camera.planPositionM invalido; se esperaba [x,z]")
@@ -151,17 +273,45 @@ def camera_origin(camera: dict[str, Any]) -> tuple[float, float, float]:
     return (x, y, z)
 
 
+class CameraModel:
+    """
+    Camera dict compiled once: origin, right/up/forward basis and intrinsics.
+
+    Every function that takes a camera accepts either the raw dict or a
+    CameraModel; hot loops should build the model once and pass it down.
+    """
+
+    __slots__ = ("source", "origin", "right", "up", "forward", "fov_deg", "tan_half_v", "aspect", "key")
+
+    def __init__(self, camera: dict[str, Any]):
+        self.source = camera
+        self.origin = camera_origin(camera)
+        self.right, self.up, self.forward = camera_basis(camera)
+        self.fov_deg = get_number(camera, ["fovDeg", "fov", "verticalFovDeg"], 65.0) or 65.0
+        self.tan_half_v = math.tan(deg_to_rad(self.fov_deg) * 0.5)
+        self.aspect = get_number(camera, ["aspectRatio", "aspect"], 16.0 / 9.0) or (16.0 / 9.0)
+        # Hashable identity of the compiled numbers, for caches keyed by camera.
+        self.key = self.origin + self.right + self.up + self.forward + (self.tan_half_v, self.aspect)
+
+
+def camera_model(camera: dict[str, Any] | CameraModel) -> CameraModel:
+    if isinstance(camera, CameraModel):
+        return camera
+    if not isinstance(camera, dict):
+        raise ValueError("camera debe ser un objeto")
+    return CameraModel(camera)
+
+
 def ray_from_uv(
-    camera: dict[str, Any],
+    camera: dict[str, Any] | CameraModel,
     u: float,
     v: float,
 ) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
-    aspect = get_number(camera, ["aspectRatio", "aspect"], 16.0 / 9.0) or (16.0 / 9.0)
-    fov_deg = get_number(camera, ["fovDeg", "fov", "verticalFovDeg"], 65.0) or 65.0
-
-    right, up, forward = camera_basis(camera)
-    origin = camera_origin(camera)
-    tan_half_v = math.tan(deg_to_rad(fov_deg) * 0.5)
+    model = camera_model(camera)
+    right, up, forward = model.right, model.up, model.forward
+    origin = model.origin
+    tan_half_v = model.tan_half_v
+    aspect = model.aspect
 
     x_ndc = (clamp01(u) * 2.0) - 1.0
     y_ndc = 1.0 - (clamp01(v) * 2.0)
@@ -198,6 +348,112 @@ def intersect_ray_with_floor(
     )
 
 
+class RotationCache:
+    """LRU of corner rotations keyed by (template serial, yaw), bounded across all templates."""
+
+    __slots__ = ("entries", "max_entries")
+
+    def __init__(self, max_entries: int = CORNER_ROTATION_CACHE_SIZE):
+        self.entries: OrderedDict[tuple[int, float], tuple[tuple[float, float, float, float], ...]] = OrderedDict()
+        self.max_entries = max(1, max_entries)
+
+
+CORNER_ROTATIONS = RotationCache()
+TEMPLATE_SERIALS = count()
+
+
+class CornerTemplate:
+    """
+    Footprint corners of one object size, with their rotations by lattice
+    yaws kept in a RotationCache (the shared one by default).
+
+    A rotation stores the four products (lx*c, lz*s, lx*s, lz*c) of each
+    local corner, so corners() only adds the center and yields exactly the
+    floats oriented_box_corners used to compute from scratch. Grid yaws are
+    the same floats every frame, so sequences and repeated SKUs mostly hit;
+    off-lattice yaws are rotated directly and never stored.
+    """
+
+    __slots__ = ("width", "depth", "height", "local_xz", "serial", "rotations", "hits", "misses")
+
+    def __init__(self, width: float, depth: float, height: float, rotations: RotationCache | None = None):
+        half_w = width * 0.5
+        half_d = depth * 0.5
+        self.width = width
+        self.depth = depth
+        self.height = height
+        self.local_xz = (
+            (-half_w, -half_d),
+            (half_w, -half_d),
+            (half_w, half_d),
+            (-half_w, half_d),
+        )
+        # Serials are never reused, so an evicted template's rotations can't be mistaken for a new one's.
+        self.serial = next(TEMPLATE_SERIALS)
+        self.rotations = rotations if rotations is not None else CORNER_ROTATIONS
+        self.hits = 0
+        self.misses = 0
+
+    def rotation(self, yaw_deg: float) -> tuple[tuple[float, float, float, float], ...]:
+        yaw = deg_to_rad(yaw_deg)
+        c = math.cos(yaw)
+        s = math.sin(yaw)
+        return tuple((lx * c, lz * s, lx * s, lz * c) for lx, lz in self.local_xz)
+
+    def rotated(self, yaw_deg: float) -> tuple[tuple[float, float, float, float], ...]:
+        if not (yaw_deg * CORNER_ROTATION_LATTICE).is_integer():
+            self.misses += 1
+            return self.rotation(yaw_deg)
+        entries = self.rotations.entries
+        key = (self.serial, yaw_deg)
+        rotation = entries.get(key)
+        if rotation is not None:
+            self.hits += 1
+            try:
+                entries.move_to_end(key)
+            except KeyError:  # evicted by another thread meanwhile
+                pass
+            return rotation
+        self.misses += 1
+        rotation = self.rotation(yaw_deg)
+        entries[key] = rotation
+        if len(entries) > self.rotations.max_entries:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                pass
+        return rotation
+
+    def corners(self, center_x: float, center_z: float, yaw_deg: float, base_y: float) -> list[tuple[float, float, float]]:
+        top_y = base_y + self.height
+        # Unrolled: this runs once per fit candidate.
+        r0, r1, r2, r3 = self.rotated(yaw_deg)
+        x0 = center_x + r0[0] - r0[1]
+        z0 = center_z + r0[2] + r0[3]
+        x1 = center_x + r1[0] - r1[1]
+        z1 = center_z + r1[2] + r1[3]
+        x2 = center_x + r2[0] - r2[1]
+        z2 = center_z + r2[2] + r2[3]
+        x3 = center_x + r3[0] - r3[1]
+        z3 = center_z + r3[2] + r3[3]
+        return [
+            (x0, base_y, z0),
+            (x0, top_y, z0),
+            (x1, base_y, z1),
+            (x1, top_y, z1),
+            (x2, base_y, z2),
+            (x2, top_y, z2),
+            (x3, base_y, z3),
+            (x3, top_y, z3),
+        ]
+
+
+@lru_cache(maxsize=CORNER_TEMPLATE_CACHE_SIZE)
+def corner_template(width_m: float, depth_m: float, height_m: float) -> CornerTemplate:
+    """Shared CornerTemplate for an object size (LRU over sizes)."""
+    return CornerTemplate(width_m, depth_m, height_m)
+
+
 def oriented_box_corners(
     center_x: float,
     center_z: float,
@@ -207,35 +463,16 @@ def oriented_box_corners(
     yaw_deg: float,
     base_y_m: float,
 ) -> list[tuple[float, float, float]]:
-    half_w = width_m * 0.5
-    half_d = depth_m * 0.5
-    yaw = deg_to_rad(yaw_deg)
-    c = math.cos(yaw)
-    s = math.sin(yaw)
-
-    corners_xz = [
-        (-half_w, -half_d),
-        (half_w, -half_d),
-        (half_w, half_d),
-        (-half_w, half_d),
-    ]
-    corners: list[tuple[float, float, float]] = []
-    for lx, lz in corners_xz:
-        world_x = center_x + lx * c - lz * s
-        world_z = center_z + lx * s + lz * c
-        corners.append((world_x, base_y_m, world_z))
-        corners.append((world_x, base_y_m + height_m, world_z))
-    return corners
+    return corner_template(width_m, depth_m, height_m).corners(center_x, center_z, yaw_deg, base_y_m)
 
 
 def project_world_point(
     world_point: tuple[float, float, float],
-    camera: dict[str, Any],
+    camera: dict[str, Any] | CameraModel,
 ) -> tuple[float, float] | None:
-    origin = camera_origin(camera)
-    right, up, forward = camera_basis(camera)
-    fov_deg = get_number(camera, ["fovDeg", "fov", "verticalFovDeg"], 65.0) or 65.0
-    aspect = get_number(camera, ["aspectRatio", "aspect"], 16.0 / 9.0) or (16.0 / 9.0)
+    model = camera_model(camera)
+    origin = model.origin
+    right, up, forward = model.right, model.up, model.forward
 
     rel = (world_point[0] - origin[0], world_point[1] - origin[1], world_point[2] - origin[2])
     x_cam = dot(rel, right)
@@ -244,16 +481,20 @@ def project_world_point(
     if z_cam <= 1e-5:
         return None
 
-    tan_half_v = math.tan(deg_to_rad(fov_deg) * 0.5)
-    x_ndc = x_cam / (z_cam * tan_half_v * aspect)
+    tan_half_v = model.tan_half_v
+    x_ndc = x_cam / (z_cam * tan_half_v * model.aspect)
     y_ndc = y_cam / (z_cam * tan_half_v)
     u = (x_ndc + 1.0) * 0.5
     v = (1.0 - y_ndc) * 0.5
     return (u, v)
 
 
-def bbox_from_projected_corners(corners: list[tuple[float, float, float]], camera: dict[str, Any]) -> dict[str, float] | None:
-    projected = [project_world_point(corner, camera) for corner in corners]
+def bbox_from_projected_corners(
+    corners: list[tuple[float, float, float]],
+    camera: dict[str, Any] | CameraModel,
+) -> dict[str, float] | None:
+    model = camera_model(camera)
+    projected = [project_world_point(corner, model) for corner in corners]
     visible = [item for item in projected if item is not None]
     if not visible:
         return None
@@ -284,85 +525,299 @@ def bbox_fit_error(observed: dict[str, float], predicted: dict[str, float]) -> f
     return e_center * 2.0 + e_size
 
 
-def fit_yaw_from_bbox(
-    camera: dict[str, Any],
-    observed_bbox: dict[str, float],
-    anchor_world: tuple[float, float, float],
+def bbox_fit_lower_bound(
+    observed_extent: tuple[float, float, float, float],
+    min_u: float,
+    max_u: float,
+    min_v: float,
+    max_v: float,
+) -> float:
+    """
+    Lower bound of bbox_fit_error for any predicted bbox spanning at least
+    [min_u, max_u] x [min_v, max_v] (clamped UVs).
+
+    Per axis bbox_fit_error is 2 * max(|a - o0|, |b - o1|) for predicted
+    [a, b] and observed [o0, o1]; points already known to lie inside the
+    prediction bound how far a and b can be from the observed edges.
+    observed_extent is (o0_u, o1_u, o0_v, o1_v).
+    """
+    o0_u, o1_u, o0_v, o1_v = observed_extent
+    return 2.0 * (max(0.0, o0_u - min_u, max_u - o1_u) + max(0.0, o0_v - min_v, max_v - o1_v))
+
+
+def observed_extent(observed: dict[str, float]) -> tuple[float, float, float, float]:
+    return (
+        observed["x"],
+        observed["x"] + observed["width"],
+        observed["y"],
+        observed["y"] + observed["height"],
+    )
+
+
+def center_fit_lower_bound(
+    camera: CameraModel,
+    extent: tuple[float, float, float, float],
+    center_x: float,
+    center_z: float,
     size: dict[str, float],
-    floor_y: float,
-    elevation_m: float,
-    coarse_step_deg: float,
-    yaw_hint_deg: float | None,
-) -> tuple[float, float, dict[str, float] | None]:
-    width = size["width"]
-    depth = size["depth"]
+    base_y: float,
+) -> float:
+    """
+    Lower bound of the bbox error of every yaw of a cuboid centred at
+    (center_x, center_z).
+
+    Whatever the yaw, the cuboid contains its base and top centers and sits
+    inside the axis-aligned box circumscribing its swept cylinder. With
+    all of that box in front of the camera, the projected bbox therefore
+    covers the projected centers and stays within the projected box, which
+    bounds how close each edge can get to the observed one (see
+    bbox_fit_lower_bound). Returns 0.0 when the box reaches behind the camera.
+    """
+    ox, oy, oz = camera.origin
+    fx, fy, fz = camera.forward
     height = size["height"]
-    base_y = floor_y + elevation_m
-    center_x = anchor_world[0]
-    center_z = anchor_world[2]
+    radius = math.sqrt(size["width"] * size["width"] + size["depth"] * size["depth"]) * 0.5
+    outer_us: list[float] = []
+    outer_vs: list[float] = []
+    for dx in (-radius, radius):
+        for dz in (-radius, radius):
+            for y in (base_y, base_y + height):
+                point = (center_x + dx, y, center_z + dz)
+                depth = (point[0] - ox) * fx + (point[1] - oy) * fy + (point[2] - oz) * fz
+                if depth <= 1e-5 + PRUNE_MARGIN:
+                    return 0.0
+                projected = project_world_point(point, camera)
+                outer_us.append(projected[0])
+                outer_vs.append(projected[1])
+    base = project_world_point((center_x, base_y, center_z), camera)
+    top = project_world_point((center_x, base_y + height, center_z), camera)
+    if base is None or top is None:
+        return 0.0
+
+    o0_u, o1_u, o0_v, o1_v = extent
+    inner_bound = bbox_fit_lower_bound(
+        extent,
+        max(0.0, min(1.0, min(base[0], top[0]))),
+        max(0.0, min(1.0, max(base[0], top[0]))),
+        max(0.0, min(1.0, min(base[1], top[1]))),
+        max(0.0, min(1.0, max(base[1], top[1]))),
+    )
+    # Predicted edges can't pass the outer box: a >= low and b <= high on each axis.
+    low_u = max(0.0, min(1.0, min(outer_us)))
+    high_u = max(0.0, min(1.0, max(outer_us)))
+    low_v = max(0.0, min(1.0, min(outer_vs)))
+    high_v = max(0.0, min(1.0, max(outer_vs)))
+    outer_bound = 2.0 * (max(0.0, low_u - o0_u, o1_u - high_u) + max(0.0, low_v - o0_v, o1_v - high_v))
+    return max(inner_bound, outer_bound)
+
+
+def yaw_symmetry_period_deg(size: dict[str, float]) -> float:
+    """
+    Smallest yaw rotation that maps the cuboid onto itself: 180 deg for any
+    box, 90 deg when the footprint is square. Rotations by this period project
+    to the same bbox, so the fitters search one period when the yaw step
+    divides it (see yaw_sweep_indices).
+    """
+    if math.isclose(size["width"], size["depth"], rel_tol=1e-6):
+        return 90.0
+    return 180.0
+
+
+def yaw_sweep_indices(step_deg: float, period_deg: float) -> range:
+    """
+    Indices i of the coarse grid yaw = -180 + i * step that fall inside
+    [-period/2, period/2). With period 360 this is the full sweep. A shorter
+    period keeps that subset only when step divides it: every dropped yaw is
+    then a whole number of periods from a kept one, so pruned and full
+    sweeps find the same error. Otherwise the full sweep is returned.
+    """
+    periods = period_deg / step_deg
+    if period_deg >= 360.0 or not math.isclose(periods, round(periods), rel_tol=0.0, abs_tol=1e-9):
+        return range(int(math.ceil(360.0 / step_deg)))
+    half_period = period_deg * 0.5
+    first = int(math.ceil((180.0 - half_period) / step_deg - 1e-9))
+    stop = int(math.ceil((180.0 + half_period) / step_deg - 1e-9))
+    return range(first, stop)
+
+
+def grid_blocks(row_count: int, column_count: int, anytime: bool) -> Iterator[tuple[int, range]]:
+    """
+    Cover a row_count x column_count grid exactly once as (row, columns)
+    blocks. Row-major by default; with anytime, coarse to fine instead: every
+    2**k-th row and column first, then the points that halve the spacing, so
+    a search cut short at any point has still sampled the whole grid.
+    """
+    if not anytime:
+        for row in range(row_count):
+            yield row, range(column_count)
+        return
+    top = max(0, (max(row_count, column_count) - 1).bit_length() - 1)
+    for level in range(top, -1, -1):
+        stride = 1 << level
+        for row in range(0, row_count, stride):
+            if level < top and row % (stride * 2) == 0:
+                # Row already visited on a coarser level: only the new columns.
+                columns = range(stride, column_count, stride * 2)
+            else:
+                columns = range(0, column_count, stride)
+            if columns:
+                yield row, columns
+
+
+def deadline_passed(deadline: float | None) -> bool:
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def select_equivalent_yaw(yaw_deg: float, period_deg: float, reference_deg: float | None) -> float:
+    """Pick the yaw + k * period closest to reference (or the canonical one in [-period/2, period/2))."""
+    half_period = period_deg * 0.5
+    if reference_deg is None:
+        return ((yaw_deg + half_period) % period_deg) - half_period
+    delta = ((yaw_deg - reference_deg + half_period) % period_deg) - half_period
+    return normalize_angle_deg(reference_deg + delta)
+
+
+def parse_yaw_symmetry(
+    config: dict[str, Any],
+    size: dict[str, float],
+    yaw_hint_deg: float | None,
+) -> tuple[float, float | None]:
+    """Resolve (search period, reference yaw) from config.yawSymmetry / yawSymmetryReference."""
+    mode = str(config.get("yawSymmetry", "off"))
+    if mode not in YAW_SYMMETRY_MODES:
+        raise ValueError(f"yawSymmetry invalido: {mode!r}")
+    if mode == "off":
+        return (360.0, None)
+
+    reference_mode = str(config.get("yawSymmetryReference", "hint"))
+    if reference_mode not in YAW_SYMMETRY_REFERENCES:
+        raise ValueError(f"yawSymmetryReference invalido: {reference_mode!r}")
+    reference: float | None = None
+    if reference_mode == "previous":
+        reference = get_number(config, ["previousYawDeg"], None)
+        if reference is None:
+            reference = yaw_hint_deg
+    elif reference_mode == "hint":
+        reference = yaw_hint_deg
+    return (yaw_symmetry_period_deg(size), reference)
+
+
+class LiftTiming:
+    """
+    Wall time per stage (TIMING_STAGES) and work counters of one lift, or
+    totals over many; filled in when config collectTiming is on.
+
+    Stages are laps: lap(stage) books the time since the previous lap, so
+    the fitters only mark where the coarse search ends and the overhead
+    when timing is off is one None check per stage boundary.
+
+        parse       payload parsing (single lifts; sequences parse once)
+        ray         anchor ray and floor intersection
+        coarseGrid  coarse sweep, seed grid of coarse+local, or the single
+                    pose when fitting is off
+        fineGrid    fine sweep, local search or warm-started search
+        output      building the output dict
+    """
+
+    __slots__ = ("seconds", "evaluations", "projections", "mark")
+
+    def __init__(self, started: float | None = None):
+        self.seconds = dict.fromkeys(TIMING_STAGES, 0.0)
+        self.evaluations = 0
+        # World points projected (see CORNER_PROJECTIONS / BOUND_PROJECTIONS).
+        self.projections = 0
+        self.mark = time.perf_counter() if started is None else started
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.seconds[stage] += now - self.mark
+        self.mark = now
+
+    def add(self, other: LiftTiming) -> None:
+        for stage, seconds in other.seconds.items():
+            self.seconds[stage] += seconds
+        self.evaluations += other.evaluations
+        self.projections += other.projections
+
+    def output_block(self, started: float) -> dict[str, Any]:
+        """Book the output stage as the time since started and return to_dict()."""
+        self.seconds["output"] = time.perf_counter() - started
+        return self.to_dict()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stagesMs": {stage: seconds * 1000.0 for stage, seconds in self.seconds.items()},
+            "totalMs": sum(self.seconds.values()) * 1000.0,
+            "evaluations": self.evaluations,
+            "projections": self.projections,
+        }
+
+
+class FitStats:
+    """Counters the fitters fill in when the caller passes one in."""
+
+    __slots__ = ("evaluations", "converged", "pruned", "completed", "timing")
+
+    def __init__(self, timing: LiftTiming | None = None) -> None:
+        self.evaluations = 0
+        self.converged: bool | None = None
+        # Grid candidates skipped by a lower bound (not counted in evaluations).
+        self.pruned = 0
+        # False when a latency budget cut the search short.
+        self.completed = True
+        # Stage timing of the lift, when collected; never cached.
+        self.timing = timing
+
+
+def lap_stage(stats: FitStats | None, stage: str) -> None:
+    """LiftTiming.lap on stats.timing, if the lift is timed."""
+    if stats is not None and stats.timing is not None:
+        stats.timing.lap(stage)
+
+
+def yaw_pose_evaluator(
+    camera: CameraModel,
+    observed_bbox: dict[str, float],
+    center_x: float,
+    center_z: float,
+    size: dict[str, float],
+    base_y: float,
+    stats: FitStats | None = None,
+) -> Callable[[float], tuple[float, dict[str, float] | None]]:
+    """Objective of fit_yaw_from_bbox: bbox error of the cuboid at a fixed center."""
+    box_corners = corner_template(size["width"], size["depth"], size["height"]).corners
 
     def eval_yaw(yaw_deg: float) -> tuple[float, dict[str, float] | None]:
-        corners = oriented_box_corners(
-            center_x=center_x,
-            center_z=center_z,
-            width_m=width,
-            depth_m=depth,
-            height_m=height,
-            yaw_deg=yaw_deg,
-            base_y_m=base_y,
-        )
+        if stats is not None:
+            stats.evaluations += 1
+        corners = box_corners(center_x, center_z, yaw_deg, base_y)
         projected_bbox = bbox_from_projected_corners(corners, camera)
         if projected_bbox is None:
             return (float("inf"), None)
         return (bbox_fit_error(observed_bbox, projected_bbox), projected_bbox)
 
-    best_yaw = yaw_hint_deg if yaw_hint_deg is not None else 0.0
-    best_error, best_bbox = eval_yaw(best_yaw)
-
-    step = max(0.25, coarse_step_deg)
-    turns = int(math.ceil(360.0 / step))
-    for index in range(turns):
-        yaw = -180.0 + index * step
-        error, projected_bbox = eval_yaw(yaw)
-        if error < best_error:
-            best_error = error
-            best_yaw = yaw
-            best_bbox = projected_bbox
-
-    fine_span = max(1.0, step * 2.0)
-    fine_step = max(0.1, step / 8.0)
-    fine_count = int(math.ceil((fine_span * 2.0) / fine_step)) + 1
-    for index in range(fine_count):
-        yaw = best_yaw - fine_span + index * fine_step
-        error, projected_bbox = eval_yaw(yaw)
-        if error < best_error:
-            best_error = error
-            best_yaw = yaw
-            best_bbox = projected_bbox
-
-    normalized_yaw = ((best_yaw + 180.0) % 360.0) - 180.0
-    return normalized_yaw, best_error, best_bbox
+    return eval_yaw
 
 
-def fit_center_offset_and_yaw_from_bbox(
-    camera: dict[str, Any],
+def joint_pose_evaluator(
+    camera: CameraModel,
     observed_bbox: dict[str, float],
     anchor_world: tuple[float, float, float],
     size: dict[str, float],
-    floor_y: float,
-    elevation_m: float,
-    coarse_step_deg: float,
-    yaw_hint_deg: float | None,
-    offset_min_m: float,
-    offset_max_m: float,
-    offset_step_m: float,
-) -> tuple[float, float, dict[str, float] | None, float, tuple[float, float, float]]:
-    width = size["width"]
-    depth = size["depth"]
-    height = size["height"]
-    base_y = floor_y + elevation_m
+    base_y: float,
+    stats: FitStats | None = None,
+) -> tuple[
+    Callable[[float, float], tuple[float, dict[str, float] | None]],
+    Callable[[float], tuple[float, float, float]],
+]:
+    """
+    Objective of the joint offset+yaw fit: bbox error plus twice the anchor
+    (bottom-center) error, with the center pushed offset_m along the
+    camera->anchor direction. Returns (eval_pose, center_from_offset).
+    """
+    box_corners = corner_template(size["width"], size["depth"], size["height"]).corners
 
-    cam = camera_origin(camera)
+    cam = camera.origin
     away = (anchor_world[0] - cam[0], 0.0, anchor_world[2] - cam[2])
     away_len = math.sqrt(away[0] * away[0] + away[2] * away[2])
     if away_len <= 1e-7:
@@ -378,16 +833,10 @@ def fit_center_offset_and_yaw_from_bbox(
         )
 
     def eval_pose(yaw_deg: float, offset_m: float) -> tuple[float, dict[str, float] | None]:
+        if stats is not None:
+            stats.evaluations += 1
         center = center_from_offset(offset_m)
-        corners = oriented_box_corners(
-            center_x=center[0],
-            center_z=center[2],
-            width_m=width,
-            depth_m=depth,
-            height_m=height,
-            yaw_deg=yaw_deg,
-            base_y_m=base_y,
-        )
+        corners = box_corners(center[0], center[2], yaw_deg, base_y)
         projected_bbox = bbox_from_projected_corners(corners, camera)
         if projected_bbox is None:
             return (float("inf"), None)
@@ -403,25 +852,176 @@ def fit_center_offset_and_yaw_from_bbox(
         bbox_error = bbox_fit_error(observed_bbox, projected_bbox)
         return (bbox_error + anchor_error * 2.0, projected_bbox)
 
+    return eval_pose, center_from_offset
+
+
+def fit_yaw_from_bbox(
+    camera: dict[str, Any] | CameraModel,
+    observed_bbox: dict[str, float],
+    anchor_world: tuple[float, float, float],
+    size: dict[str, float],
+    floor_y: float,
+    elevation_m: float,
+    coarse_step_deg: float,
+    yaw_hint_deg: float | None,
+    search_mode: str = "scalar",
+    symmetry_period_deg: float = 360.0,
+    reference_yaw_deg: float | None = None,
+    stats: FitStats | None = None,
+    deadline: float | None = None,
+) -> tuple[float, float, dict[str, float] | None]:
+    """
+    Search the yaw whose projected cuboid best matches observed_bbox.
+
+    symmetry_period_deg < 360 restricts the coarse sweep to one period (see
+    yaw_symmetry_period_deg); the reported yaw is then the equivalent one
+    closest to reference_yaw_deg.
+
+    deadline (a time.perf_counter() value) makes the search anytime: the
+    coarse sweep runs coarse to fine (see grid_blocks) and the best pose so
+    far is returned once it passes, with stats.completed = False. Ties go to
+    the first candidate of the row-major sweep, so a search that finishes
+    returns the same pose with or without a deadline. The vectorized mode
+    evaluates the whole sweep at once and ignores the deadline.
+    """
+    if search_mode not in YAW_SEARCH_MODES:
+        raise ValueError(f"yawSearchMode invalido: {search_mode!r}")
+    camera = camera_model(camera)
+    if search_mode == "vectorized":
+        return load_vectorized().fit_yaw_vectorized(
+            camera=camera,
+            observed_bbox=observed_bbox,
+            anchor_world=anchor_world,
+            size=size,
+            floor_y=floor_y,
+            elevation_m=elevation_m,
+            coarse_step_deg=coarse_step_deg,
+            yaw_hint_deg=yaw_hint_deg,
+            symmetry_period_deg=symmetry_period_deg,
+            reference_yaw_deg=reference_yaw_deg,
+            stats=stats,
+        )
+
+    eval_yaw = yaw_pose_evaluator(
+        camera, observed_bbox, anchor_world[0], anchor_world[2], size, floor_y + elevation_m, stats
+    )
+
+    best_yaw = yaw_hint_deg if yaw_hint_deg is not None else 0.0
+    best_error, best_bbox = eval_yaw(best_yaw)
+    best_position = -1
+    completed = True
+
+    step = max(0.25, coarse_step_deg)
+    yaw_indices = yaw_sweep_indices(step, symmetry_period_deg)
+    for _, positions in grid_blocks(1, len(yaw_indices), deadline is not None):
+        for position in positions:
+            if deadline_passed(deadline):
+                completed = False
+                break
+            yaw = -180.0 + yaw_indices[position] * step
+            error, projected_bbox = eval_yaw(yaw)
+            if error < best_error or (error == best_error and position < best_position):
+                best_error = error
+                best_yaw = yaw
+                best_bbox = projected_bbox
+                best_position = position
+        if not completed:
+            break
+    lap_stage(stats, "coarseGrid")
+
+    fine_span = max(1.0, step * 2.0)
+    fine_step = max(0.1, step / 8.0)
+    fine_count = int(math.ceil((fine_span * 2.0) / fine_step)) + 1
+    for index in range(fine_count if completed else 0):
+        if deadline_passed(deadline):
+            completed = False
+            break
+        yaw = best_yaw - fine_span + index * fine_step
+        error, projected_bbox = eval_yaw(yaw)
+        if error < best_error:
+            best_error = error
+            best_yaw = yaw
+            best_bbox = projected_bbox
+
+    if stats is not None:
+        stats.completed = completed
+    if symmetry_period_deg < 360.0:
+        best_yaw = select_equivalent_yaw(best_yaw, symmetry_period_deg, reference_yaw_deg)
+    normalized_yaw = ((best_yaw + 180.0) % 360.0) - 180.0
+    return normalized_yaw, best_error, best_bbox
+
+
+def fit_center_offset_and_yaw_from_bbox(
+    camera: dict[str, Any] | CameraModel,
+    observed_bbox: dict[str, float],
+    anchor_world: tuple[float, float, float],
+    size: dict[str, float],
+    floor_y: float,
+    elevation_m: float,
+    coarse_step_deg: float,
+    yaw_hint_deg: float | None,
+    offset_min_m: float,
+    offset_max_m: float,
+    offset_step_m: float,
+    symmetry_period_deg: float = 360.0,
+    reference_yaw_deg: float | None = None,
+    stats: FitStats | None = None,
+    prune: bool = True,
+    deadline: float | None = None,
+) -> tuple[float, float, dict[str, float] | None, float, tuple[float, float, float]]:
+    """
+    Grid search over yaw x center offset. With prune, whole offset rows are
+    skipped when a lower bound over every yaw at that offset
+    (center_fit_lower_bound) cannot beat the best error so far; the result
+    is the same. deadline works as in fit_yaw_from_bbox.
+    """
+    camera = camera_model(camera)
+    base_y = floor_y + elevation_m
+    eval_pose, center_from_offset = joint_pose_evaluator(camera, observed_bbox, anchor_world, size, base_y, stats)
+    extent = observed_extent(observed_bbox)
+
+    def row_pruned(offset_m: float, row_size: int) -> bool:
+        if not prune:
+            return False
+        if stats is not None and stats.timing is not None:
+            stats.timing.projections += BOUND_PROJECTIONS
+        center = center_from_offset(offset_m)
+        if center_fit_lower_bound(camera, extent, center[0], center[2], size, base_y) > best_error + PRUNE_MARGIN:
+            if stats is not None:
+                stats.pruned += row_size
+            return True
+        return False
+
     step_deg = max(0.25, coarse_step_deg)
     step_offset = max(0.02, offset_step_m)
-    yaw_candidates = int(math.ceil(360.0 / step_deg))
+    yaw_indices = yaw_sweep_indices(step_deg, symmetry_period_deg)
     offset_count = int(math.floor((offset_max_m - offset_min_m) / step_offset)) + 1
 
     best_yaw = yaw_hint_deg if yaw_hint_deg is not None else 0.0
     best_offset = 0.0
     best_error, best_bbox = eval_pose(best_yaw, best_offset)
+    best_position = (-1, -1)
+    completed = True
 
-    for offset_index in range(offset_count):
+    for offset_index, positions in grid_blocks(offset_count, len(yaw_indices), deadline is not None):
         offset_m = offset_min_m + offset_index * step_offset
-        for yaw_index in range(yaw_candidates):
-            yaw = -180.0 + yaw_index * step_deg
+        if row_pruned(offset_m, len(positions)):
+            continue
+        for position in positions:
+            if deadline_passed(deadline):
+                completed = False
+                break
+            yaw = -180.0 + yaw_indices[position] * step_deg
             error, projected_bbox = eval_pose(yaw, offset_m)
-            if error < best_error:
+            if error < best_error or (error == best_error and (offset_index, position) < best_position):
                 best_error = error
                 best_yaw = yaw
                 best_offset = offset_m
                 best_bbox = projected_bbox
+                best_position = (offset_index, position)
+        if not completed:
+            break
+    lap_stage(stats, "coarseGrid")
 
     fine_yaw_span = max(2.0, step_deg * 2.0)
     fine_yaw_step = max(0.1, step_deg / 8.0)
@@ -430,9 +1030,14 @@ def fit_center_offset_and_yaw_from_bbox(
 
     fine_yaw_count = int(math.ceil((fine_yaw_span * 2.0) / fine_yaw_step)) + 1
     fine_offset_count = int(math.ceil((fine_offset_span * 2.0) / fine_offset_step)) + 1
-    for offset_index in range(fine_offset_count):
+    for offset_index in range(fine_offset_count if completed else 0):
         offset_m = best_offset - fine_offset_span + offset_index * fine_offset_step
+        if row_pruned(offset_m, fine_yaw_count):
+            continue
         for yaw_index in range(fine_yaw_count):
+            if deadline_passed(deadline):
+                completed = False
+                break
             yaw = best_yaw - fine_yaw_span + yaw_index * fine_yaw_step
             error, projected_bbox = eval_pose(yaw, offset_m)
             if error < best_error:
@@ -440,19 +1045,210 @@ def fit_center_offset_and_yaw_from_bbox(
                 best_yaw = yaw
                 best_offset = offset_m
                 best_bbox = projected_bbox
+        if not completed:
+            break
 
+    if stats is not None:
+        stats.completed = completed
+    if symmetry_period_deg < 360.0:
+        best_yaw = select_equivalent_yaw(best_yaw, symmetry_period_deg, reference_yaw_deg)
     normalized_yaw = ((best_yaw + 180.0) % 360.0) - 180.0
     best_center = center_from_offset(best_offset)
     return normalized_yaw, best_error, best_bbox, best_offset, best_center
 
 
-def parse_input_payload(payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any]]:
+def fit_pose_local(
+    eval_pose: Callable[[float, float], tuple[float, dict[str, float] | None]],
+    yaw_hint_deg: float | None,
+    offset_min_m: float,
+    offset_max_m: float,
+    seed_yaw_step_deg: float,
+    seed_offset_count: int,
+    local_starts: int,
+    max_evaluations: int,
+    tolerance: float,
+    symmetry_period_deg: float = 360.0,
+    stats: FitStats | None = None,
+    deadline: float | None = None,
+) -> tuple[float, float, dict[str, float] | None, float]:
+    """
+    "coarse+local" strategy: a small yaw x offset seed grid, then a bounded
+    Nelder-Mead run from the best few seeds. max_evaluations caps the whole
+    search, hint seed included: a seed grid larger than the rest of the
+    budget is sampled coarse to fine and cut off there. A degenerate offset
+    range (min == max) searches yaw only. Past deadline no more candidates
+    are evaluated and the best so far is returned.
+
+    Returns the raw (unnormalized) yaw, error, projected bbox and offset.
+    """
+    best = [float("inf"), 0.0, 0.0, None]
+    completed = [True]
+
+    def evaluate(yaw_deg: float, offset_m: float, timed: bool = True) -> float:
+        if timed and deadline_passed(deadline):
+            completed[0] = False
+            return float("inf")
+        error, projected_bbox = eval_pose(yaw_deg, offset_m)
+        if error < best[0]:
+            best[:] = [error, yaw_deg, offset_m, projected_bbox]
+        return error
+
+    hint_yaw = yaw_hint_deg if yaw_hint_deg is not None else 0.0
+    hint_offset = min(max(0.0, offset_min_m), offset_max_m)
+    seeds = [(evaluate(hint_yaw, hint_offset, timed=False), hint_yaw, hint_offset)]
+
+    fit_offset = offset_max_m > offset_min_m
+    if fit_offset and seed_offset_count > 1:
+        offset_seeds = [
+            offset_min_m + (offset_max_m - offset_min_m) * index / (seed_offset_count - 1)
+            for index in range(seed_offset_count)
+        ]
+    else:
+        offset_seeds = [(offset_min_m + offset_max_m) * 0.5]
+    seed_step = max(0.25, seed_yaw_step_deg)
+    seed_indices = yaw_sweep_indices(seed_step, symmetry_period_deg)
+    grid_budget = max(0, max_evaluations - 1)
+    anytime = deadline is not None or len(offset_seeds) * len(seed_indices) > grid_budget
+    cells = (
+        (row, position)
+        for row, positions in grid_blocks(len(offset_seeds), len(seed_indices), anytime)
+        for position in positions
+    )
+    grid_seeds: dict[tuple[int, int], tuple[float, float, float]] = {}
+    for row, position in islice(cells, grid_budget):
+        yaw = -180.0 + seed_indices[position] * seed_step
+        grid_seeds[(row, position)] = (evaluate(yaw, offset_seeds[row]), yaw, offset_seeds[row])
+    # Row-major order, so equal-error seeds rank the same whatever order they were evaluated in.
+    seeds.extend(grid_seeds[key] for key in sorted(grid_seeds))
+    used = len(seeds)
+    lap_stage(stats, "coarseGrid")
+
+    seeds.sort(key=lambda seed: seed[0])
+    starts: list[tuple[float, float, float]] = []
+    for seed in seeds:
+        if len(starts) >= max(1, local_starts):
+            break
+        if math.isfinite(seed[0]) and all((seed[1], seed[2]) != (start[1], start[2]) for start in starts):
+            starts.append(seed)
+
+    converged = bool(starts)
+    remaining = max(0, max_evaluations - used)
+    for position, (_, yaw, offset_m) in enumerate(starts):
+        if deadline_passed(deadline):
+            completed[0] = False
+            break
+        budget = remaining // (len(starts) - position)
+        if budget < 3:
+            converged = False
+            break
+        if fit_offset:
+            offset_step = (offset_max_m - offset_min_m) / (2.0 * max(1, len(offset_seeds) - 1))
+            _, _, spent, run_converged = nelder_mead(
+                lambda point: evaluate(point[0], point[1]),
+                start=(yaw, offset_m),
+                initial_step=(seed_step * 0.5, offset_step),
+                lower=(None, offset_min_m),
+                upper=(None, offset_max_m),
+                max_evaluations=budget,
+                tolerance=tolerance,
+                deadline=deadline,
+            )
+        else:
+            _, _, spent, run_converged = nelder_mead(
+                lambda point: evaluate(point[0], offset_m),
+                start=(yaw,),
+                initial_step=(seed_step * 0.5,),
+                lower=(None,),
+                upper=(None,),
+                max_evaluations=budget,
+                tolerance=tolerance,
+                deadline=deadline,
+            )
+        remaining -= spent
+        converged = converged and run_converged
+        if not run_converged and deadline_passed(deadline):
+            completed[0] = False
+
+    if stats is not None:
+        stats.converged = converged
+        stats.completed = completed[0]
+    best_error, best_yaw, best_offset, best_bbox = best
+    return best_yaw, best_error, best_bbox, best_offset
+
+
+def fit_pose_seeded(
+    eval_pose: Callable[[float, float], tuple[float, dict[str, float] | None]],
+    seed_yaw_deg: float,
+    seed_offset_m: float,
+    yaw_window_deg: float,
+    offset_min_m: float,
+    offset_max_m: float,
+    yaw_step_deg: float,
+    offset_step_m: float,
+    max_evaluations: int,
+    tolerance: float,
+    stats: FitStats | None = None,
+    deadline: float | None = None,
+) -> tuple[float, float, dict[str, float] | None, float]:
+    """
+    Warm-started fit: one bounded Nelder-Mead run from a previous pose, kept
+    within yaw_window_deg of the seed yaw and inside [offset_min_m,
+    offset_max_m], which the caller narrows around seed_offset_m. A
+    degenerate offset range searches yaw only. The run stops early once
+    deadline passes.
+
+    Returns the raw (unnormalized) yaw, error, projected bbox and offset.
+    """
+    best = [float("inf"), seed_yaw_deg, seed_offset_m, None]
+
+    def evaluate(yaw_deg: float, offset_m: float) -> float:
+        error, projected_bbox = eval_pose(yaw_deg, offset_m)
+        if error < best[0]:
+            best[:] = [error, yaw_deg, offset_m, projected_bbox]
+        return error
+
+    yaw_low = seed_yaw_deg - yaw_window_deg
+    yaw_high = seed_yaw_deg + yaw_window_deg
+    yaw_step = min(max(0.25, yaw_step_deg), yaw_window_deg)
+    if offset_max_m > offset_min_m:
+        _, _, _, converged = nelder_mead(
+            lambda point: evaluate(point[0], point[1]),
+            start=(seed_yaw_deg, seed_offset_m),
+            initial_step=(yaw_step, min(offset_step_m, offset_max_m - offset_min_m)),
+            lower=(yaw_low, offset_min_m),
+            upper=(yaw_high, offset_max_m),
+            max_evaluations=max(3, max_evaluations),
+            tolerance=tolerance,
+            deadline=deadline,
+        )
+    else:
+        _, _, _, converged = nelder_mead(
+            lambda point: evaluate(point[0], seed_offset_m),
+            start=(seed_yaw_deg,),
+            initial_step=(yaw_step,),
+            lower=(yaw_low,),
+            upper=(yaw_high,),
+            max_evaluations=max(2, max_evaluations),
+            tolerance=tolerance,
+            deadline=deadline,
+        )
+
+    if stats is not None:
+        stats.converged = converged
+        stats.completed = converged or not deadline_passed(deadline)
+    best_error, best_yaw, best_offset, best_bbox = best
+    return best_yaw, best_error, best_bbox, best_offset
+
+
+def parse_input_payload(
+    payload: dict[str, Any],
+) -> tuple[dict[str, Any] | CameraModel, dict[str, Any], dict[str, Any], dict[str, Any]]:
     camera = payload.get("camera")
     detection = payload.get("detection")
     obj = payload.get("object")
     config = payload.get("config", {})
 
-    if not isinstance(camera, dict):
+    if not isinstance(camera, (dict, CameraModel)):
         raise ValueError("payload.camera es requerido")
     if not isinstance(detection, dict):
         raise ValueError("payload.detection es requerido")
@@ -553,32 +1349,188 @@ def frame_timestamp(frame: dict[str, Any], index: int) -> str:
     return f"frame-{index + 1}"
 
 
-def lift_cuboid(payload: dict[str, Any]) -> dict[str, Any]:
-    camera, detection, obj, config = parse_input_payload(payload)
-    bbox = parse_bbox(detection)
-    anchor_uv = parse_anchor_uv(detection)
-    size = parse_object_size(obj)
+class FitSettings:
+    """Fit-related config of one lift, parsed once."""
+
+    __slots__ = (
+        "fit_yaw",
+        "fit_center_offset",
+        "coarse_step",
+        "search_mode",
+        "strategy",
+        "offset_min_m",
+        "offset_max_m",
+        "offset_step_m",
+        "seed_yaw_step_deg",
+        "seed_offset_count",
+        "local_starts",
+        "max_evaluations",
+        "tolerance",
+        "warm_yaw_window_deg",
+        "warm_offset_window_m",
+        "prune",
+        "latency_budget_ms",
+        "collect_timing",
+    )
 
-    floor_y = get_number(config, ["floorY", "floor_y"], 0.0) or 0.0
-    elevation_m = get_number(obj, ["elevationM", "elevation"], 0.0) or 0.0
+    def __init__(self, config: dict[str, Any], size: dict[str, float]):
+        self.fit_yaw = bool(config.get("fitYawFromBBox", False))
+        self.fit_center_offset = bool(config.get("fitCenterOffsetFromBBox", False))
+        self.coarse_step = get_number(config, ["yawSearchStepDeg", "yaw_step_deg"], 2.0) or 2.0
+        self.search_mode = str(config.get("yawSearchMode", "scalar"))
+        self.strategy = str(config.get("fitStrategy", "grid"))
+        if self.strategy not in FIT_STRATEGIES:
+            raise ValueError(f"fitStrategy invalido: {self.strategy!r}")
+        self.offset_min_m = get_number(config, ["centerOffsetMinM"], -size["depth"] * 0.5) or (-size["depth"] * 0.5)
+        self.offset_max_m = get_number(config, ["centerOffsetMaxM"], size["depth"] * 0.5) or (size["depth"] * 0.5)
+        self.offset_step_m = get_number(config, ["centerOffsetStepM"], 0.08) or 0.08
+        self.seed_yaw_step_deg = get_number(config, ["localSeedYawStepDeg"], 30.0) or 30.0
+        self.seed_offset_count = int(get_number(config, ["localSeedOffsetCount"], 3.0) or 3.0)
+        self.local_starts = int(get_number(config, ["localStarts"], 3.0) or 3.0)
+        self.max_evaluations = int(get_number(config, ["fitMaxEvaluations"], 240.0))
+        if self.max_evaluations < 1:
+            raise ValueError("fitMaxEvaluations debe ser >= 1")
+        self.tolerance = get_number(config, ["fitTolerance"], 1e-6) or 1e-6
+        self.warm_yaw_window_deg = get_number(config, ["warmStartYawWindowDeg"], 10.0) or 10.0
+        self.warm_offset_window_m = get_number(config, ["warmStartOffsetWindowM"], 0.1) or 0.1
+        self.prune = bool(config.get("fitPruning", True))
+        self.latency_budget_ms = get_number(config, ["latencyBudgetMs"], None)
+        if self.latency_budget_ms is not None and self.latency_budget_ms < 0.0:
+            raise ValueError("latencyBudgetMs debe ser >= 0")
+        self.collect_timing = bool(config.get("collectTiming", False))
+
+
+class PoseFit:
+    """Outcome of fit_pose: fitted yaw/center and the fit metadata block."""
+
+    __slots__ = (
+        "yaw_deg",
+        "error",
+        "projected_bbox",
+        "center_offset_m",
+        "center_x",
+        "center_z",
+        "stats",
+        "warm_started",
+    )
 
-    origin, direction = ray_from_uv(camera, anchor_uv[0], anchor_uv[1])
-    anchor_world = intersect_ray_with_floor(origin, direction, floor_y + elevation_m)
-    if anchor_world is None:
-        raise ValueError("no se pudo intersectar rayo con plano de piso")
+    def __init__(
+        self,
+        yaw_deg: float,
+        error: float | None,
+        projected_bbox: dict[str, float] | None,
+        center_offset_m: float,
+        center_x: float,
+        center_z: float,
+        stats: FitStats,
+        warm_started: bool = False,
+    ):
+        self.yaw_deg = yaw_deg
+        self.error = error
+        self.projected_bbox = projected_bbox
+        self.center_offset_m = center_offset_m
+        self.center_x = center_x
+        self.center_z = center_z
+        self.stats = stats
+        self.warm_started = warm_started
+
+
+def fit_pose(
+    camera: CameraModel,
+    bbox: dict[str, float],
+    anchor_world: tuple[float, float, float],
+    size: dict[str, float],
+    floor_y: float,
+    elevation_m: float,
+    yaw_hint: float | None,
+    settings: FitSettings,
+    config: dict[str, Any],
+    seed: tuple[float, float] | None = None,
+    timing: LiftTiming | None = None,
+) -> PoseFit:
+    """
+    Run the fitter selected by settings (requires settings.fit_yaw).
 
-    yaw_hint = get_number(obj, ["yawDeg", "rotationDeg", "yaw"], None)
-    fit_yaw = bool(config.get("fitYawFromBBox", False))
-    fit_center_offset = bool(config.get("fitCenterOffsetFromBBox", False))
-    coarse_step = get_number(config, ["yawSearchStepDeg", "yaw_step_deg"], 2.0) or 2.0
-    offset_min_m = get_number(config, ["centerOffsetMinM"], -size["depth"] * 0.5) or (-size["depth"] * 0.5)
-    offset_max_m = get_number(config, ["centerOffsetMaxM"], size["depth"] * 0.5) or (size["depth"] * 0.5)
-    offset_step_m = get_number(config, ["centerOffsetStepM"], 0.08) or 0.08
-    center_world_x = anchor_world[0]
-    center_world_z = anchor_world[2]
-    center_offset_m = 0.0
+    seed = (yaw_deg, center_offset_m) of a previous fit replaces the global
+    search with fit_pose_seeded inside the warm-start windows.
 
-    if fit_yaw and fit_center_offset:
+    settings.latency_budget_ms bounds the search time, counted from here;
+    the fitters then return their best pose so far (stats.completed).
+
+    timing, when given, gets the coarse search booked as its coarseGrid lap.
+    """
+    deadline = None
+    if settings.latency_budget_ms is not None:
+        deadline = time.perf_counter() + settings.latency_budget_ms / 1000.0
+    symmetry_period, reference_yaw = parse_yaw_symmetry(config, size, yaw_hint)
+    stats = FitStats(timing)
+
+    if seed is not None or settings.strategy == "coarse+local":
+        base_y = floor_y + elevation_m
+        if settings.fit_center_offset:
+            eval_pose, center_from_offset = joint_pose_evaluator(camera, bbox, anchor_world, size, base_y, stats)
+            offset_min_m, offset_max_m = settings.offset_min_m, settings.offset_max_m
+        else:
+            eval_yaw = yaw_pose_evaluator(camera, bbox, anchor_world[0], anchor_world[2], size, base_y, stats)
+
+            def eval_pose(yaw_deg: float, offset_m: float) -> tuple[float, dict[str, float] | None]:
+                return eval_yaw(yaw_deg)
+
+            offset_min_m = offset_max_m = 0.0
+        if seed is not None:
+            seed_yaw, seed_offset = seed
+            if offset_max_m > offset_min_m:
+                if settings.strategy == "grid":
+                    # Stay within what the cold grid can reach: its fine pass may overshoot the range.
+                    overshoot = max(0.08, max(0.02, settings.offset_step_m) * 2.0)
+                    offset_min_m -= overshoot
+                    offset_max_m += overshoot
+                seed_offset = min(max(seed_offset, offset_min_m), offset_max_m)
+                offset_min_m = max(offset_min_m, seed_offset - settings.warm_offset_window_m)
+                offset_max_m = min(offset_max_m, seed_offset + settings.warm_offset_window_m)
+            else:
+                seed_offset = offset_min_m
+            yaw_deg, fit_error, projected_bbox, center_offset_m = fit_pose_seeded(
+                eval_pose,
+                seed_yaw_deg=seed_yaw,
+                seed_offset_m=seed_offset,
+                yaw_window_deg=settings.warm_yaw_window_deg,
+                offset_min_m=offset_min_m,
+                offset_max_m=offset_max_m,
+                yaw_step_deg=settings.coarse_step,
+                offset_step_m=settings.offset_step_m,
+                max_evaluations=settings.max_evaluations,
+                tolerance=settings.tolerance,
+                stats=stats,
+                deadline=deadline,
+            )
+        else:
+            yaw_deg, fit_error, projected_bbox, center_offset_m = fit_pose_local(
+                eval_pose,
+                yaw_hint_deg=yaw_hint,
+                offset_min_m=offset_min_m,
+                offset_max_m=offset_max_m,
+                seed_yaw_step_deg=settings.seed_yaw_step_deg,
+                seed_offset_count=settings.seed_offset_count,
+                local_starts=settings.local_starts,
+                max_evaluations=settings.max_evaluations,
+                tolerance=settings.tolerance,
+                symmetry_period_deg=symmetry_period,
+                stats=stats,
+                deadline=deadline,
+            )
+        if symmetry_period < 360.0:
+            yaw_deg = select_equivalent_yaw(yaw_deg, symmetry_period, reference_yaw)
+        yaw_deg = normalize_angle_deg(yaw_deg)
+        warm_started = seed is not None
+        if settings.fit_center_offset:
+            fitted_center = center_from_offset(center_offset_m)
+            return PoseFit(
+                yaw_deg, fit_error, projected_bbox, center_offset_m, fitted_center[0], fitted_center[2], stats, warm_started
+            )
+        return PoseFit(yaw_deg, fit_error, projected_bbox, 0.0, anchor_world[0], anchor_world[2], stats, warm_started)
+
+    if settings.fit_center_offset:
         yaw_deg, fit_error, projected_bbox, center_offset_m, fitted_center = fit_center_offset_and_yaw_from_bbox(
             camera=camera,
             observed_bbox=bbox,
@@ -586,61 +1538,83 @@ def lift_cuboid(payload: dict[str, Any]) -> dict[str, Any]:
             size=size,
             floor_y=floor_y,
             elevation_m=elevation_m,
-            coarse_step_deg=coarse_step,
+            coarse_step_deg=settings.coarse_step,
             yaw_hint_deg=yaw_hint,
-            offset_min_m=offset_min_m,
-            offset_max_m=offset_max_m,
-            offset_step_m=offset_step_m,
+            offset_min_m=settings.offset_min_m,
+            offset_max_m=settings.offset_max_m,
+            offset_step_m=settings.offset_step_m,
+            symmetry_period_deg=symmetry_period,
+            reference_yaw_deg=reference_yaw,
+            stats=stats,
+            prune=settings.prune,
+            deadline=deadline,
         )
-        center_world_x = fitted_center[0]
-        center_world_z = fitted_center[2]
-    elif fit_yaw:
-        yaw_deg, fit_error, projected_bbox = fit_yaw_from_bbox(
-            camera=camera,
-            observed_bbox=bbox,
-            anchor_world=anchor_world,
-            size=size,
-            floor_y=floor_y,
-            elevation_m=elevation_m,
-            coarse_step_deg=coarse_step,
-            yaw_hint_deg=yaw_hint,
-        )
-    else:
-        yaw_deg = yaw_hint if yaw_hint is not None else 0.0
-        corners = oriented_box_corners(
-            center_x=center_world_x,
-            center_z=center_world_z,
-            width_m=size["width"],
-            depth_m=size["depth"],
-            height_m=size["height"],
-            yaw_deg=yaw_deg,
-            base_y_m=floor_y + elevation_m,
-        )
-        projected_bbox = bbox_from_projected_corners(corners, camera)
-        fit_error = bbox_fit_error(bbox, projected_bbox) if projected_bbox is not None else None
+        return PoseFit(yaw_deg, fit_error, projected_bbox, center_offset_m, fitted_center[0], fitted_center[2], stats)
+
+    yaw_deg, fit_error, projected_bbox = fit_yaw_from_bbox(
+        camera=camera,
+        observed_bbox=bbox,
+        anchor_world=anchor_world,
+        size=size,
+        floor_y=floor_y,
+        elevation_m=elevation_m,
+        coarse_step_deg=settings.coarse_step,
+        yaw_hint_deg=yaw_hint,
+        search_mode=settings.search_mode,
+        symmetry_period_deg=symmetry_period,
+        reference_yaw_deg=reference_yaw,
+        stats=stats,
+        deadline=deadline,
+    )
+    return PoseFit(yaw_deg, fit_error, projected_bbox, 0.0, anchor_world[0], anchor_world[2], stats)
 
-    base_y = floor_y + elevation_m
+
+def build_fit_block(
+    settings: FitSettings,
+    fit_error: float | None,
+    stats: FitStats | None,
+    warm_started: bool = False,
+) -> dict[str, Any]:
+    fit_yaw = settings.fit_yaw
+    joint = fit_yaw and settings.fit_center_offset
+    return {
+        "enabled": fit_yaw,
+        "fitCenterOffset": settings.fit_center_offset if fit_yaw else None,
+        "errorL1": fit_error,
+        "coarseStepDeg": settings.coarse_step if fit_yaw else None,
+        "offsetRangeM": [settings.offset_min_m, settings.offset_max_m] if joint else None,
+        "offsetStepM": settings.offset_step_m if joint else None,
+        "strategy": settings.strategy if fit_yaw else None,
+        "evaluations": stats.evaluations if (fit_yaw and stats is not None) else None,
+        "converged": stats.converged if (fit_yaw and stats is not None) else None,
+        "pruned": stats.pruned if (fit_yaw and stats is not None) else None,
+        "latencyBudgetMs": settings.latency_budget_ms if fit_yaw else None,
+        "searchCompleted": stats.completed if (fit_yaw and stats is not None) else None,
+        "warmStart": warm_started if fit_yaw else None,
+    }
+
+
+def build_lift_output(
+    anchor_uv: tuple[float, float],
+    bbox: dict[str, float],
+    size: dict[str, float],
+    anchor_world: Sequence[float],
+    center_world_x: float,
+    center_world_z: float,
+    base_y: float,
+    center_offset_m: float,
+    yaw_deg: float,
+    projected_bbox: dict[str, float] | None,
+    fit_block: dict[str, Any],
+    corners: Sequence[Sequence[float]],
+) -> dict[str, Any]:
     center_world = (center_world_x, base_y + size["height"] * 0.5, center_world_z)
-    corners = oriented_box_corners(
-        center_x=center_world_x,
-        center_z=center_world_z,
-        width_m=size["width"],
-        depth_m=size["depth"],
-        height_m=size["height"],
-        yaw_deg=yaw_deg,
-        base_y_m=base_y,
-    )
     footprint = corners[0::2]
     footprint_xz = [[point[0], point[2]] for point in footprint]
 
     return {
         "status": "ok",
-        "assumptions": [
-            "single_camera",
-            "floor_plane_support",
-            "object_pitch_roll_fixed_zero",
-            "anchor_uv_bottom_center_default",
-        ],
+        "assumptions": list(ASSUMPTIONS),
         "inputEcho": {
             "anchorUV": [anchor_uv[0], anchor_uv[1]],
             "bbox": bbox,
@@ -654,165 +1628,1447 @@ def lift_cuboid(payload: dict[str, Any]) -> dict[str, Any]:
             "centerOffsetFromAnchorM": center_offset_m,
             "yawDeg": yaw_deg,
             "reprojectedBBox": projected_bbox,
-            "fit": {
-                "enabled": fit_yaw,
-                "fitCenterOffset": fit_center_offset if fit_yaw else None,
-                "errorL1": fit_error,
-                "coarseStepDeg": coarse_step if fit_yaw else None,
-                "offsetRangeM": [offset_min_m, offset_max_m] if (fit_yaw and fit_center_offset) else None,
-                "offsetStepM": offset_step_m if (fit_yaw and fit_center_offset) else None,
-            },
+            "fit": fit_block,
             "cornersWorld": [[point[0], point[1], point[2]] for point in corners],
         },
     }
 
 
-def lift_cuboid_sequence(payload: dict[str, Any]) -> dict[str, Any]:
-    camera = payload.get("camera")
-    obj = payload.get("object")
-    config = payload.get("config", {})
-    frames = payload.get("frames")
+class LiftResult:
+    """
+    One lift kept as numbers; to_dict() builds the lift_cuboid JSON payload.
+
+    Corners, footprint and the assumption/echo blocks are derived again on
+    demand (corners bit-identically, through the corner template cache), so
+    holding many results costs a fraction of holding their dicts. bbox and
+    projected_bbox are kept as (x, y, width, height) and size as (width,
+    depth, height). A timed lift (config collectTiming) adds its LiftTiming
+    as result.timing.
+    """
 
-    if not isinstance(camera, dict):
-        raise ValueError("payload.camera es requerido para modo batch")
-    if not isinstance(obj, dict):
-        raise ValueError("payload.object es requerido para modo batch")
-    if not isinstance(config, dict):
-        config = {}
-    if not isinstance(frames, list) or not frames:
-        raise ValueError("payload.frames debe ser una lista no vacia para modo batch")
+    __slots__ = (
+        "anchor_uv",
+        "bbox",
+        "size",
+        "anchor_world",
+        "center_x",
+        "center_z",
+        "base_y",
+        "center_offset_m",
+        "yaw_deg",
+        "projected_bbox",
+        "fit_error",
+        "settings",
+        "stats",
+        "warm_started",
+        "timing",
+    )
+
+    def __init__(
+        self,
+        anchor_uv: tuple[float, float],
+        bbox: dict[str, float],
+        size: dict[str, float],
+        anchor_world: tuple[float, float, float],
+        center_x: float,
+        center_z: float,
+        base_y: float,
+        center_offset_m: float,
+        yaw_deg: float,
+        projected_bbox: dict[str, float] | None,
+        fit_error: float | None,
+        settings: FitSettings,
+        stats: FitStats | None,
+        warm_started: bool = False,
+        timing: LiftTiming | None = None,
+    ):
+        self.anchor_uv = anchor_uv
+        self.bbox = (bbox["x"], bbox["y"], bbox["width"], bbox["height"])
+        self.size = (size["width"], size["depth"], size["height"])
+        self.anchor_world = anchor_world
+        self.center_x = center_x
+        self.center_z = center_z
+        self.base_y = base_y
+        self.center_offset_m = center_offset_m
+        self.yaw_deg = yaw_deg
+        self.projected_bbox = (
+            None
+            if projected_bbox is None
+            else (projected_bbox["x"], projected_bbox["y"], projected_bbox["width"], projected_bbox["height"])
+        )
+        self.fit_error = fit_error
+        self.settings = settings
+        self.stats = stats
+        self.warm_started = warm_started
+        self.timing = timing
+
+    @property
+    def fit_enabled(self) -> bool:
+        return self.settings.fit_yaw
+
+    @property
+    def center_y(self) -> float:
+        return self.base_y + self.size[2] * 0.5
+
+    def corners(self) -> list[tuple[float, float, float]]:
+        width, depth, height = self.size
+        return oriented_box_corners(self.center_x, self.center_z, width, depth, height, self.yaw_deg, self.base_y)
+
+    def to_dict(self, profile: str = "full") -> dict[str, Any]:
+        """The lift_cuboid payload; pose/minimal profiles drop the echo, corners and assumptions."""
+        if self.timing is None:
+            return self.output_dict(profile)
+        started = time.perf_counter()
+        output = self.output_dict(profile)
+        output["result"]["timing"] = self.timing.output_block(started)
+        return output
+
+    def result_dict(self, profile: str = "full") -> dict[str, Any]:
+        """The "result" block of to_dict(profile)."""
+        if self.timing is None:
+            return self.result_block(profile)
+        started = time.perf_counter()
+        result = self.result_block(profile)
+        result["timing"] = self.timing.output_block(started)
+        return result
+
+    def output_dict(self, profile: str = "full") -> dict[str, Any]:
+        """to_dict without the timing block."""
+        if profile != "full":
+            return {"status": "ok", "profile": profile, "result": self.result_block(profile)}
+        x, y, width, height = self.bbox
+        projected = self.projected_bbox
+        return build_lift_output(
+            anchor_uv=self.anchor_uv,
+            bbox={"x": x, "y": y, "width": width, "height": height},
+            size={"width": self.size[0], "depth": self.size[1], "height": self.size[2]},
+            anchor_world=self.anchor_world,
+            center_world_x=self.center_x,
+            center_world_z=self.center_z,
+            base_y=self.base_y,
+            center_offset_m=self.center_offset_m,
+            yaw_deg=self.yaw_deg,
+            projected_bbox=(
+                None
+                if projected is None
+                else {"x": projected[0], "y": projected[1], "width": projected[2], "height": projected[3]}
+            ),
+            fit_block=build_fit_block(self.settings, self.fit_error, self.stats, self.warm_started),
+            corners=self.corners(),
+        )
+
+    def result_block(self, profile: str = "full") -> dict[str, Any]:
+        """result_dict without the timing block."""
+        if profile == "minimal":
+            return {
+                "baseCenterWorld": [self.center_x, self.base_y, self.center_z],
+                "yawDeg": self.yaw_deg,
+                "fitErrorL1": self.fit_error,
+            }
+        if profile == "pose":
+            stats = self.stats if self.fit_enabled else None
+            return {
+                "anchorWorld": [self.anchor_world[0], self.anchor_world[1], self.anchor_world[2]],
+                "baseCenterWorld": [self.center_x, self.base_y, self.center_z],
+                "centerWorld": [self.center_x, self.center_y, self.center_z],
+                "centerOffsetFromAnchorM": self.center_offset_m,
+                "yawDeg": self.yaw_deg,
+                "fit": {
+                    "enabled": self.fit_enabled,
+                    "errorL1": self.fit_error,
+                    "evaluations": stats.evaluations if stats is not None else None,
+                    "searchCompleted": stats.completed if stats is not None else None,
+                },
+            }
+        return self.output_dict()["result"]
+
+
+def lift_result_record(result: LiftResult) -> tuple[Any, ...]:
+    """A LiftResult as plain tuples (settings left out), for LiftCache."""
+    stats = result.stats
+    return (
+        result.anchor_uv,
+        result.bbox,
+        result.size,
+        result.anchor_world,
+        result.center_x,
+        result.center_z,
+        result.base_y,
+        result.center_offset_m,
+        result.yaw_deg,
+        result.projected_bbox,
+        result.fit_error,
+        None if stats is None else (stats.evaluations, stats.converged, stats.pruned, stats.completed),
+        result.warm_started,
+    )
+
+
+def lift_result_from_record(record: tuple[Any, ...], settings: FitSettings) -> LiftResult:
+    """A fresh LiftResult from lift_result_record output and the settings of its request."""
+    result = LiftResult.__new__(LiftResult)
+    (
+        result.anchor_uv,
+        result.bbox,
+        result.size,
+        result.anchor_world,
+        result.center_x,
+        result.center_z,
+        result.base_y,
+        result.center_offset_m,
+        result.yaw_deg,
+        result.projected_bbox,
+        result.fit_error,
+        stats_record,
+        result.warm_started,
+    ) = record
+    result.settings = settings
+    result.stats = None
+    result.timing = None
+    if stats_record is not None:
+        result.stats = FitStats()
+        result.stats.evaluations, result.stats.converged, result.stats.pruned, result.stats.completed = stats_record
+    return result
+
+
+def parse_output_profile(config: dict[str, Any]) -> str:
+    profile = str(config.get("outputProfile", "full"))
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"outputProfile invalido: {profile!r}")
+    return profile
+
+
+def parse_smoothing_mode(config: dict[str, Any]) -> str:
+    mode = str(config.get("smoothingMode", "causal"))
+    if mode not in SMOOTHING_MODES:
+        raise ValueError(f"smoothingMode invalido: {mode!r}")
+    return mode
+
+
+def lift_cuboid(payload: dict[str, Any], seed: tuple[float, float] | None = None) -> dict[str, Any]:
+    """
+    Lift one detection. seed = (yawDeg, centerOffsetFromAnchorM) of a
+    previous result warm-starts the fit (see fit_pose); ignored when fitting
+    is off. config.outputProfile selects how much of the result is
+    returned (see OUTPUT_PROFILES). config.collectTiming adds result.timing:
+    per-stage milliseconds, candidate evaluations and projected points (see
+    LiftTiming).
+    """
+    config = payload.get("config")
+    profile = parse_output_profile(config if isinstance(config, dict) else {})
+    return lift_cuboid_result(payload, seed).to_dict(profile)
+
+
+class LiftContext:
+    """Camera, object and config of a lift, parsed once; the frames of a sequence share one."""
+
+    __slots__ = ("camera", "config", "size", "floor_y", "elevation_m", "yaw_hint", "settings", "digest")
+
+    def __init__(self, camera: dict[str, Any] | CameraModel, obj: dict[str, Any], config: dict[str, Any]):
+        self.camera = camera_model(camera)
+        self.config = config
+        self.size = parse_object_size(obj)
+        self.floor_y = get_number(config, ["floorY", "floor_y"], 0.0) or 0.0
+        self.elevation_m = get_number(obj, ["elevationM", "elevation"], 0.0) or 0.0
+        self.yaw_hint = get_number(obj, ["yawDeg", "rotationDeg", "yaw"], None)
+        self.settings = FitSettings(config, self.size)
+        self.digest: str | None = None
+
+
+class LiftRequest:
+    """
+    One detection to lift in a LiftContext. config, when set, replaces the
+    context's config for the yaw symmetry reference (previousYawDeg); the
+    fit settings always come from the context.
+    """
+
+    __slots__ = ("context", "bbox", "anchor_uv", "config")
+
+    def __init__(
+        self,
+        context: LiftContext,
+        bbox: dict[str, float],
+        anchor_uv: tuple[float, float],
+        config: dict[str, Any] | None = None,
+    ):
+        self.context = context
+        self.bbox = bbox
+        self.anchor_uv = anchor_uv
+        self.config = config
+
+
+def lift_context_digest(context: LiftContext) -> str:
+    """sha256 of everything in a LiftContext that can change a lift, computed once per context."""
+    if context.digest is None:
+        config = {key: value for key, value in context.config.items() if key not in SEQUENCE_CONFIG_KEYS}
+        text = json.dumps(
+            [
+                LIFT_CACHE_VERSION,
+                context.camera.key,
+                context.size,
+                context.floor_y,
+                context.elevation_m,
+                context.yaw_hint,
+                config,
+            ],
+            sort_keys=True,
+            default=repr,
+        )
+        context.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return context.digest
 
-    alpha_center = clamp01(get_number(config, ["smoothCenterAlpha", "smoothingAlpha"], 1.0) or 1.0)
-    alpha_yaw = clamp01(get_number(config, ["smoothYawAlpha"], alpha_center) or alpha_center)
 
-    output_frames: list[dict[str, Any]] = []
-    previous_smoothed: dict[str, float] | None = None
-    fit_errors: list[float] = []
+def lift_cache_key(request: LiftRequest, seed: tuple[float, float] | None = None) -> str | None:
+    """
+    Content address of a lift: its context digest plus the detection,
+    warm-start seed and previous yaw. None for lifts under a latency
+    budget, whose results depend on timing, and for timed lifts
+    (collectTiming), whose timing would be stale; neither is cached.
+    """
+    context = request.context
+    if context.settings.latency_budget_ms is not None or context.settings.collect_timing:
+        return None
+    bbox = request.bbox
+    previous_yaw = request.config.get("previousYawDeg") if request.config is not None else None
+    text = repr(
+        (
+            lift_context_digest(context),
+            bbox["x"],
+            bbox["y"],
+            bbox["width"],
+            bbox["height"],
+            request.anchor_uv,
+            seed,
+            previous_yaw,
+        )
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_lift_request(payload: dict[str, Any]) -> LiftRequest:
+    camera, detection, obj, config = parse_input_payload(payload)
+    context = LiftContext(camera, obj, config)
+    return LiftRequest(context, parse_bbox(detection), parse_anchor_uv(detection))
+
+
+def lift_cuboid_result(payload: dict[str, Any], seed: tuple[float, float] | None = None) -> LiftResult:
+    """lift_cuboid without building the JSON payload; call to_dict() when it is needed."""
+    started = time.perf_counter()
+    request = parse_lift_request(payload)
+    timing = None
+    if request.context.settings.collect_timing:
+        timing = LiftTiming(started)
+        timing.lap("parse")
+    return lift_request(request, seed, timing)
+
+
+def lift_request(
+    request: LiftRequest,
+    seed: tuple[float, float] | None = None,
+    timing: LiftTiming | None = None,
+) -> LiftResult:
+    """
+    Lift one parsed detection; seed as in fit_pose. With config
+    collectTiming the result carries a LiftTiming, timed from here unless
+    timing (already holding the parse lap) is passed in.
+    """
+    context = request.context
+    camera = context.camera
+    bbox = request.bbox
+    anchor_uv = request.anchor_uv
+    size = context.size
+    floor_y = context.floor_y
+    elevation_m = context.elevation_m
+    yaw_hint = context.yaw_hint
+    settings = context.settings
+    config = request.config if request.config is not None else context.config
+    if timing is None and settings.collect_timing:
+        timing = LiftTiming()
+
+    origin, direction = ray_from_uv(camera, anchor_uv[0], anchor_uv[1])
+    anchor_world = intersect_ray_with_floor(origin, direction, floor_y + elevation_m)
+    if anchor_world is None:
+        raise ValueError("no se pudo intersectar rayo con plano de piso")
+    if timing is not None:
+        timing.lap("ray")
+
+    center_world_x = anchor_world[0]
+    center_world_z = anchor_world[2]
+    center_offset_m = 0.0
+    stats: FitStats | None = None
+    warm_started = False
+
+    if settings.fit_yaw:
+        pose = fit_pose(camera, bbox, anchor_world, size, floor_y, elevation_m, yaw_hint, settings, config, seed, timing)
+        yaw_deg = pose.yaw_deg
+        fit_error = pose.error
+        projected_bbox = pose.projected_bbox
+        center_offset_m = pose.center_offset_m
+        center_world_x = pose.center_x
+        center_world_z = pose.center_z
+        stats = pose.stats
+        warm_started = pose.warm_started
+    else:
+        yaw_deg = yaw_hint if yaw_hint is not None else 0.0
+        corners = oriented_box_corners(
+            center_x=center_world_x,
+            center_z=center_world_z,
+            width_m=size["width"],
+            depth_m=size["depth"],
+            height_m=size["height"],
+            yaw_deg=yaw_deg,
+            base_y_m=floor_y + elevation_m,
+        )
+        projected_bbox = bbox_from_projected_corners(corners, camera)
+        fit_error = bbox_fit_error(bbox, projected_bbox) if projected_bbox is not None else None
+
+    if timing is not None:
+        timing.lap("fineGrid" if settings.fit_yaw else "coarseGrid")
+        timing.evaluations = stats.evaluations if stats is not None else 0
+        timing.projections += CORNER_PROJECTIONS * (timing.evaluations if stats is not None else 1)
+    return LiftResult(
+        anchor_uv,
+        bbox,
+        size,
+        anchor_world,
+        center_world_x,
+        center_world_z,
+        floor_y + elevation_m,
+        center_offset_m,
+        yaw_deg,
+        projected_bbox,
+        fit_error,
+        settings,
+        stats,
+        warm_started,
+        timing,
+    )
+
+
+class WarmStartState:
+    """
+    Last accepted fit of a track; seeds the next frame when fitWarmStart is
+    on. sweep_error is the fit error of the last full sweep, the baseline
+    warm fits are checked against until the next one.
+    """
+
+    __slots__ = ("yaw_deg", "center_offset_m", "sweep_error", "frames_since_sweep")
+
+    def __init__(self, yaw_deg: float, center_offset_m: float, sweep_error: float, frames_since_sweep: int):
+        self.yaw_deg = yaw_deg
+        self.center_offset_m = center_offset_m
+        self.sweep_error = sweep_error
+        self.frames_since_sweep = frames_since_sweep
+
+
+class SequenceSettings:
+    """Sequence-level config of lift_cuboid_sequence, parsed once."""
+
+    __slots__ = (
+        "alpha_center",
+        "alpha_yaw",
+        "smoothing_mode",
+        "track_previous_yaw",
+        "warm_start",
+        "warm_error_jump",
+        "warm_refresh_frames",
+        "multi_track",
+        "idle_evict_frames",
+        "workers",
+        "worker_chunk_size",
+        "output_profile",
+    )
+
+    def __init__(self, config: dict[str, Any]):
+        self.alpha_center = clamp01(get_number(config, ["smoothCenterAlpha", "smoothingAlpha"], 1.0) or 1.0)
+        self.alpha_yaw = clamp01(get_number(config, ["smoothYawAlpha"], self.alpha_center) or self.alpha_center)
+        self.smoothing_mode = parse_smoothing_mode(config)
+        self.track_previous_yaw = config.get("yawSymmetryReference") == "previous"
+        self.warm_start = bool(config.get("fitWarmStart", False))
+        warm_error_jump = get_number(config, ["warmStartErrorJump"], 0.05)
+        self.warm_error_jump = warm_error_jump if warm_error_jump is not None else 0.05
+        self.warm_refresh_frames = max(1, int(get_number(config, ["warmStartRefreshFrames"], 30.0) or 30.0))
+        self.multi_track = bool(config.get("multiTrack", False))
+        idle = get_number(config, ["trackIdleEvictFrames"], None)
+        self.idle_evict_frames = max(1, int(idle)) if idle is not None else None
+        workers = int(get_number(config, ["workers"], 1.0) or 0)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        chunk_size = get_number(config, ["workerChunkSize"], None)
+        self.worker_chunk_size = max(1, int(chunk_size)) if chunk_size is not None else None
+        self.output_profile = parse_output_profile(config)
+
+
+class TrackState:
+    """Per-track sequence state: smoothed pose, last raw yaw and warm-start seed."""
+
+    __slots__ = ("smoothed", "raw_yaw", "warm", "last_index")
+
+    def __init__(self, last_index: int):
+        self.smoothed: dict[str, float] | None = None
+        self.raw_yaw: float | None = None
+        self.warm: WarmStartState | None = None
+        self.last_index = last_index
+
+
+class TrackStore:
+    """
+    Live TrackState per track key, least recently seen first, so tracks idle
+    for more than idle_evict_frames input frames are dropped from the front
+    in amortized O(1) per frame. A track that comes back after eviction
+    starts fresh.
+    """
+
+    __slots__ = ("tracks", "idle_evict_frames", "started", "evicted")
+
+    def __init__(self, idle_evict_frames: int | None):
+        self.tracks: OrderedDict[Any, TrackState] = OrderedDict()
+        self.idle_evict_frames = idle_evict_frames
+        self.started = 0
+        self.evicted = 0
+
+    def touch(self, key: Any, index: int) -> TrackState:
+        if self.idle_evict_frames is not None:
+            while self.tracks:
+                oldest_key, oldest = next(iter(self.tracks.items()))
+                if index - oldest.last_index <= self.idle_evict_frames:
+                    break
+                del self.tracks[oldest_key]
+                self.evicted += 1
+        state = self.tracks.get(key)
+        if state is None:
+            state = TrackState(index)
+            self.tracks[key] = state
+            self.started += 1
+        else:
+            self.tracks.move_to_end(key)
+            state.last_index = index
+        return state
+
+
+def frame_track_key(detection: dict[str, Any]) -> Any:
+    """Track key of a multi-track frame: trackId, else objectId; frames with neither share one track."""
+    key = detection.get("trackId")
+    if key is None:
+        key = detection.get("objectId")
+    return key
+
+
+class PendingFrame:
+    """A frame between SequenceLifter.prepare_frame and finish_frame."""
+
+    __slots__ = ("index", "timestamp", "track_id", "object_id", "track", "request", "seed")
+
+    def __init__(
+        self,
+        index: int,
+        timestamp: str | float,
+        track_id: Any,
+        object_id: Any,
+        track: TrackState,
+        request: LiftRequest,
+        seed: tuple[float, float] | None,
+    ):
+        self.index = index
+        self.timestamp = timestamp
+        self.track_id = track_id
+        self.object_id = object_id
+        self.track = track
+        self.request = request
+        self.seed = seed
+
+
+class FrameResult:
+    """One output frame of a sequence: the raw LiftResult and the smoothed pose; to_dict() builds the JSON frame."""
+
+    __slots__ = ("index", "timestamp", "track_id", "object_id", "raw", "smoothed_x", "smoothed_z", "smoothed_yaw_deg")
+
+    def __init__(
+        self,
+        index: int,
+        timestamp: str | float,
+        track_id: Any,
+        object_id: Any,
+        raw: LiftResult,
+        smoothed_x: float,
+        smoothed_z: float,
+        smoothed_yaw_deg: float,
+    ):
+        self.index = index
+        self.timestamp = timestamp
+        self.track_id = track_id
+        self.object_id = object_id
+        self.raw = raw
+        self.smoothed_x = smoothed_x
+        self.smoothed_z = smoothed_z
+        self.smoothed_yaw_deg = smoothed_yaw_deg
+
+    def to_dict(self, profile: str = "full") -> dict[str, Any]:
+        raw = self.raw
+        if profile == "minimal":
+            return {
+                "index": self.index,
+                "timestamp": self.timestamp,
+                "trackId": self.track_id,
+                "objectId": self.object_id,
+                "raw": raw.result_dict(profile),
+                "smoothedPose": {
+                    "baseCenterWorld": [self.smoothed_x, float(raw.base_y), self.smoothed_z],
+                    "yawDeg": self.smoothed_yaw_deg,
+                },
+            }
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "trackId": self.track_id,
+            "objectId": self.object_id,
+            "raw": raw.result_dict(profile),
+            "smoothedPose": {
+                "baseCenterWorld": [self.smoothed_x, float(raw.base_y), self.smoothed_z],
+                "centerWorld": [self.smoothed_x, float(raw.center_y), self.smoothed_z],
+                "planPositionM": [self.smoothed_x, self.smoothed_z],
+                "yawDeg": self.smoothed_yaw_deg,
+            },
+        }
+
+
+class SequenceResult:
+    """lift_cuboid_sequence output with FrameResults; to_dict() builds the JSON payload."""
+
+    __slots__ = ("settings_blocks", "summary", "frames", "profile")
+
+    def __init__(
+        self,
+        settings_blocks: dict[str, Any],
+        summary: dict[str, Any],
+        frames: list[FrameResult],
+        profile: str = "full",
+    ):
+        self.settings_blocks = settings_blocks
+        self.summary = summary
+        self.frames = frames
+        self.profile = profile
+
+    def to_dict(self) -> dict[str, Any]:
+        """The lift_cuboid_sequence payload in this result's output profile."""
+        profile = self.profile
+        frames = [frame.to_dict(profile) for frame in self.frames]
+        summary = self.summary
+        if "timing" in summary:
+            # Frame output is built only now; add it to the summary totals.
+            timing = summary["timing"]
+            output_ms = 1000.0 * sum(
+                frame.raw.timing.seconds["output"] for frame in self.frames if frame.raw.timing is not None
+            )
+            summary = {
+                **summary,
+                "timing": {
+                    **timing,
+                    "stagesMs": {**timing["stagesMs"], "output": output_ms},
+                    "totalMs": timing["totalMs"] - timing["stagesMs"]["output"] + output_ms,
+                },
+            }
+        if profile != "full":
+            return {"status": "ok", "mode": "batch", "profile": profile, "summary": summary, "frames": frames}
+        return {
+            "status": "ok",
+            "mode": "batch",
+            "assumptions": list(ASSUMPTIONS),
+            **self.settings_blocks,
+            "summary": summary,
+            "frames": frames,
+        }
+
+
+class SequenceLifter:
+    """
+    Incremental core of lift_cuboid_sequence and lift_cuboid_stream.
 
-    for index, raw_frame in enumerate(frames):
+    Frames are fed one at a time through lift_frame. Per-track state lives
+    in a TrackStore and the summary is kept as running totals, so memory
+    does not grow with the number of frames.
+    """
+
+    __slots__ = (
+        "camera",
+        "object",
+        "config",
+        "context",
+        "settings",
+        "tracks",
+        "cache",
+        "cache_hits",
+        "cache_misses",
+        "frame_count",
+        "warm_frames",
+        "full_sweep_frames",
+        "warm_fallbacks",
+        "fit_error_sum",
+        "fit_error_count",
+        "fit_error_max",
+        "timing",
+    )
+
+    def __init__(
+        self,
+        camera: dict[str, Any] | CameraModel,
+        obj: dict[str, Any],
+        config: dict[str, Any],
+        cache: LiftCache | None = None,
+    ):
+        if not isinstance(camera, (dict, CameraModel)):
+            raise ValueError("payload.camera es requerido para modo batch")
+        if not isinstance(obj, dict):
+            raise ValueError("payload.object es requerido para modo batch")
+        if not isinstance(config, dict):
+            config = {}
+        self.camera = camera_model(camera)
+        self.object = obj
+        self.config = config
+        self.context: LiftContext | None = None
+        self.settings = SequenceSettings(config)
+        self.tracks = TrackStore(self.settings.idle_evict_frames)
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.frame_count = 0
+        self.warm_frames = 0
+        self.full_sweep_frames = 0
+        self.warm_fallbacks = 0
+        self.fit_error_sum = 0.0
+        self.fit_error_count = 0
+        self.fit_error_max: float | None = None
+        # Totals of the timed lifts (config collectTiming), if any.
+        self.timing: LiftTiming | None = None
+
+    def update_context(
+        self,
+        camera: dict[str, Any] | None = None,
+        obj: dict[str, Any] | None = None,
+        config: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Apply a mid-sequence context change, merged over the current camera,
+        object and config. Track state is kept.
+        """
+        if isinstance(camera, dict):
+            merged_camera = dict(self.camera.source)
+            merged_camera.update(camera)
+            self.camera = CameraModel(merged_camera)
+        if isinstance(obj, dict):
+            self.object = merge_object(self.object, obj)
+        if isinstance(config, dict):
+            self.config = {**self.config, **config}
+            self.settings = SequenceSettings(self.config)
+            self.tracks.idle_evict_frames = self.settings.idle_evict_frames
+        self.context = None
+
+    def lift_context(self) -> LiftContext:
+        """LiftContext of the current camera, object and config, parsed on first use."""
+        if self.context is None:
+            self.context = LiftContext(self.camera, self.object, self.config)
+        return self.context
+
+    def lift_frame(self, index: int, raw_frame: Any) -> FrameResult | None:
+        """Lift one frame record; returns its output frame, or None when it has no detection."""
+        frame = self.prepare_frame(index, raw_frame)
+        if frame is None:
+            return None
+        return self.finish_frame(frame, self.lift(frame.request, frame.seed))
+
+    def cached_lift(self, request: LiftRequest, seed: tuple[float, float] | None = None) -> tuple[str | None, LiftResult | None]:
+        """(cache key, cached LiftResult or None); the key is None when there is no cache or the lift is not cacheable."""
+        if self.cache is None:
+            return None, None
+        key = lift_cache_key(request, seed)
+        if key is None:
+            return None, None
+        record = self.cache.get(key)
+        if record is None:
+            self.cache_misses += 1
+            return key, None
+        self.cache_hits += 1
+        return key, lift_result_from_record(record, request.context.settings)
+
+    def lift(self, request: LiftRequest, seed: tuple[float, float] | None = None) -> LiftResult:
+        """lift_request through the lifter's cache, if any."""
+        key, raw = self.cached_lift(request, seed)
+        if raw is None:
+            raw = lift_request(request, seed)
+            if key is not None:
+                self.cache.put(key, lift_result_record(raw))
+        return raw
+
+    @property
+    def frames_independent(self) -> bool:
+        """True when a frame's raw lift does not depend on earlier frames (no warm start or previous-yaw reference)."""
+        return not (self.settings.warm_start or self.settings.track_previous_yaw)
+
+    @property
+    def pool_workers(self) -> int:
+        """Processes lift_prepared_frames will use: settings.workers when frames are independent, else 1."""
+        return self.settings.workers if self.frames_independent else 1
+
+    def prepare_frame(self, index: int, raw_frame: Any) -> PendingFrame | None:
+        """
+        First half of lift_frame: resolve the frame's track, payload and seed.
+        Tracks are touched here, so frames must be prepared in input order.
+        """
         if not isinstance(raw_frame, dict):
-            continue
+            return None
         detection = frame_detection(raw_frame)
         if not isinstance(detection, dict):
-            continue
+            return None
+        settings = self.settings
+        track = self.tracks.touch(frame_track_key(detection) if settings.multi_track else None, index)
 
-        frame_camera = camera
+        has_overrides = False
+        frame_camera = self.camera
         if isinstance(raw_frame.get("camera"), dict):
-            frame_camera = dict(camera)
-            frame_camera.update(raw_frame["camera"])
+            merged_camera = dict(self.camera.source)
+            merged_camera.update(raw_frame["camera"])
+            frame_camera = CameraModel(merged_camera)
+            has_overrides = True
 
-        frame_object = obj
+        frame_object = self.object
         if isinstance(raw_frame.get("object"), dict):
-            frame_object = merge_object(obj, raw_frame["object"])
+            frame_object = merge_object(self.object, raw_frame["object"])
+            has_overrides = True
 
-        frame_config = dict(config)
+        frame_config = self.config
         if isinstance(raw_frame.get("config"), dict):
-            frame_config.update(raw_frame["config"])
-
-        raw_payload = lift_cuboid(
-            {
-                "camera": frame_camera,
-                "detection": detection,
-                "object": frame_object,
-                "config": frame_config,
-            }
+            frame_config = {**self.config, **raw_frame["config"]}
+            has_overrides = True
+
+        context = LiftContext(frame_camera, frame_object, frame_config) if has_overrides else self.lift_context()
+        return self.pending_frame(
+            index,
+            frame_timestamp(raw_frame, index),
+            detection.get("trackId"),
+            detection.get("objectId"),
+            track,
+            LiftRequest(context, parse_bbox(detection), parse_anchor_uv(detection)),
+        )
+
+    def prepare_row(
+        self,
+        index: int,
+        timestamp: str | float,
+        track_id: Any,
+        bbox: dict[str, float],
+        anchor_uv: tuple[float, float],
+    ) -> PendingFrame:
+        """
+        prepare_frame for a detection given as values rather than a frame
+        dict (columnar recordings): no per-frame overrides, the lifter's
+        camera, object and config apply.
+        """
+        track = self.tracks.touch(track_id if self.settings.multi_track else None, index)
+        return self.pending_frame(
+            index, timestamp, track_id, None, track, LiftRequest(self.lift_context(), bbox, anchor_uv)
         )
-        raw_result = raw_payload["result"]
-        raw_base = raw_result["baseCenterWorld"]
-        raw_center = raw_result["centerWorld"]
-        raw_yaw = float(raw_result["yawDeg"])
+
+    def pending_frame(
+        self,
+        index: int,
+        timestamp: str | float,
+        track_id: Any,
+        object_id: Any,
+        track: TrackState,
+        request: LiftRequest,
+    ) -> PendingFrame:
+        """Attach the track's previous yaw and warm-start seed to a request."""
+        settings = self.settings
+        if settings.track_previous_yaw and track.raw_yaw is not None:
+            config = request.context.config
+            if "previousYawDeg" not in config:
+                request.config = {**config, "previousYawDeg": track.raw_yaw}
+        warm_state = track.warm
+        seed = None
+        if settings.warm_start and warm_state is not None and warm_state.frames_since_sweep < settings.warm_refresh_frames:
+            seed = (warm_state.yaw_deg, warm_state.center_offset_m)
+        return PendingFrame(index, timestamp, track_id, object_id, track, request, seed)
+
+    def finish_frame(self, frame: PendingFrame, raw: LiftResult) -> FrameResult:
+        """
+        Second half of lift_frame: warm-start bookkeeping, smoothing and
+        summary totals for the raw lift of a prepared frame. Frames must be
+        finished in input order.
+        """
+        settings = self.settings
+        track, seed = frame.track, frame.seed
+        warm_state = track.warm
+        if settings.warm_start and raw.fit_enabled:
+            if seed is not None:
+                error = raw.fit_error
+                if error is not None and math.isfinite(error) and error <= warm_state.sweep_error + settings.warm_error_jump:
+                    self.warm_frames += 1
+                    warm_state.frames_since_sweep += 1
+                else:
+                    # Pose jumped (or the window lost it): redo this frame with the full search.
+                    self.warm_fallbacks += 1
+                    seeded = raw
+                    raw = self.lift(frame.request)
+                    if raw.stats is not None and seeded.stats is not None:
+                        raw.stats.evaluations += seeded.stats.evaluations
+                    if raw.timing is not None and seeded.timing is not None:
+                        raw.timing.add(seeded.timing)
+                    seed = None
+            if seed is None:
+                self.full_sweep_frames += 1
+                error = raw.fit_error
+                track.warm = WarmStartState(
+                    float(raw.yaw_deg),
+                    float(raw.center_offset_m),
+                    error if error is not None else float("inf"),
+                    0,
+                )
+            else:
+                warm_state.yaw_deg = float(raw.yaw_deg)
+                warm_state.center_offset_m = float(raw.center_offset_m)
+        raw_yaw = float(raw.yaw_deg)
+        track.raw_yaw = raw_yaw
 
         smoothed = smooth_pose_step(
-            previous_smoothed,
-            current_center_x=float(raw_base[0]),
-            current_center_z=float(raw_base[2]),
+            track.smoothed,
+            current_center_x=float(raw.center_x),
+            current_center_z=float(raw.center_z),
             current_yaw_deg=raw_yaw,
-            alpha_center=alpha_center,
-            alpha_yaw=alpha_yaw,
+            alpha_center=settings.alpha_center,
+            alpha_yaw=settings.alpha_yaw,
         )
-        previous_smoothed = smoothed
+        track.smoothed = smoothed
 
-        fit_error_raw = raw_result["fit"].get("errorL1")
+        fit_error_raw = raw.fit_error
         if isinstance(fit_error_raw, (int, float)) and math.isfinite(fit_error_raw):
-            fit_errors.append(float(fit_error_raw))
-
-        output_frames.append(
-            {
-                "index": index,
-                "timestamp": frame_timestamp(raw_frame, index),
-                "trackId": detection.get("trackId"),
-                "objectId": detection.get("objectId"),
-                "raw": raw_result,
-                "smoothedPose": {
-                    "baseCenterWorld": [smoothed["centerX"], float(raw_base[1]), smoothed["centerZ"]],
-                    "centerWorld": [smoothed["centerX"], float(raw_center[1]), smoothed["centerZ"]],
-                    "planPositionM": [smoothed["centerX"], smoothed["centerZ"]],
-                    "yawDeg": smoothed["yawDeg"],
-                },
-            }
+            fit_error = float(fit_error_raw)
+            self.fit_error_sum += fit_error
+            self.fit_error_count += 1
+            if self.fit_error_max is None or fit_error > self.fit_error_max:
+                self.fit_error_max = fit_error
+        self.frame_count += 1
+        if raw.timing is not None:
+            if self.timing is None:
+                self.timing = LiftTiming()
+            self.timing.add(raw.timing)
+
+        return FrameResult(
+            frame.index,
+            frame.timestamp,
+            frame.track_id,
+            frame.object_id,
+            raw,
+            smoothed["centerX"],
+            smoothed["centerZ"],
+            smoothed["yawDeg"],
         )
 
+    def sequence_result(self, frames: list[FrameResult]) -> SequenceResult:
+        """
+        Close a batch lifted through this lifter: zero-lag smoothing
+        replaces the per-frame smoothed poses, then summary and settings
+        are attached.
+        """
+        settings = self.settings
+        if settings.smoothing_mode != "causal":
+            load_smoothing().smooth_frames(frames, settings)
+        return SequenceResult(
+            self.settings_blocks(),
+            {**self.summary(), "workers": self.pool_workers},
+            frames,
+            settings.output_profile,
+        )
+
+    def settings_blocks(self) -> dict[str, Any]:
+        settings = self.settings
+        return {
+            "smoothing": {
+                "smoothCenterAlpha": settings.alpha_center,
+                "smoothYawAlpha": settings.alpha_yaw,
+                "mode": settings.smoothing_mode,
+                "enabled": settings.alpha_center < 0.999 or settings.alpha_yaw < 0.999,
+            },
+            "warmStart": {
+                "enabled": settings.warm_start,
+                "errorJumpL1": settings.warm_error_jump if settings.warm_start else None,
+                "refreshFrames": settings.warm_refresh_frames if settings.warm_start else None,
+            },
+            "multiTrack": {
+                "enabled": settings.multi_track,
+                "idleEvictFrames": settings.idle_evict_frames,
+            },
+        }
+
+    def summary(self) -> dict[str, Any]:
+        summary = {
+            "frameCount": self.frame_count,
+            "fitErrorMeanL1": self.fit_error_sum / self.fit_error_count if self.fit_error_count else None,
+            "fitErrorMaxL1": self.fit_error_max,
+            "warmStartedFrames": self.warm_frames,
+            "fullSweepFrames": self.full_sweep_frames,
+            "warmStartFallbacks": self.warm_fallbacks,
+            "trackCount": self.tracks.started,
+            "evictedTrackCount": self.tracks.evicted,
+        }
+        if self.cache is not None:
+            summary["liftCache"] = {"hits": self.cache_hits, "misses": self.cache_misses}
+        if self.timing is not None:
+            summary["timing"] = self.timing.to_dict()
+        return summary
+
+
+def lift_cuboid_sequence(payload: dict[str, Any], cache: LiftCache | None = None) -> dict[str, Any]:
+    """Lift and smooth a sequence of frames; see lift_cuboid_sequence_result."""
+    return lift_cuboid_sequence_result(payload, cache).to_dict()
+
+
+def lift_cuboid_sequence_result(payload: dict[str, Any], cache: LiftCache | None = None) -> SequenceResult:
+    """
+    Lift and smooth a sequence of frames, keeping compact FrameResults;
+    to_dict() gives the lift_cuboid_sequence payload.
+
+    By default every frame belongs to one object. With config multiTrack,
+    frames are grouped on the fly by trackId/objectId (frame_track_key) and
+    each track keeps its own smoothing and warm-start state; with
+    trackIdleEvictFrames that state is dropped once a track has been absent
+    for that many input frames. Output frames stay in input order.
+
+    With config workers > 1 (0 = all cores) the raw lifts run in a process
+    pool in chunks and smoothing runs afterwards in input order; output is
+    identical to the serial path. Warm start and the "previous" yaw
+    symmetry reference make each lift depend on the previous one, so those
+    sequences always run serially.
+
+    With config smoothingMode "zero-lag" the smoothed poses are recomputed
+    over each whole track once every frame is lifted (requires numpy).
+
+    With a LiftCache, raw lifts already in the cache are reused and new
+    ones are stored, so rerunning a sequence with only smoothing or output
+    config changed does no fitting at all.
+
+    With config collectTiming every raw frame carries its timing block and
+    summary.timing totals them over the sequence.
+    """
+    config = payload.get("config", {})
+    frames = payload.get("frames")
+    lifter = SequenceLifter(
+        payload.get("camera"), payload.get("object"), config if isinstance(config, dict) else {}, cache
+    )
+    if not isinstance(frames, list) or not frames:
+        raise ValueError("payload.frames debe ser una lista no vacia para modo batch")
+
+    prepared = (lifter.prepare_frame(index, raw_frame) for index, raw_frame in enumerate(frames))
+    output_frames = list(lift_prepared_frames(lifter, prepared))
     if not output_frames:
         raise ValueError("no se pudieron procesar frames validos en payload.frames")
+    return lifter.sequence_result(output_frames)
 
-    mean_fit_error = sum(fit_errors) / len(fit_errors) if fit_errors else None
-    max_fit_error = max(fit_errors) if fit_errors else None
 
-    return {
+def lift_prepared_frames(lifter: SequenceLifter, prepared: Iterable[PendingFrame | None]) -> Iterator[FrameResult]:
+    """
+    Lift and finish prepared frames in input order; None entries (frames
+    without a detection) are skipped. prepared is consumed lazily, one frame
+    ahead of the output, so each frame is prepared after the previous one
+    is finished. With lifter.pool_workers > 1 the raw lifts run in a process
+    pool instead, POOL_WINDOW_FRAMES frames at a time. Lifts found in the
+    lifter's cache are not recomputed.
+    """
+    workers = lifter.pool_workers
+    if workers == 1:
+        for frame in prepared:
+            if frame is not None:
+                yield lifter.finish_frame(frame, lifter.lift(frame.request, frame.seed))
+        return
+    frames = (frame for frame in prepared if frame is not None)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            window = list(islice(frames, POOL_WINDOW_FRAMES))
+            if not window:
+                return
+            cached = [lifter.cached_lift(frame.request) for frame in window]
+            missing = [frame.request for frame, (_, raw) in zip(window, cached) if raw is None]
+            chunk_size = lifter.settings.worker_chunk_size or max(1, len(missing) // (workers * 4))
+            computed = pool.map(lift_request, missing, chunksize=chunk_size)
+            for frame, (key, raw) in zip(window, cached):
+                if raw is None:
+                    raw = next(computed)
+                    if key is not None:
+                        lifter.cache.put(key, lift_result_record(raw))
+                yield lifter.finish_frame(frame, raw)
+
+
+def lift_cuboid_stream(records: Iterable[Any], cache: LiftCache | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Lift a stream of records lazily, one output record per lifted frame.
+
+    Each record is either a frame (bbox fields or "detection", optionally
+    with per-frame camera/object/config overrides, as in payload.frames), a
+    context record with any of camera/object/config and no detection, or a
+    payload record combining context with "frames" or a "detection". The
+    first context must bring camera and object. Smoothing and track state
+    carry across records.
+
+    A record that fails yields {"status": "error", "record": n, "error": ...}
+    and the stream goes on. A final {"status": "ok", "mode": "stream",
+    "summary": ...} record closes the stream.
+    """
+    lifter: SequenceLifter | None = None
+    index = 0
+    for record_index, record in enumerate(records):
+        try:
+            if isinstance(record, NdjsonError):
+                raise ValueError(f"JSON invalido en la linea {record.line}: {record.message}")
+            if not isinstance(record, dict):
+                raise ValueError("cada registro debe ser un objeto JSON")
+            frames: list[Any] = []
+            if isinstance(record.get("frames"), list):
+                frames = record["frames"]
+            elif frame_detection(record) is not None:
+                frames = [record]
+            context_only = not frames
+            has_context = any(isinstance(record.get(key), dict) for key in ("camera", "object", "config"))
+            if lifter is None:
+                if not has_context:
+                    raise ValueError("el primer registro debe traer camera y object")
+                lifter = SequenceLifter(record.get("camera"), record.get("object"), record.get("config", {}), cache)
+            elif context_only or "frames" in record:
+                lifter.update_context(record.get("camera"), record.get("object"), record.get("config"))
+            if lifter.settings.smoothing_mode != "causal":
+                raise ValueError("smoothingMode zero-lag requiere modo batch")
+            # A lone frame record keeps its camera/object/config as per-frame overrides.
+            for frame in frames:
+                output_frame = lifter.lift_frame(index, frame)
+                index += 1
+                if output_frame is not None:
+                    output = output_frame.to_dict(lifter.settings.output_profile)
+                    if output_frame.raw.timing is not None:
+                        lifter.timing.seconds["output"] += output_frame.raw.timing.seconds["output"]
+                    yield output
+        except ValueError as error:
+            yield {"status": "error", "record": record_index, "error": str(error)}
+
+    yield {
         "status": "ok",
-        "mode": "batch",
-        "assumptions": [
-            "single_camera",
-            "floor_plane_support",
-            "object_pitch_roll_fixed_zero",
-            "anchor_uv_bottom_center_default",
-        ],
-        "smoothing": {
-            "smoothCenterAlpha": alpha_center,
-            "smoothYawAlpha": alpha_yaw,
-            "enabled": alpha_center < 0.999 or alpha_yaw < 0.999,
-        },
-        "summary": {
-            "frameCount": len(output_frames),
-            "fitErrorMeanL1": mean_fit_error,
-            "fitErrorMaxL1": max_fit_error,
-        },
-        "frames": output_frames,
+        "mode": "stream",
+        "summary": lifter.summary() if lifter is not None else {"frameCount": 0},
     }
 
 
+class NdjsonError:
+    """Stand-in read_ndjson yields for a line that is not valid JSON."""
+
+    __slots__ = ("line", "message")
+
+    def __init__(self, line: int, message: str):
+        self.line = line
+        self.message = message
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Any]:
+    """
+    Parse newline-delimited JSON lazily. Blank lines are skipped; a bad line
+    yields an NdjsonError with its 1-based line number and the parse error.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield NdjsonError(line_number, f"{exc.msg} (columna {exc.colno})")
+
+
+def lift_payload(payload: dict[str, Any], mode: str = "auto", cache: LiftCache | None = None) -> dict[str, Any]:
+    """
+    Lift a CLI payload: "single", "batch", or "auto" (batch when
+    payload.frames is a list). cache applies to batch lifts.
+    """
+    if mode == "auto":
+        mode = "batch" if isinstance(payload.get("frames"), list) else "single"
+    if mode == "batch":
+        return lift_cuboid_sequence(payload, cache)
+    return lift_cuboid(payload)
+
+
+def lift_payload_result(
+    payload: dict[str, Any],
+    mode: str = "auto",
+    cache: LiftCache | None = None,
+) -> LiftResult | SequenceResult:
+    """lift_payload returning the result object instead of its JSON payload."""
+    if mode == "auto":
+        mode = "batch" if isinstance(payload.get("frames"), list) else "single"
+    if mode == "batch":
+        return lift_cuboid_sequence_result(payload, cache)
+    return lift_cuboid_result(payload)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Lift 2D camera detections to 3D cuboid pose (2.5D assumptions)")
     parser.add_argument(
         "--input-json",
-        required=True,
-        help="Path to payload JSON. single: camera+detection+object; batch: camera+object+frames",
+        default=None,
+        help=(
+            "Path to payload JSON ('-' for stdin). single: camera+detection+object; batch: camera+object+frames; "
+            "stream: NDJSON records, stdin when omitted. A directory or glob lifts every matching payload; "
+            "a .npy/.npz columnar recording is lifted as a batch sequence (requires numpy)"
+        ),
+    )
+    parser.add_argument(
+        "--sidecar-json",
+        default=None,
+        help="Columnar recordings: JSON with camera, object and config (default: <stem>.json next to the recording)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="File listing payload JSON paths, one per line (relative to the manifest); lifts all of them",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Many-payload runs: write <stem>.out.json per input here (default: NDJSON records on stdout)",
     )
     parser.add_argument(
         "--mode",
         default="auto",
-        choices=["auto", "single", "batch"],
-        help="auto: detect by payload.frames; single: one detection; batch: sequence",
+        choices=["auto", "single", "batch", "stream", "serve"],
+        help=(
+            "auto: detect by payload.frames; single: one detection; batch: sequence; stream: NDJSON in/out; "
+            "serve: long-lived JSON-RPC server"
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="serve mode: Unix socket path to listen on (default: JSON-RPC over stdin/stdout)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Pool of N processes (0 = all cores). Many-payload runs: one payload per task; "
+            "batch mode: raw lifts of the sequence, overriding config.workers"
+        ),
+    )
+    parser.add_argument(
+        "--output-profile",
+        default=None,
+        choices=list(OUTPUT_PROFILES),
+        help="Override config.outputProfile: full (default), pose or minimal",
+    )
+    parser.add_argument(
+        "--output-format",
+        default="json",
+        choices=["json", "binary"],
+        help="single/batch: binary writes packed float32 records (see lift_binary) to stdout",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Reuse raw sequence lifts stored here and store new ones (batch, stream, columnar, many-payload "
+            "and serve modes), so reruns that only change smoothing or output skip the fits"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "single/batch: lift with config.collectTiming under cProfile and print the per-stage breakdown "
+            "and the top functions to stderr"
+        ),
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        help="With --profile: write the cProfile stats here (pstats format, e.g. for snakeviz or flameprof)",
     )
     parser.add_argument("--pretty", action="store_true", help="Pretty-print output JSON")
     return parser.parse_args()
 
 
+def with_config(payload: dict[str, Any], **overrides: Any) -> dict[str, Any]:
+    """payload with overrides merged into its config."""
+    config = payload.get("config")
+    return {**payload, "config": {**(config if isinstance(config, dict) else {}), **overrides}}
+
+
+def profile_breakdown(timing: dict[str, Any], lifts: int) -> str:
+    """Text table of a timing block (LiftTiming.to_dict) totalled over lifts lifts."""
+    total_ms = timing["totalMs"]
+    lines = [f"{'stage':<12}{'totalMs':>12}{'meanMs':>10}{'share':>8}"]
+    for stage, stage_ms in [*timing["stagesMs"].items(), ("total", total_ms)]:
+        share = stage_ms / total_ms if total_ms > 0.0 else 0.0
+        lines.append(f"{stage:<12}{stage_ms:>12.3f}{stage_ms / max(1, lifts):>10.4f}{share:>8.1%}")
+    lines.append(f"lifts {lifts}  evaluations {timing['evaluations']}  projections {timing['projections']}")
+    return "\n".join(lines)
+
+
+def run_profiled(args: argparse.Namespace, run: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    """
+    Call run (a single or batch lift with collectTiming on) under cProfile,
+    print its stage breakdown to stderr and either write the profile to
+    --profile-output or print its top functions to stderr.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    output = profiler.runcall(run)
+    if "summary" in output:
+        timing, lifts = output["summary"]["timing"], output["summary"]["frameCount"]
+    else:
+        timing, lifts = output["result"]["timing"], 1
+    print(profile_breakdown(timing, lifts), file=sys.stderr)
+    if args.profile_output is not None:
+        profiler.dump_stats(args.profile_output)
+    else:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return output
+
+
+def run_stream(input_path: str | None, cache: LiftCache | None = None) -> None:
+    if input_path is None or input_path == "-":
+        source = sys.stdin
+    else:
+        source = open(input_path, encoding="utf-8")
+    try:
+        for record in lift_cuboid_stream(read_ndjson(source), cache):
+            print(json.dumps(record, ensure_ascii=True), flush=True)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def is_multi_input(input_path: str | None) -> bool:
+    """True when --input-json names a directory or a glob rather than one file."""
+    if input_path is None or input_path == "-":
+        return False
+    return os.path.isdir(input_path) or any(char in input_path for char in ("*", "?", "["))
+
+
+def run_files(args: argparse.Namespace) -> int:
+    if __package__:
+        from . import lift_files
+    else:
+        import lift_files
+    if args.mode in ("stream", "serve"):
+        raise ValueError(f"--mode {args.mode} no admite varios payloads")
+    paths = lift_files.resolve_payload_paths(args.input_json, args.manifest)
+    workers = args.workers if args.workers is not None else 0
+    summary = lift_files.run_payload_files(
+        paths,
+        mode=args.mode,
+        workers=workers,
+        output_dir=args.output_dir,
+        ndjson_out=None if args.output_dir is not None else sys.stdout,
+        pretty=args.pretty,
+        output_profile=args.output_profile,
+        cache_dir=args.cache_dir,
+    )
+    if args.output_dir is not None:
+        print(json.dumps(summary, ensure_ascii=True, indent=2 if args.pretty else None))
+    else:
+        print(json.dumps(summary, ensure_ascii=True), flush=True)
+    return 0 if not summary["failures"] else 1
+
+
+def run_columnar(args: argparse.Namespace, cache: LiftCache | None = None) -> int:
+    try:
+        if __package__:
+            from . import columnar
+        else:
+            import columnar
+    except ModuleNotFoundError as error:
+        if error.name != "numpy":
+            raise
+        raise RuntimeError('las grabaciones columnares requieren numpy (pip install "simula-geometry[numpy]")') from error
+    if args.mode not in ("auto", "batch"):
+        raise ValueError(f"--mode {args.mode} no admite grabaciones columnares")
+    recording = columnar.load_columnar(args.input_json, args.sidecar_json)
+    if args.workers is not None:
+        recording.config = {**recording.config, "workers": args.workers}
+    if args.output_profile is not None:
+        recording.config = {**recording.config, "outputProfile": args.output_profile}
+    if args.profile:
+        recording.config = {**recording.config, "collectTiming": True}
+        output = run_profiled(args, lambda: columnar.lift_columnar_result(recording, cache).to_dict())
+        print(json.dumps(output, ensure_ascii=True, indent=2 if args.pretty else None))
+        return 0
+    if args.output_format == "binary":
+        if __package__:
+            from .lift_binary import pack_lift_results
+        else:
+            from lift_binary import pack_lift_results
+        if parse_smoothing_mode(recording.config) == "causal":
+            # Frames are packed as they are lifted, never held as a list.
+            result: Any = columnar.iter_columnar_frames(recording, cache)
+        else:
+            result = columnar.lift_columnar_result(recording, cache)
+        sys.stdout.buffer.write(pack_lift_results(result))
+        sys.stdout.buffer.flush()
+        return 0
+    output = columnar.lift_columnar_result(recording, cache).to_dict()
+    print(json.dumps(output, ensure_ascii=True, indent=2 if args.pretty else None))
+    return 0
+
+
 def main() -> int:
     args = parse_args()
-    payload_path = Path(args.input_json)
-    payload = json.loads(payload_path.read_text(encoding="utf-8"))
+    binary = args.output_format == "binary"
+    if binary and (args.mode in ("stream", "serve") or args.manifest is not None or is_multi_input(args.input_json)):
+        raise ValueError("--output-format binary solo admite un payload en modo single/batch")
+    if args.profile and (
+        binary or args.mode in ("stream", "serve") or args.manifest is not None or is_multi_input(args.input_json)
+    ):
+        raise ValueError("--profile solo admite un payload en modo single/batch con salida JSON")
+    cache = LiftCache(args.cache_dir) if args.cache_dir is not None else None
+    if args.mode == "stream":
+        run_stream(args.input_json, cache)
+        return 0
+    if args.mode == "serve":
+        if __package__:
+            from . import lift_server
+        else:
+            import lift_server
+        service = lift_server.LiftService(lift_cache=cache)
+        if args.socket:
+            lift_server.serve_unix_socket(service, args.socket)
+        else:
+            lift_server.serve_stdio(service, sys.stdin, sys.stdout)
+        return 0
+    if args.manifest is not None or is_multi_input(args.input_json):
+        return run_files(args)
+    if args.input_json is not None and Path(args.input_json).suffix.lower() in COLUMNAR_SUFFIXES:
+        return run_columnar(args, cache)
+    if args.input_json is None:
+        raise ValueError("--input-json es requerido salvo en modo stream")
+    if args.input_json == "-":
+        payload = json.loads(sys.stdin.read())
+    else:
+        payload = json.loads(Path(args.input_json).read_text(encoding="utf-8"))
     if not isinstance(payload, dict):
         raise ValueError("input JSON debe ser un objeto")
 
-    mode = args.mode
-    if mode == "auto":
-        mode = "batch" if isinstance(payload.get("frames"), list) else "single"
-
-    if mode == "batch":
-        output = lift_cuboid_sequence(payload)
+    if args.workers is not None and args.mode != "single" and isinstance(payload.get("frames"), list):
+        payload = with_config(payload, workers=args.workers)
+    if args.output_profile is not None:
+        payload = with_config(payload, outputProfile=args.output_profile)
+    if args.profile:
+        payload = with_config(payload, collectTiming=True)
+    if binary:
+        if __package__:
+            from .lift_binary import pack_lift_results
+        else:
+            from lift_binary import pack_lift_results
+        sys.stdout.buffer.write(pack_lift_results(lift_payload_result(payload, args.mode, cache)))
+        sys.stdout.buffer.flush()
+        return 0
+    if args.profile:
+        output = run_profiled(args, lambda: lift_payload(payload, args.mode, cache))
     else:
-        output = lift_cuboid(payload)
+        output = lift_payload(payload, args.mode, cache)
     if args.pretty:
         print(json.dumps(output, ensure_ascii=True, indent=2))
     else:
@@ -821,4 +3077,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    # Sibling modules import "cuboid_lift"; point them at this module instead of a second copy.
+    sys.modules.setdefault("cuboid_lift", sys.modules[__name__])
     raise SystemExit(main())
@@ -0,0 +1,221 @@
+"""
+Accuracy-vs-latency sweep of the bbox fit search parameters.
+
+Lifts seeded synthetic detections (see synthetic.py) with the joint
+yaw/center-offset fit under every combination of yawSearchStepDeg,
+centerOffsetStepM and center offset range (a fraction of the object depth
+on either side of the anchor), and measures each setting against the
+ground truth:
+
+    yaw error     degrees to the true yaw, modulo the object's symmetry
+                  period (a 180-degree flip of a box projects identically)
+    center error  plan distance in meters from the true base center
+    msPerLift     wall time of lift_cuboid per detection
+
+The report lists every setting and the Pareto frontier: the settings no
+other setting beats on time, mean yaw error and mean center error at once.
+With --budget-ms, the most accurate frontier setting within the budget is
+given as "recommended".
+
+Usage:
+    python -m simula_geometry.fit_sweep --detections 40 --bbox-noise 0.002
+    python -m simula_geometry.fit_sweep --yaw-steps 1,2,4 --budget-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+if __package__:
+    from .bench import percentile
+    from .cuboid_lift import lift_cuboid, yaw_symmetry_period_deg
+    from .synthetic import SyntheticObject, synthetic_scenes
+else:  # script mode: fit_sweep.py run directly
+    from bench import percentile
+    from cuboid_lift import lift_cuboid, yaw_symmetry_period_deg
+    from synthetic import SyntheticObject, synthetic_scenes
+
+SWEEP_VERSION = 1
+DEFAULT_YAW_STEPS = (1.0, 2.0, 4.0, 8.0)
+DEFAULT_OFFSET_STEPS = (0.04, 0.08, 0.16)
+DEFAULT_RANGE_FRACTIONS = (0.5, 1.0)
+# Lower is better on every one of these.
+FRONTIER_KEYS = ("msPerLift", "yawErrorMeanDeg", "centerErrorMeanM")
+
+
+def yaw_error_deg(fitted_deg: float, true_deg: float, period_deg: float) -> float:
+    """Smallest rotation between the two yaws, counting symmetric poses as equal."""
+    difference = (fitted_deg - true_deg) % period_deg
+    return min(difference, period_deg - difference)
+
+
+def center_error_m(result: dict[str, Any], truth: SyntheticObject) -> float:
+    base = result["baseCenterWorld"]
+    return math.hypot(base[0] - truth.center_x, base[2] - truth.center_z)
+
+
+def sweep_samples(seed: int, detections: int, bbox_noise: float) -> list[tuple[dict[str, Any], SyntheticObject]]:
+    """detections (payload without config, ground truth) pairs from seeded scenes."""
+    samples: list[tuple[dict[str, Any], SyntheticObject]] = []
+    for scene in synthetic_scenes(seed, detections, bbox_noise=bbox_noise):
+        samples.extend(zip(scene.payloads(), scene.objects))
+        if len(samples) >= detections:
+            break
+    return samples[:detections]
+
+
+def evaluate_setting(
+    samples: Sequence[tuple[dict[str, Any], SyntheticObject]],
+    yaw_step_deg: float,
+    offset_step_m: float,
+    range_fraction: float,
+    base_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Lift every sample with one setting and summarize its errors and time."""
+    latencies: list[float] = []
+    yaw_errors: list[float] = []
+    center_errors: list[float] = []
+    evaluations: list[int] = []
+    for payload, truth in samples:
+        depth = truth.size[1]
+        config = {
+            **(base_config or {}),
+            "fitYawFromBBox": True,
+            "fitCenterOffsetFromBBox": True,
+            "yawSearchStepDeg": yaw_step_deg,
+            "centerOffsetStepM": offset_step_m,
+            "centerOffsetMinM": -range_fraction * depth,
+            "centerOffsetMaxM": range_fraction * depth,
+        }
+        started = time.perf_counter()
+        result = lift_cuboid({**payload, "config": config})["result"]
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        period = yaw_symmetry_period_deg(payload["object"]["sizeM"])
+        yaw_errors.append(yaw_error_deg(result["yawDeg"], truth.yaw_deg, period))
+        center_errors.append(center_error_m(result, truth))
+        evaluations.append(result["fit"]["evaluations"])
+    yaw_errors.sort()
+    center_errors.sort()
+    count = len(samples)
+    return {
+        "yawSearchStepDeg": yaw_step_deg,
+        "centerOffsetStepM": offset_step_m,
+        "offsetRangeFraction": range_fraction,
+        "msPerLift": sum(latencies) / count,
+        "p90Ms": percentile(sorted(latencies), 0.90),
+        "evaluationsMean": sum(evaluations) / count,
+        "yawErrorMeanDeg": sum(yaw_errors) / count,
+        "yawErrorP90Deg": percentile(yaw_errors, 0.90),
+        "centerErrorMeanM": sum(center_errors) / count,
+        "centerErrorP90M": percentile(center_errors, 0.90),
+    }
+
+
+def pareto_frontier(rows: Sequence[dict[str, Any]], keys: Sequence[str] = FRONTIER_KEYS) -> list[dict[str, Any]]:
+    """Rows no other row matches or beats on every key and beats on one, fastest first."""
+
+    def dominates(a: dict[str, Any], b: dict[str, Any]) -> bool:
+        return all(a[key] <= b[key] for key in keys) and any(a[key] < b[key] for key in keys)
+
+    frontier = [row for row in rows if not any(dominates(other, row) for other in rows)]
+    return sorted(frontier, key=lambda row: [row[key] for key in keys])
+
+
+def recommend_setting(frontier: Sequence[dict[str, Any]], budget_ms: float) -> dict[str, Any] | None:
+    """Frontier row within budget_ms with the lowest center error, then yaw error; None if none fits."""
+    affordable = [row for row in frontier if row["msPerLift"] <= budget_ms]
+    if not affordable:
+        return None
+    return min(affordable, key=lambda row: (row["centerErrorMeanM"], row["yawErrorMeanDeg"]))
+
+
+def run_sweep(
+    seed: int = 0,
+    detections: int = 40,
+    bbox_noise: float = 0.002,
+    yaw_steps: Sequence[float] = DEFAULT_YAW_STEPS,
+    offset_steps: Sequence[float] = DEFAULT_OFFSET_STEPS,
+    range_fractions: Sequence[float] = DEFAULT_RANGE_FRACTIONS,
+    base_config: dict[str, Any] | None = None,
+    budget_ms: float | None = None,
+) -> dict[str, Any]:
+    """Evaluate every setting on the same samples and return the report."""
+    if detections < 1:
+        raise ValueError("detections debe ser >= 1")
+    samples = sweep_samples(seed, detections, bbox_noise)
+    rows = [
+        evaluate_setting(samples, yaw_step, offset_step, fraction, base_config)
+        for yaw_step, offset_step, fraction in itertools.product(yaw_steps, offset_steps, range_fractions)
+    ]
+    frontier = pareto_frontier(rows)
+    report: dict[str, Any] = {
+        "version": SWEEP_VERSION,
+        "seed": seed,
+        "detections": len(samples),
+        "bboxNoise": bbox_noise,
+        "baseConfig": dict(base_config or {}),
+        "settings": rows,
+        "frontier": frontier,
+    }
+    if budget_ms is not None:
+        report["budgetMs"] = budget_ms
+        report["recommended"] = recommend_setting(frontier, budget_ms)
+    return report
+
+
+def parse_float_list(text: str) -> list[float]:
+    return [float(item) for item in text.split(",") if item.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep simula_geometry fit search parameters for accuracy vs latency")
+    parser.add_argument("--seed", type=int, default=0, help="Scene generator seed")
+    parser.add_argument("--detections", type=int, default=40, help="Synthetic detections lifted per setting")
+    parser.add_argument("--bbox-noise", type=float, default=0.002, help="Std dev of bbox edge noise, normalized image units")
+    parser.add_argument("--yaw-steps", type=parse_float_list, default=list(DEFAULT_YAW_STEPS), help="yawSearchStepDeg values")
+    parser.add_argument("--offset-steps", type=parse_float_list, default=list(DEFAULT_OFFSET_STEPS), help="centerOffsetStepM values")
+    parser.add_argument(
+        "--range-fractions",
+        type=parse_float_list,
+        default=list(DEFAULT_RANGE_FRACTIONS),
+        help="Center offset range on each side of the anchor, as a fraction of object depth",
+    )
+    parser.add_argument("--config-json", default=None, help="Extra lift config (JSON object) applied to every setting")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Recommend the most accurate frontier setting within this")
+    parser.add_argument("--output", default=None, help="Write the report JSON here (default: stdout)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    base_config = json.loads(args.config_json) if args.config_json else None
+    if base_config is not None and not isinstance(base_config, dict):
+        print("--config-json debe ser un objeto JSON", file=sys.stderr)
+        return 2
+    report = run_sweep(
+        args.seed,
+        args.detections,
+        args.bbox_noise,
+        args.yaw_steps,
+        args.offset_steps,
+        args.range_fractions,
+        base_config,
+        args.budget_ms,
+    )
+    text = json.dumps(report, ensure_ascii=True, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
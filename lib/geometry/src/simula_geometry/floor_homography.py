@@ -0,0 +1,132 @@
+"""
+Image <-> floor plane homography for one camera.
+
+For a fixed camera and plane height, casting a ray through (u, v) and
+intersecting it with the plane is a projective map: [X*w, Z*w, w] = H @ [u, v, 1].
+FloorHomography builds H (and its inverse) once so anchors can be mapped in
+bulk with a single matrix product instead of one ray per anchor.
+
+Requires numpy (pip install "simula-geometry[numpy]").
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+if __package__:
+    from .cuboid_lift import CameraModel, camera_model
+else:  # script mode: cuboid_lift.py run directly
+    from cuboid_lift import CameraModel, camera_model
+
+HOMOGRAPHY_CACHE_SIZE = 256
+
+
+class FloorHomography:
+    """
+    UV <-> floor XZ mapping for one (camera, plane_y).
+
+    Validity follows the ray path: uv_to_floor rejects rays parallel to the
+    plane (|dir.y| <= 1e-9 after normalization) or hitting it behind the
+    camera, and floor_to_uv rejects points with camera depth <= 1e-5, exactly
+    where intersect_ray_with_floor / project_world_point return None.
+    """
+
+    __slots__ = ("plane_y", "matrix", "inverse", "_stacked", "_origin", "_forward")
+
+    matrix: np.ndarray
+    inverse: np.ndarray | None
+
+    def __init__(self, camera_key: tuple[float, ...], plane_y: float):
+        # camera_key is CameraModel.key: origin, right, up, forward, tan_half_v, aspect.
+        origin = np.asarray(camera_key[0:3], dtype=np.float64)
+        right = np.asarray(camera_key[3:6], dtype=np.float64)
+        up = np.asarray(camera_key[6:9], dtype=np.float64)
+        forward = np.asarray(camera_key[9:12], dtype=np.float64)
+        t = camera_key[12]
+        a = camera_key[13]
+
+        # Unnormalized ray direction as a linear map of [u, v, 1]:
+        # x_cam = (2u - 1) * t * a, y_cam = (1 - 2v) * t, z_cam = 1.
+        direction = np.stack(
+            [right * (2.0 * t * a), up * (-2.0 * t), forward - right * (t * a) + up * t],
+            axis=1,
+        )
+        height = plane_y - origin[1]
+        matrix = np.stack(
+            [
+                origin[0] * direction[1] + height * direction[0],
+                origin[2] * direction[1] + height * direction[2],
+                direction[1],
+            ]
+        )
+        self.plane_y = plane_y
+        self.matrix = matrix
+        # A plane at camera height is seen edge-on: H is singular and has no inverse.
+        self.inverse = np.linalg.inv(matrix) if abs(height) > 1e-12 else None
+        # Rows: X*w, Z*w, w(=dir.y), dir.x, dir.z; one product yields point and validity inputs.
+        self._stacked = np.concatenate([matrix, direction[[0, 2]]], axis=0)
+        self._origin = origin
+        self._forward = forward
+
+    def uv_to_floor(self, uvs: Any) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Map (N, 2) image UVs (clamped to [0, 1] like ray_from_uv) to floor XZ.
+
+        Returns (xz, valid); invalid rows are NaN.
+        """
+        uv = np.clip(np.asarray(uvs, dtype=np.float64).reshape(-1, 2), 0.0, 1.0)
+        homogeneous = np.concatenate([uv, np.ones((uv.shape[0], 1))], axis=1)
+        mapped = homogeneous @ self._stacked.T
+        w = mapped[:, 2]
+        length = np.sqrt(mapped[:, 3] * mapped[:, 3] + w * w + mapped[:, 4] * mapped[:, 4])
+        height = self.plane_y - self._origin[1]
+        valid = (length > 1e-9) & (np.abs(w) > 1e-9 * length) & (height * w > 0.0)
+        safe_w = np.where(valid, w, 1.0)
+        xz = mapped[:, :2] / safe_w[:, None]
+        xz[~valid] = np.nan
+        return xz, valid
+
+    def floor_to_uv(self, xz: Any) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Map (N, 2) floor XZ points on this plane to image UVs (unclamped,
+        like project_world_point). Returns (uv, valid); invalid rows are NaN.
+        """
+        if self.inverse is None:
+            raise ValueError("plano a la altura de la camara; no hay homografia inversa")
+        points = np.asarray(xz, dtype=np.float64).reshape(-1, 2)
+        rel = np.stack(
+            [
+                points[:, 0] - self._origin[0],
+                np.full(points.shape[0], self.plane_y - self._origin[1]),
+                points[:, 1] - self._origin[2],
+            ],
+            axis=1,
+        )
+        valid = rel @ self._forward > 1e-5
+        homogeneous = np.concatenate([points, np.ones((points.shape[0], 1))], axis=1)
+        mapped = homogeneous @ self.inverse.T
+        safe_w = np.where(valid, mapped[:, 2], 1.0)
+        uv = mapped[:, :2] / safe_w[:, None]
+        uv[~valid] = np.nan
+        return uv, valid
+
+
+@lru_cache(maxsize=HOMOGRAPHY_CACHE_SIZE)
+def _cached_homography(camera_key: tuple[float, ...], plane_y: float) -> FloorHomography:
+    return FloorHomography(camera_key, plane_y)
+
+
+def floor_homography(camera: dict[str, Any] | CameraModel, plane_y: float) -> FloorHomography:
+    """Cached FloorHomography for (camera, plane_y); plane_y is floorY + elevation."""
+    return _cached_homography(camera_model(camera).key, float(plane_y))
+
+
+def uv_to_floor(camera: dict[str, Any] | CameraModel, uvs: Any, plane_y: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    return floor_homography(camera, plane_y).uv_to_floor(uvs)
+
+
+def floor_to_uv(camera: dict[str, Any] | CameraModel, xz: Any, plane_y: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    return floor_homography(camera, plane_y).floor_to_uv(xz)
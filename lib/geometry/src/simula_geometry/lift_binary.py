@@ -0,0 +1,119 @@
+"""
+Compact binary encoding of lift results.
+
+A file is a small header followed by fixed-size records of little-endian
+float32, one per lifted frame (a single lift is one record):
+
+    magic     4s   b"SGLB"
+    version   u16
+    fields    u16  number of float32 values per record
+    records   u32
+    names     u16 length + ASCII, comma-separated field names
+
+Missing values (no fit error, no fit) are NaN. float32 keeps world
+coordinates to well under a millimetre at warehouse scales; indices and
+evaluation counts are exact up to 2**24.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from .cuboid_lift import FrameResult, LiftResult, SequenceResult
+
+MAGIC = b"SGLB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIH")
+
+RECORD_FIELDS = (
+    "index",
+    "baseX",
+    "baseY",
+    "baseZ",
+    "yawDeg",
+    "centerOffsetM",
+    "fitErrorL1",
+    "evaluations",
+    "smoothedX",
+    "smoothedZ",
+    "smoothedYawDeg",
+)
+
+
+def _optional(value: float | int | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def record_values(frame: FrameResult | LiftResult, index: int = 0) -> tuple[float, ...]:
+    """RECORD_FIELDS of one frame; a bare LiftResult is its own smoothed pose."""
+    # Duck-typed: under "python -m" the CLI's result classes live in __main__.
+    if hasattr(frame, "raw"):
+        raw = frame.raw
+        index = frame.index
+        smoothed = (frame.smoothed_x, frame.smoothed_z, frame.smoothed_yaw_deg)
+    else:
+        raw = frame
+        smoothed = (raw.center_x, raw.center_z, raw.yaw_deg)
+    stats = raw.stats if raw.fit_enabled else None
+    return (
+        float(index),
+        raw.center_x,
+        raw.base_y,
+        raw.center_z,
+        raw.yaw_deg,
+        raw.center_offset_m,
+        _optional(raw.fit_error),
+        _optional(stats.evaluations if stats is not None else None),
+        smoothed[0],
+        smoothed[1],
+        smoothed[2],
+    )
+
+
+def pack_lift_results(result: LiftResult | SequenceResult | Iterable[FrameResult | LiftResult]) -> bytes:
+    """Encode a lift, a sequence or any iterable of frames/lifts as header + float32 records."""
+    if hasattr(result, "frames"):
+        frames: Iterable[FrameResult | LiftResult] = result.frames
+    elif hasattr(result, "fit_enabled"):
+        frames = [result]
+    else:
+        frames = result
+    values = array("f")
+    count = 0
+    for position, frame in enumerate(frames):
+        values.extend(record_values(frame, position))
+        count += 1
+    if sys.byteorder != "little":
+        values.byteswap()
+    names = ",".join(RECORD_FIELDS).encode("ascii")
+    header = HEADER.pack(MAGIC, VERSION, len(RECORD_FIELDS), count, len(names))
+    return header + names + values.tobytes()
+
+
+def unpack_lift_results(data: bytes) -> tuple[tuple[str, ...], list[tuple[float, ...]]]:
+    """Decode pack_lift_results output into (field names, records)."""
+    if len(data) < HEADER.size:
+        raise ValueError("datos binarios truncados")
+    magic, version, field_count, count, names_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("formato binario desconocido")
+    if version != VERSION:
+        raise ValueError(f"version binaria no soportada: {version}")
+    offset = HEADER.size + names_length
+    names = tuple(data[HEADER.size : offset].decode("ascii").split(","))
+    if len(names) != field_count:
+        raise ValueError("cabecera binaria inconsistente")
+    values = array("f")
+    payload = data[offset : offset + field_count * count * values.itemsize]
+    if len(payload) != field_count * count * values.itemsize:
+        raise ValueError("datos binarios truncados")
+    values.frombytes(payload)
+    if sys.byteorder != "little":
+        values.byteswap()
+    records = [tuple(values[start : start + field_count]) for start in range(0, len(values), field_count)]
+    return names, records
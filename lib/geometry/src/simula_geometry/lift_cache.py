@@ -0,0 +1,88 @@
+"""
+Content-addressed store of raw lift results.
+
+Keys are sha256 hex digests of a lift's inputs (see lift_cache_key in
+cuboid_lift.py); values are the plain-tuple records of lift_result_record.
+Records live in an in-memory LRU and, with a directory, also on disk as
+<directory>/<key[:2]>/<key>.pickle, so a later run (or another process)
+reuses them. Disk writes go through a temporary file and os.replace, so
+concurrent writers never leave a partial record. A LiftCache can be
+shared across threads.
+
+Records are unpickled on read: only point a cache at directories you trust.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+CACHE_MEMORY_ENTRIES = 65536
+
+
+class LiftCache:
+    """Memory LRU of lift records, optionally backed by a directory."""
+
+    __slots__ = ("records", "max_entries", "directory", "lock", "hits", "misses")
+
+    def __init__(self, directory: str | None = None, max_entries: int = CACHE_MEMORY_ENTRIES):
+        self.records: OrderedDict[str, tuple[Any, ...]] = OrderedDict()
+        self.max_entries = max(1, max_entries)
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def get(self, key: str) -> tuple[Any, ...] | None:
+        with self.lock:
+            record = self.records.get(key)
+            if record is not None:
+                self.records.move_to_end(key)
+                self.hits += 1
+                return record
+        if self.directory is not None:
+            try:
+                record = pickle.loads(self.record_path(key).read_bytes())
+            except (OSError, pickle.UnpicklingError, EOFError):
+                record = None
+            if record is not None:
+                self.remember(key, record)
+                with self.lock:
+                    self.hits += 1
+                return record
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, record: tuple[Any, ...]) -> None:
+        self.remember(key, record)
+        if self.directory is None:
+            return
+        path = self.record_path(key)
+        path.parent.mkdir(exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                pickle.dump(record, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def remember(self, key: str, record: tuple[Any, ...]) -> None:
+        with self.lock:
+            self.records[key] = record
+            self.records.move_to_end(key)
+            if len(self.records) > self.max_entries:
+                self.records.popitem(last=False)
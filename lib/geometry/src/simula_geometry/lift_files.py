@@ -0,0 +1,181 @@
+"""
+Many-payload runs of the cuboid_lift CLI.
+
+Resolves a directory, a glob or a manifest file to a list of payload JSON
+files and lifts them in one process pool, writing either one output file
+per payload or a combined NDJSON stream, plus a failure/timing summary.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+if __package__:
+    from .cuboid_lift import LiftCache, lift_payload
+else:  # script mode: cuboid_lift.py run directly
+    from cuboid_lift import LiftCache, lift_payload
+
+# Suffix of the per-payload result files written to output_dir.
+OUTPUT_SUFFIX = ".out.json"
+
+
+def resolve_payload_paths(input_path: str | None = None, manifest_path: str | None = None) -> list[str]:
+    """
+    Payload files of a run, in a stable order: every *.json in a directory
+    (sorted), the sorted matches of a glob, or the lines of a manifest (one
+    path per line, relative to the manifest; blank lines and # comments
+    skipped). Directory and glob inputs leave out *.out.json result files,
+    so an output_dir inside the input directory is not lifted on rerun.
+    """
+    paths: list[str] = []
+    if manifest_path is not None:
+        base = Path(manifest_path).parent
+        for line in Path(manifest_path).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(str(base / line))
+    if input_path is not None:
+        if os.path.isdir(input_path):
+            matches = [str(path) for path in Path(input_path).glob("*.json")]
+        else:
+            matches = glob.glob(input_path, recursive=True)
+        paths.extend(sorted(path for path in matches if not path.endswith(OUTPUT_SUFFIX)))
+    if not paths:
+        raise ValueError("no se encontraron payloads de entrada")
+    return paths
+
+
+def lift_payload_file(
+    path: str,
+    mode: str = "auto",
+    output_profile: str | None = None,
+    cache_dir: str | None = None,
+) -> dict[str, Any]:
+    """
+    Lift one payload file; failures are reported in the record instead of
+    raised. output_profile overrides the payload's config.outputProfile;
+    sequence lifts reuse and fill the LiftCache in cache_dir.
+    """
+    started = time.perf_counter()
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError("input JSON debe ser un objeto")
+        config = payload.get("config")
+        if not isinstance(config, dict):
+            config = {}
+        if config.get("workers") not in (None, 1):
+            # Files are already spread across the pool; don't nest a second one.
+            config = {**config, "workers": 1}
+        if output_profile is not None:
+            config = {**config, "outputProfile": output_profile}
+        payload["config"] = config
+        output = lift_payload(payload, mode, LiftCache(cache_dir) if cache_dir is not None else None)
+    except Exception as error:  # one bad file must not stop a nightly run
+        return {
+            "input": path,
+            "status": "error",
+            "error": f"{type(error).__name__}: {error}",
+            "elapsedMs": (time.perf_counter() - started) * 1000.0,
+        }
+    return {
+        "input": path,
+        "status": "ok",
+        "elapsedMs": (time.perf_counter() - started) * 1000.0,
+        "output": output,
+    }
+
+
+def iter_lift_payload_files(
+    paths: list[str],
+    mode: str = "auto",
+    workers: int = 1,
+    output_profile: str | None = None,
+    cache_dir: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield lift_payload_file records in input order, from a process pool when workers > 1."""
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            yield lift_payload_file(path, mode, output_profile, cache_dir)
+        return
+    chunk_size = max(1, len(paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            lift_payload_file,
+            paths,
+            [mode] * len(paths),
+            [output_profile] * len(paths),
+            [cache_dir] * len(paths),
+            chunksize=chunk_size,
+        )
+
+
+def output_file_names(paths: list[str]) -> list[str]:
+    """One output name per input: the input's stem, suffixed -2, -3, ... on collisions."""
+    names: list[str] = []
+    used: dict[str, int] = {}
+    for path in paths:
+        stem = Path(path).stem
+        count = used.get(stem, 0) + 1
+        used[stem] = count
+        names.append(f"{stem}{OUTPUT_SUFFIX}" if count == 1 else f"{stem}-{count}{OUTPUT_SUFFIX}")
+    return names
+
+
+def run_payload_files(
+    paths: list[str],
+    mode: str = "auto",
+    workers: int = 1,
+    output_dir: str | None = None,
+    ndjson_out: TextIO | None = None,
+    pretty: bool = False,
+    output_profile: str | None = None,
+    cache_dir: str | None = None,
+) -> dict[str, Any]:
+    """
+    Lift every payload and write the results, either as <stem>.out.json files
+    in output_dir or as one NDJSON record per input to ndjson_out. Returns
+    the run summary (counts, failures and timing).
+    """
+    started = time.perf_counter()
+    names = output_file_names(paths)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    failures: list[dict[str, Any]] = []
+    elapsed: list[float] = []
+    for name, record in zip(names, iter_lift_payload_files(paths, mode, workers, output_profile, cache_dir)):
+        elapsed.append(record["elapsedMs"])
+        if record["status"] != "ok":
+            failures.append({"input": record["input"], "error": record["error"]})
+        if output_dir is not None:
+            if record["status"] == "ok":
+                text = json.dumps(record["output"], ensure_ascii=True, indent=2 if pretty else None)
+                (Path(output_dir) / name).write_text(text + "\n", encoding="utf-8")
+        elif ndjson_out is not None:
+            ndjson_out.write(json.dumps(record, ensure_ascii=True) + "\n")
+            ndjson_out.flush()
+
+    wall_seconds = time.perf_counter() - started
+    return {
+        "status": "ok" if not failures else "partial",
+        "mode": "files",
+        "summary": {
+            "inputCount": len(paths),
+            "okCount": len(paths) - len(failures),
+            "failureCount": len(failures),
+            "workers": workers if workers > 0 else (os.cpu_count() or 1),
+            "wallSeconds": wall_seconds,
+            "payloadsPerSecond": len(paths) / wall_seconds if wall_seconds > 0 else None,
+            "payloadMsMean": sum(elapsed) / len(elapsed) if elapsed else None,
+            "payloadMsMax": max(elapsed) if elapsed else None,
+        },
+        "failures": failures,
+    }
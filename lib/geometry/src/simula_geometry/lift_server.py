@@ -0,0 +1,194 @@
+"""
+Long-lived JSON-RPC 2.0 server for cuboid lifting.
+
+Requests and responses are one JSON object per line, over stdin/stdout or a
+Unix socket (one thread per connection). Compiled CameraModels are cached
+across requests, so a warm request only pays for JSON parsing and the lift
+itself instead of interpreter startup and imports.
+
+Methods: lift_cuboid and lift_cuboid_sequence (params: the same payload the
+CLI reads), lift_cuboids_batch (params: camera, detections, objects, config;
+requires numpy) and ping.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, TextIO
+
+if __package__:
+    from .cuboid_lift import CameraModel, LiftCache, lift_cuboid, lift_cuboid_sequence, load_vectorized
+else:  # script mode: cuboid_lift.py run directly
+    from cuboid_lift import CameraModel, LiftCache, lift_cuboid, lift_cuboid_sequence, load_vectorized
+
+CAMERA_CACHE_SIZE = 64
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class CameraCache:
+    """Thread-safe LRU of CameraModels keyed by the camera dict's canonical JSON."""
+
+    __slots__ = ("models", "max_size", "lock", "hits", "misses")
+
+    def __init__(self, max_size: int = CAMERA_CACHE_SIZE):
+        self.models: OrderedDict[str, CameraModel] = OrderedDict()
+        self.max_size = max(1, max_size)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, camera: Any) -> Any:
+        """CameraModel for a camera dict; anything else is returned untouched for lift_* to reject."""
+        if not isinstance(camera, dict):
+            return camera
+        key = json.dumps(camera, sort_keys=True)
+        with self.lock:
+            model = self.models.get(key)
+            if model is not None:
+                self.models.move_to_end(key)
+                self.hits += 1
+                return model
+        model = CameraModel(camera)
+        with self.lock:
+            self.misses += 1
+            self.models[key] = model
+            if len(self.models) > self.max_size:
+                self.models.popitem(last=False)
+        return model
+
+
+class LiftService:
+    """
+    Dispatches JSON-RPC requests to the lift functions; safe to share across
+    threads. With a lift_cache, sequence lifts reuse raw lifts across
+    requests, so resubmitting a sequence with new smoothing skips the fits.
+    """
+
+    def __init__(self, camera_cache_size: int = CAMERA_CACHE_SIZE, lift_cache: LiftCache | None = None):
+        self.cameras = CameraCache(camera_cache_size)
+        self.lift_cache = lift_cache
+        self.methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "lift_cuboid": self.lift_cuboid,
+            "lift_cuboid_sequence": self.lift_cuboid_sequence,
+            "lift_cuboids_batch": self.lift_cuboids_batch,
+            "ping": self.ping,
+        }
+
+    def lift_cuboid(self, params: dict[str, Any]) -> dict[str, Any]:
+        return lift_cuboid({**params, "camera": self.cameras.get(params.get("camera"))})
+
+    def lift_cuboid_sequence(self, params: dict[str, Any]) -> dict[str, Any]:
+        return lift_cuboid_sequence({**params, "camera": self.cameras.get(params.get("camera"))}, self.lift_cache)
+
+    def lift_cuboids_batch(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return load_vectorized().lift_cuboids_batch(
+            self.cameras.get(params.get("camera")),
+            params.get("detections"),
+            params.get("objects"),
+            params.get("config"),
+        )
+
+    def ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        status = {"status": "ok", "cameraCache": {"hits": self.cameras.hits, "misses": self.cameras.misses}}
+        if self.lift_cache is not None:
+            status["liftCache"] = {"hits": self.lift_cache.hits, "misses": self.lift_cache.misses}
+        return status
+
+    def handle(self, request: Any) -> dict[str, Any] | None:
+        """Answer one decoded request; notifications (no id) get no response."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return error_response(None, INVALID_REQUEST, "request invalido")
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            response = error_response(request_id, METHOD_NOT_FOUND, f"metodo desconocido: {request['method']!r}")
+        else:
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                response = error_response(request_id, INVALID_PARAMS, "params debe ser un objeto")
+            else:
+                try:
+                    response = {"jsonrpc": "2.0", "id": request_id, "result": method(params)}
+                except (ValueError, TypeError, KeyError) as error:
+                    response = error_response(request_id, INVALID_PARAMS, str(error))
+                except Exception as error:  # keep the server alive on unexpected failures
+                    response = error_response(request_id, INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+        if "id" not in request:
+            return None
+        return response
+
+    def handle_line(self, line: str) -> str | None:
+        """Answer one request line; None when nothing should be written back."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            response: dict[str, Any] | None = error_response(None, PARSE_ERROR, f"JSON invalido: {error}")
+        else:
+            response = self.handle(request)
+        if response is None:
+            return None
+        return json.dumps(response, ensure_ascii=True)
+
+
+def error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(service: LiftService, stdin: TextIO, stdout: TextIO) -> None:
+    """Answer requests from stdin in order until EOF."""
+    for line in stdin:
+        response = service.handle_line(line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+
+
+def make_unix_server(service: LiftService, socket_path: str) -> socketserver.BaseServer:
+    """Bind a threaded Unix-socket server (one thread per connection); call serve_forever on it."""
+    server_class = getattr(socketserver, "ThreadingUnixStreamServer", None)
+    if server_class is None:
+        raise RuntimeError("este sistema no soporta sockets Unix; usa el modo stdio")
+
+    class LiftRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw_line in self.rfile:
+                response = service.handle_line(raw_line.decode("utf-8"))
+                if response is not None:
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        # Only a stale socket from an earlier run is ours to replace.
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{socket_path} existe y no es un socket Unix")
+        os.unlink(socket_path)
+    server = server_class(socket_path, LiftRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_unix_socket(service: LiftService, socket_path: str) -> None:
+    server = make_unix_server(service, socket_path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,131 @@
+"""
+Bounded derivative-free local search used by the cuboid fitters.
+
+Pure Python on purpose: the objective (one cuboid reprojection) is cheap and
+scalar, and simula_geometry has no required dependencies.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Sequence
+
+
+def nelder_mead(
+    func: Callable[[list[float]], float],
+    start: Sequence[float],
+    initial_step: Sequence[float],
+    lower: Sequence[float | None],
+    upper: Sequence[float | None],
+    max_evaluations: int,
+    tolerance: float,
+    deadline: float | None = None,
+) -> tuple[list[float], float, int, bool]:
+    """
+    Minimize func with a Nelder-Mead simplex, clamping every vertex to bounds.
+
+    Args:
+        func: Objective; may return inf for infeasible points.
+        start: Initial point.
+        initial_step: Per-dimension offset used to build the initial simplex.
+        lower / upper: Per-dimension bounds, None for unbounded.
+        max_evaluations: Hard cap on func calls (including the initial simplex).
+        tolerance: Stop once the spread of objective values across the
+            simplex is at most this.
+        deadline: time.perf_counter() value after which no new iteration
+            starts (the run then reports converged=False).
+
+    Returns:
+        (best_point, best_value, evaluations, converged)
+    """
+    dims = len(start)
+
+    def clamp(point: list[float]) -> list[float]:
+        clamped = []
+        for axis, value in enumerate(point):
+            if lower[axis] is not None and value < lower[axis]:
+                value = lower[axis]
+            if upper[axis] is not None and value > upper[axis]:
+                value = upper[axis]
+            clamped.append(value)
+        return clamped
+
+    evaluations = 0
+
+    def evaluate(point: list[float]) -> float:
+        nonlocal evaluations
+        evaluations += 1
+        return func(point)
+
+    simplex = [clamp(list(start))]
+    for axis in range(dims):
+        vertex = list(start)
+        vertex[axis] += initial_step[axis]
+        vertex = clamp(vertex)
+        if vertex == simplex[0]:
+            vertex = list(start)
+            vertex[axis] -= initial_step[axis]
+            vertex = clamp(vertex)
+        simplex.append(vertex)
+    values = []
+    for vertex in simplex:
+        if evaluations >= max_evaluations:
+            values.append(float("inf"))
+            continue
+        values.append(evaluate(vertex))
+
+    converged = False
+    while evaluations < max_evaluations:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        order = sorted(range(dims + 1), key=values.__getitem__)
+        simplex = [simplex[index] for index in order]
+        values = [values[index] for index in order]
+        if values[-1] - values[0] <= tolerance:
+            converged = True
+            break
+
+        centroid = [sum(vertex[axis] for vertex in simplex[:-1]) / dims for axis in range(dims)]
+        worst = simplex[-1]
+
+        def toward(coefficient: float) -> list[float]:
+            return clamp([centroid[axis] + coefficient * (worst[axis] - centroid[axis]) for axis in range(dims)])
+
+        reflected = toward(-1.0)
+        reflected_value = evaluate(reflected)
+        if reflected_value < values[0]:
+            if evaluations >= max_evaluations:
+                simplex[-1], values[-1] = reflected, reflected_value
+                break
+            expanded = toward(-2.0)
+            expanded_value = evaluate(expanded)
+            if expanded_value < reflected_value:
+                simplex[-1], values[-1] = expanded, expanded_value
+            else:
+                simplex[-1], values[-1] = reflected, reflected_value
+            continue
+        if reflected_value < values[-2]:
+            simplex[-1], values[-1] = reflected, reflected_value
+            continue
+        if evaluations >= max_evaluations:
+            break
+
+        if reflected_value < values[-1]:
+            contracted = toward(-0.5)
+        else:
+            contracted = toward(0.5)
+        contracted_value = evaluate(contracted)
+        if contracted_value < min(reflected_value, values[-1]):
+            simplex[-1], values[-1] = contracted, contracted_value
+            continue
+
+        best = simplex[0]
+        for index in range(1, dims + 1):
+            if evaluations >= max_evaluations:
+                break
+            shrunk = clamp([best[axis] + 0.5 * (simplex[index][axis] - best[axis]) for axis in range(dims)])
+            simplex[index] = shrunk
+            values[index] = evaluate(shrunk)
+
+    best_index = min(range(dims + 1), key=values.__getitem__)
+    return simplex[best_index], values[best_index], evaluations, converged
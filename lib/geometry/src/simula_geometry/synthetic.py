@@ -0,0 +1,213 @@
+"""
+Synthetic scenes for benchmarks and accuracy sweeps.
+
+Cameras, objects and tracks are drawn from a seeded random.Random, so a
+seed reproduces the same scenes on any machine. Detections are rendered
+from ground-truth poses through oriented_box_corners and
+project_world_point, optionally with Gaussian bbox noise, and every
+object is placed with all eight corners inside the image.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any
+
+if __package__:
+    from .cuboid_lift import CameraModel, oriented_box_corners, project_world_point
+else:  # script mode: cuboid_lift.py run directly
+    from cuboid_lift import CameraModel, oriented_box_corners, project_world_point
+
+# (width, depth, height) in meters: shelf, pallet, box, rack, cart.
+OBJECT_SIZES = (
+    (1.2, 0.5, 1.8),
+    (1.2, 0.8, 0.15),
+    (0.6, 0.4, 0.4),
+    (2.4, 1.0, 2.2),
+    (0.9, 0.6, 1.1),
+)
+
+PLACEMENT_ATTEMPTS = 200
+
+
+class SyntheticObject:
+    """Ground-truth pose of one object: base center on the floor, yaw and size."""
+
+    __slots__ = ("center_x", "center_z", "yaw_deg", "size")
+
+    def __init__(self, center_x: float, center_z: float, yaw_deg: float, size: tuple[float, float, float]):
+        self.center_x = center_x
+        self.center_z = center_z
+        self.yaw_deg = yaw_deg
+        self.size = size
+
+    def object_dict(self) -> dict[str, Any]:
+        """payload.object for this object: its size only, so the yaw must be fitted."""
+        width, depth, height = self.size
+        return {"sizeM": {"width": width, "depth": depth, "height": height}}
+
+
+class SyntheticScene:
+    """One camera with its objects and their rendered detections (same order)."""
+
+    __slots__ = ("camera", "objects", "detections")
+
+    def __init__(self, camera: dict[str, Any], objects: list[SyntheticObject], detections: list[dict[str, float]]):
+        self.camera = camera
+        self.objects = objects
+        self.detections = detections
+
+    def payloads(self, config: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        """One lift_cuboid payload per detection."""
+        return [
+            {"camera": self.camera, "detection": detection, "object": obj.object_dict(), "config": dict(config or {})}
+            for obj, detection in zip(self.objects, self.detections)
+        ]
+
+
+def random_camera(rng: random.Random) -> dict[str, Any]:
+    return {
+        "planPositionM": [rng.uniform(-5.0, 5.0), rng.uniform(-5.0, 5.0)],
+        "heightM": rng.uniform(2.2, 4.5),
+        "yawDeg": rng.uniform(-180.0, 180.0),
+        "pitchDeg": rng.uniform(-50.0, -20.0),
+        "rollDeg": rng.uniform(-3.0, 3.0),
+        "fovDeg": rng.uniform(50.0, 85.0),
+        "aspectRatio": rng.choice((16.0 / 9.0, 4.0 / 3.0)),
+    }
+
+
+def render_bbox(
+    camera: CameraModel,
+    obj: SyntheticObject,
+    bbox_noise: float = 0.0,
+    rng: random.Random | None = None,
+) -> dict[str, float] | None:
+    """
+    Detection bbox of obj, or None unless every corner projects inside the
+    image. bbox_noise is the standard deviation, in normalized image
+    units, added to each bbox edge.
+    """
+    width, depth, height = obj.size
+    corners = oriented_box_corners(obj.center_x, obj.center_z, width, depth, height, obj.yaw_deg, 0.0)
+    us: list[float] = []
+    vs: list[float] = []
+    for corner in corners:
+        projected = project_world_point(corner, camera)
+        if projected is None or not (0.0 <= projected[0] <= 1.0 and 0.0 <= projected[1] <= 1.0):
+            return None
+        us.append(projected[0])
+        vs.append(projected[1])
+    left, right, top, bottom = min(us), max(us), min(vs), max(vs)
+    if bbox_noise > 0.0 and rng is not None:
+        left += rng.gauss(0.0, bbox_noise)
+        right += rng.gauss(0.0, bbox_noise)
+        top += rng.gauss(0.0, bbox_noise)
+        bottom += rng.gauss(0.0, bbox_noise)
+        left, right = max(0.0, left), min(1.0, right)
+        top, bottom = max(0.0, top), min(1.0, bottom)
+        if right - left <= 1e-4 or bottom - top <= 1e-4:
+            return None
+    return {"x": left, "y": top, "width": right - left, "height": bottom - top}
+
+
+def place_object(
+    rng: random.Random,
+    camera: dict[str, Any],
+    size: tuple[float, float, float] | None = None,
+) -> SyntheticObject:
+    """A random object pose in front of the camera that renders fully inside the image."""
+    model = CameraModel(camera)
+    yaw = math.radians(camera["yawDeg"])
+    for _ in range(PLACEMENT_ATTEMPTS):
+        distance = rng.uniform(3.0, 12.0)
+        lateral = rng.uniform(-0.6, 0.6) * distance
+        obj = SyntheticObject(
+            model.origin[0] + math.sin(yaw) * distance + math.cos(yaw) * lateral,
+            model.origin[2] + math.cos(yaw) * distance - math.sin(yaw) * lateral,
+            rng.uniform(-180.0, 180.0),
+            size if size is not None else rng.choice(OBJECT_SIZES),
+        )
+        if render_bbox(model, obj) is not None:
+            return obj
+    raise ValueError("no se pudo ubicar un objeto visible para la camara sintetica")
+
+
+def synthetic_scene(rng: random.Random, detection_count: int, bbox_noise: float = 0.0) -> SyntheticScene:
+    """A random camera with detection_count fully visible objects."""
+    while True:
+        camera = random_camera(rng)
+        model = CameraModel(camera)
+        try:
+            objects = [place_object(rng, camera) for _ in range(detection_count)]
+        except ValueError:
+            continue  # camera sees too little floor; draw another
+        detections = [render_bbox(model, obj, bbox_noise, rng) for obj in objects]
+        if all(detection is not None for detection in detections):
+            return SyntheticScene(camera, objects, detections)
+
+
+def synthetic_scenes(
+    seed: int,
+    count: int,
+    detection_counts: tuple[int, int] = (1, 8),
+    bbox_noise: float = 0.0,
+) -> list[SyntheticScene]:
+    """count scenes, each with between detection_counts[0] and [1] detections."""
+    rng = random.Random(seed)
+    return [synthetic_scene(rng, rng.randint(*detection_counts), bbox_noise) for _ in range(count)]
+
+
+def synthetic_track(
+    rng: random.Random,
+    camera: dict[str, Any],
+    length: int,
+    bbox_noise: float = 0.0,
+) -> tuple[list[SyntheticObject], list[dict[str, float]]]:
+    """
+    Ground truth and detections of one object moving at constant plan
+    velocity and yaw rate for length frames, all fully visible.
+    """
+    model = CameraModel(camera)
+    for _ in range(PLACEMENT_ATTEMPTS):
+        start = place_object(rng, camera)
+        speed = rng.uniform(0.0, 0.04)
+        heading = rng.uniform(-math.pi, math.pi)
+        yaw_rate = rng.uniform(-1.0, 1.0)
+        truth = [
+            SyntheticObject(
+                start.center_x + math.sin(heading) * speed * index,
+                start.center_z + math.cos(heading) * speed * index,
+                (start.yaw_deg + yaw_rate * index + 180.0) % 360.0 - 180.0,
+                start.size,
+            )
+            for index in range(length)
+        ]
+        detections = [render_bbox(model, obj, bbox_noise, rng) for obj in truth]
+        if all(detection is not None for detection in detections):
+            return truth, detections
+    raise ValueError("no se pudo generar una trayectoria visible para la camara sintetica")
+
+
+def synthetic_sequence_payload(
+    seed: int,
+    length: int,
+    config: dict[str, Any] | None = None,
+    bbox_noise: float = 0.0,
+) -> tuple[dict[str, Any], list[SyntheticObject]]:
+    """A lift_cuboid_sequence payload of one moving object, and its ground truth per frame."""
+    rng = random.Random(seed)
+    while True:
+        camera = random_camera(rng)
+        try:
+            truth, detections = synthetic_track(rng, camera, length, bbox_noise)
+        except ValueError:
+            continue
+        payload = {
+            "camera": camera,
+            "object": truth[0].object_dict(),
+            "frames": [{**detection, "timestamp": f"t{index}"} for index, detection in enumerate(detections)],
+            "config": dict(config or {}),
+        }
+        return payload, truth
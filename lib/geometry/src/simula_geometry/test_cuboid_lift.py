@@ -0,0 +1,1120 @@
+"""
+lib/geometry/src/simula_geometry/test_cuboid_lift.py
+
+Tests for cuboid lifting: the scalar reference path and the faster
+variants that must agree with it.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+
+from simula_geometry.cuboid_lift import (
+    CameraModel,
+    bbox_from_projected_corners,
+    lift_cuboid,
+    lift_cuboid_sequence,
+    lift_cuboid_stream,
+    oriented_box_corners,
+    project_world_point,
+    ray_from_uv,
+    read_ndjson,
+    yaw_symmetry_period_deg,
+)
+
+
+# ──────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────
+
+CAMERA = {
+    "planPositionM": [0.0, -1.0],
+    "heightM": 2.7,
+    "yawDeg": 10.0,
+    "pitchDeg": -35.0,
+    "rollDeg": 2.0,
+    "fovDeg": 65.0,
+    "aspectRatio": 16.0 / 9.0,
+}
+
+SHELF = {"sizeM": {"width": 1.2, "depth": 0.5, "height": 1.8}, "yawDeg": 15.0}
+
+DETECTIONS = [
+    {"x": 0.40, "y": 0.35, "width": 0.18, "height": 0.30},
+    {"x": 0.10, "y": 0.50, "width": 0.12, "height": 0.25, "anchorUV": [0.17, 0.74]},
+    {"x": 0.62, "y": 0.42, "width": 0.20, "height": 0.22},
+]
+
+
+def assert_nested_close(actual, expected, tol=1e-9):
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected)
+        for key in expected:
+            assert_nested_close(actual[key], expected[key], tol)
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert_nested_close(a, e, tol)
+    elif isinstance(expected, float):
+        assert math.isclose(actual, expected, rel_tol=tol, abs_tol=tol)
+    else:
+        assert actual == expected
+
+
+# ──────────────────────────────────────────────
+# CameraModel
+# ──────────────────────────────────────────────
+
+def test_camera_model_matches_raw_dict():
+    model = CameraModel(CAMERA)
+    assert ray_from_uv(model, 0.3, 0.7) == ray_from_uv(CAMERA, 0.3, 0.7)
+    assert project_world_point((0.4, 0.2, 3.0), model) == project_world_point((0.4, 0.2, 3.0), CAMERA)
+
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 5.0}
+    payload = {"detection": DETECTIONS[0], "object": SHELF, "config": config}
+    assert lift_cuboid({**payload, "camera": model}) == lift_cuboid({**payload, "camera": CAMERA})
+
+
+def test_sequence_applies_frame_camera_override():
+    frames = [dict(DETECTIONS[0]), {**DETECTIONS[0], "camera": {"yawDeg": -5.0}}]
+    output = lift_cuboid_sequence({"camera": CAMERA, "object": SHELF, "frames": frames})
+    override = lift_cuboid(
+        {"camera": {**CAMERA, "yawDeg": -5.0}, "detection": DETECTIONS[0], "object": SHELF, "config": {}}
+    )
+    assert output["frames"][1]["raw"] == override["result"]
+    assert output["frames"][0]["raw"] != output["frames"][1]["raw"]
+
+
+# ──────────────────────────────────────────────
+# Batch lifting
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {},
+        {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0},
+        {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": True, "yawSearchStepDeg": 10.0, "centerOffsetStepM": 0.1},
+    ],
+)
+def test_lift_cuboids_batch_matches_scalar_loop(config):
+    pytest.importorskip("numpy")
+    from simula_geometry.vectorized import lift_cuboids_batch
+
+    expected = [
+        lift_cuboid({"camera": CAMERA, "detection": det, "object": SHELF, "config": config})
+        for det in DETECTIONS
+    ]
+    assert_nested_close(lift_cuboids_batch(CAMERA, DETECTIONS, SHELF, config), expected)
+
+
+def test_lift_cuboids_batch_float32_and_array_input():
+    np = pytest.importorskip("numpy")
+    from simula_geometry.vectorized import lift_cuboids_batch
+
+    bboxes = np.array([[d["x"], d["y"], d["width"], d["height"]] for d in DETECTIONS])
+    expected = lift_cuboids_batch(CAMERA, [{k: d[k] for k in ("x", "y", "width", "height")} for d in DETECTIONS], SHELF)
+    results = lift_cuboids_batch(CAMERA, {"bbox": bboxes}, SHELF, dtype="float32")
+    assert len(results) == len(expected)
+    for result, reference in zip(results, expected):
+        assert_nested_close(result["result"]["cornersWorld"], reference["result"]["cornersWorld"], tol=1e-4)
+
+
+def test_lift_cuboids_batch_reports_failed_detection():
+    pytest.importorskip("numpy")
+    from simula_geometry.vectorized import lift_cuboids_batch
+
+    sky = {"x": 0.4, "y": 0.0, "width": 0.1, "height": 0.05, "anchorUV": [0.5, 0.0]}
+    with pytest.raises(ValueError, match=r"detections\[1\]"):
+        lift_cuboids_batch({**CAMERA, "pitchDeg": -10.0}, [DETECTIONS[0], sky], SHELF)
+
+
+# ──────────────────────────────────────────────
+# Yaw search modes
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("step", [1.0, 2.0, 7.5])
+@pytest.mark.parametrize("detection", DETECTIONS)
+def test_vectorized_yaw_search_matches_scalar(step, detection):
+    pytest.importorskip("numpy")
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": step}
+    expected = lift_cuboid({"camera": CAMERA, "detection": detection, "object": SHELF, "config": config})
+    actual = lift_cuboid(
+        {"camera": CAMERA, "detection": detection, "object": SHELF, "config": {**config, "yawSearchMode": "vectorized"}}
+    )
+    # The vectorized fine pass may evaluate a few extra candidates; everything else is identical.
+    assert actual["result"]["fit"].pop("evaluations") >= expected["result"]["fit"].pop("evaluations")
+    assert actual == expected
+
+
+def test_unknown_yaw_search_mode_rejected():
+    config = {"fitYawFromBBox": True, "yawSearchMode": "gpu"}
+    with pytest.raises(ValueError, match="yawSearchMode"):
+        lift_cuboid({"camera": CAMERA, "detection": DETECTIONS[0], "object": SHELF, "config": config})
+
+
+# ──────────────────────────────────────────────
+# Yaw symmetry pruning
+# ──────────────────────────────────────────────
+
+def test_yaw_symmetry_period():
+    assert yaw_symmetry_period_deg({"width": 1.2, "depth": 0.5, "height": 1.0}) == 180.0
+    assert yaw_symmetry_period_deg({"width": 0.6, "depth": 0.6, "height": 1.0}) == 90.0
+
+
+@pytest.mark.parametrize("step", [5.0, 7.0])
+@pytest.mark.parametrize("size", [SHELF["sizeM"], {"width": 0.6, "depth": 0.6, "height": 0.9}])
+@pytest.mark.parametrize("fit_offset", [False, True])
+def test_symmetry_pruning_keeps_fit_error(size, fit_offset, step):
+    obj = {"sizeM": size, "yawDeg": 100.0}
+    config = {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": fit_offset, "yawSearchStepDeg": step}
+    full = lift_cuboid({"camera": CAMERA, "detection": DETECTIONS[0], "object": obj, "config": config})["result"]
+    pruned = lift_cuboid(
+        {"camera": CAMERA, "detection": DETECTIONS[0], "object": obj, "config": {**config, "yawSymmetry": "auto"}}
+    )["result"]
+
+    period = yaw_symmetry_period_deg(size)
+    assert pruned["fit"]["errorL1"] == pytest.approx(full["fit"]["errorL1"], abs=1e-12)
+    delta = (pruned["yawDeg"] - full["yawDeg"]) % period
+    assert min(delta, period - delta) == pytest.approx(0.0, abs=1e-9)
+    # Reported yaw is the equivalent closest to yawHint.
+    assert abs((pruned["yawDeg"] - 100.0 + 180.0) % 360.0 - 180.0) <= period * 0.5
+
+
+def test_symmetry_pruning_with_non_divisor_step_matches_full_sweep():
+    from simula_geometry.cuboid_lift import yaw_sweep_indices
+    from simula_geometry.synthetic import synthetic_scenes
+
+    assert len(yaw_sweep_indices(5.0, 180.0)) == 36
+    assert yaw_sweep_indices(7.0, 180.0) == yaw_sweep_indices(7.0, 360.0)
+    assert yaw_sweep_indices(7.0, 90.0) == yaw_sweep_indices(7.0, 360.0)
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 7.0}
+    for scene in synthetic_scenes(5, 4):
+        for payload in scene.payloads(config):
+            full = lift_cuboid(payload)["result"]["fit"]["errorL1"]
+            pruned = lift_cuboid({**payload, "config": {**config, "yawSymmetry": "auto"}})["result"]["fit"]["errorL1"]
+            assert pruned == full
+
+
+def test_symmetry_reference_previous_frame():
+    frames = [dict(DETECTIONS[0]), dict(DETECTIONS[0])]
+    config = {
+        "fitYawFromBBox": True,
+        "yawSearchStepDeg": 5.0,
+        "yawSymmetry": "auto",
+        "yawSymmetryReference": "previous",
+    }
+    output = lift_cuboid_sequence({"camera": CAMERA, "object": {"sizeM": SHELF["sizeM"]}, "frames": frames, "config": config})
+    first, second = (frame["raw"]["yawDeg"] for frame in output["frames"])
+    assert second == pytest.approx(first)
+
+
+# ──────────────────────────────────────────────
+# coarse+local fit strategy
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("fit_offset", [False, True])
+def test_coarse_local_strategy_respects_budget_and_bounds(fit_offset):
+    config = {
+        "fitYawFromBBox": True,
+        "fitCenterOffsetFromBBox": fit_offset,
+        "fitStrategy": "coarse+local",
+        "fitMaxEvaluations": 120,
+    }
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": {"sizeM": SHELF["sizeM"]}}
+    result = lift_cuboid({**payload, "config": config})["result"]
+    grid = lift_cuboid({**payload, "config": {**config, "fitStrategy": "grid"}})["result"]
+
+    fit = result["fit"]
+    assert fit["strategy"] == "coarse+local"
+    assert 0 < fit["evaluations"] <= 120
+    assert fit["evaluations"] < grid["fit"]["evaluations"]
+    assert -180.0 <= result["yawDeg"] < 180.0
+    if fit_offset:
+        low, high = fit["offsetRangeM"]
+        assert low <= result["centerOffsetFromAnchorM"] <= high
+    else:
+        assert fit["errorL1"] == pytest.approx(grid["fit"]["errorL1"], abs=0.02)
+
+
+@pytest.mark.parametrize("budget", [1, 5, 20])
+def test_coarse_local_seed_grid_stays_within_budget(budget):
+    config = {
+        "fitYawFromBBox": True,
+        "fitCenterOffsetFromBBox": True,
+        "fitStrategy": "coarse+local",
+        "fitMaxEvaluations": budget,
+    }
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": {"sizeM": SHELF["sizeM"]}, "config": config}
+    fit = lift_cuboid(payload)["result"]["fit"]
+    assert 1 <= fit["evaluations"] <= budget
+
+
+@pytest.mark.parametrize("budget", [0, -3])
+def test_fit_max_evaluations_rejects_values_below_one(budget):
+    config = {"fitYawFromBBox": True, "fitStrategy": "coarse+local", "fitMaxEvaluations": budget}
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": {"sizeM": SHELF["sizeM"]}, "config": config}
+    with pytest.raises(ValueError, match="fitMaxEvaluations"):
+        lift_cuboid(payload)
+
+
+def test_nelder_mead_finds_bounded_minimum():
+    from simula_geometry.local_search import nelder_mead
+
+    point, value, evaluations, converged = nelder_mead(
+        lambda p: (p[0] - 3.0) ** 2 + (p[1] + 1.0) ** 2,
+        start=(0.0, 0.0),
+        initial_step=(1.0, 1.0),
+        lower=(None, -0.5),
+        upper=(None, 0.5),
+        max_evaluations=200,
+        tolerance=1e-10,
+    )
+    assert converged and evaluations <= 200
+    assert point[0] == pytest.approx(3.0, abs=1e-3)
+    assert point[1] == pytest.approx(-0.5)
+    assert value == pytest.approx(0.25, abs=1e-5)
+
+
+# ──────────────────────────────────────────────
+# Branch-and-bound pruning
+# ──────────────────────────────────────────────
+
+def test_pruned_joint_fit_matches_full_grid():
+    config = {
+        "fitYawFromBBox": True,
+        "fitCenterOffsetFromBBox": True,
+        "centerOffsetMinM": -2.0,
+        "centerOffsetMaxM": 2.0,
+        "yawSearchStepDeg": 5.0,
+    }
+    total_skipped = 0
+    for detection in DETECTIONS:
+        payload = {"camera": CAMERA, "detection": detection, "object": {"sizeM": SHELF["sizeM"]}}
+        pruned = lift_cuboid({**payload, "config": config})["result"]
+        full = lift_cuboid({**payload, "config": {**config, "fitPruning": False}})["result"]
+
+        assert full["fit"].pop("pruned") == 0
+        skipped = pruned["fit"].pop("pruned")
+        assert pruned["fit"].pop("evaluations") + skipped == full["fit"].pop("evaluations")
+        assert pruned == full
+        total_skipped += skipped
+    assert total_skipped > 0
+
+
+def test_center_fit_lower_bound_holds_for_every_yaw():
+    from simula_geometry.cuboid_lift import bbox_fit_error, center_fit_lower_bound, observed_extent
+
+    bbox = DETECTIONS[0]
+    size = SHELF["sizeM"]
+    for center_x, center_z in [(0.0, 4.0), (0.6, 3.2), (-1.5, 6.0)]:
+        bound = center_fit_lower_bound(CameraModel(CAMERA), observed_extent(bbox), center_x, center_z, size, 0.0)
+        assert bound > 0.0
+        for yaw in range(-180, 180, 3):
+            corners = oriented_box_corners(
+                center_x, center_z, size["width"], size["depth"], size["height"], float(yaw), 0.0
+            )
+            predicted = bbox_from_projected_corners(corners, CAMERA)
+            assert bound <= bbox_fit_error(bbox, predicted) + 1e-12
+
+
+# ──────────────────────────────────────────────
+# Corner templates
+# ──────────────────────────────────────────────
+
+def test_corner_template_matches_direct_rotation():
+    from simula_geometry.cuboid_lift import corner_template
+
+    width, depth, height = 1.2, 0.5, 1.8
+    template = corner_template(width, depth, height)
+    assert corner_template(width, depth, height) is template
+    for yaw_deg in (-180.0, -37.5, 0.0, 15.0, 91.3):
+        yaw = yaw_deg * math.pi / 180.0
+        c, s = math.cos(yaw), math.sin(yaw)
+        expected = []
+        for lx, lz in [(-0.6, -0.25), (0.6, -0.25), (0.6, 0.25), (-0.6, 0.25)]:
+            x = 0.3 + lx * c - lz * s
+            z = 4.0 + lx * s + lz * c
+            expected += [(x, 0.1, z), (x, 0.1 + height, z)]
+        # Bit-identical, not just close: fits must not change.
+        assert oriented_box_corners(0.3, 4.0, width, depth, height, yaw_deg, 0.1) == expected
+
+    hits = template.hits
+    template.corners(0.0, 0.0, 15.0, 0.0)
+    assert template.hits == hits + 1
+
+
+def test_corner_template_rotation_lru():
+    from simula_geometry.cuboid_lift import CornerTemplate, RotationCache
+
+    cache = RotationCache(max_entries=3)
+    template = CornerTemplate(1.0, 2.0, 3.0, cache)
+    other = CornerTemplate(1.0, 2.0, 3.0, cache)
+    template.rotated(0.0)
+    template.rotated(10.0)
+    template.rotated(0.0)
+    other.rotated(20.0)
+    assert list(cache.entries) == [(template.serial, 10.0), (template.serial, 0.0), (other.serial, 20.0)]
+    template.rotated(12.5)
+    assert list(cache.entries)[0] == (template.serial, 0.0)
+    assert (template.hits, template.misses) == (1, 3)
+
+    # Off-lattice yaws (fine and local passes) are rotated but never stored.
+    other.rotated(33.3)
+    other.rotated(33.3)
+    assert (other.serial, 33.3) not in cache.entries and other.misses == 3
+    assert other.rotated(33.3) == other.rotation(33.3)
+
+
+# ──────────────────────────────────────────────
+# Result objects
+# ──────────────────────────────────────────────
+
+def test_lift_result_builds_legacy_payload():
+    import pickle
+
+    from simula_geometry.cuboid_lift import lift_cuboid_result
+
+    for config in ({}, {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": True, "yawSearchStepDeg": 10.0}):
+        payload = {"camera": CAMERA, "detection": DETECTIONS[1], "object": SHELF, "config": config}
+        result = lift_cuboid_result(payload)
+        assert result.to_dict() == lift_cuboid(payload)
+        # Results cross process boundaries in the worker pool.
+        assert pickle.loads(pickle.dumps(result)).to_dict() == result.to_dict()
+
+
+def test_sequence_result_builds_legacy_payload():
+    from simula_geometry.cuboid_lift import FrameResult, lift_cuboid_sequence_result
+
+    frames = [{**DETECTIONS[index % 3], "trackId": f"t{index % 2}"} for index in range(6)]
+    payload = {
+        "camera": CAMERA,
+        "object": SHELF,
+        "frames": frames,
+        "config": {"fitYawFromBBox": True, "yawSearchStepDeg": 10.0, "smoothingAlpha": 0.5, "multiTrack": True},
+    }
+    result = lift_cuboid_sequence_result(payload)
+    assert all(isinstance(frame, FrameResult) for frame in result.frames)
+    assert result.to_dict() == lift_cuboid_sequence(payload)
+
+
+# ──────────────────────────────────────────────
+# Output profiles and binary output
+# ──────────────────────────────────────────────
+
+def test_output_profiles_keep_pose():
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 10.0}
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": SHELF, "config": config}
+    full = lift_cuboid(payload)["result"]
+    pose = lift_cuboid({**payload, "config": {**config, "outputProfile": "pose"}})
+    minimal = lift_cuboid({**payload, "config": {**config, "outputProfile": "minimal"}})
+
+    assert pose["profile"] == "pose" and "assumptions" not in pose
+    for key in ("anchorWorld", "baseCenterWorld", "centerWorld", "centerOffsetFromAnchorM", "yawDeg"):
+        assert pose["result"][key] == full[key]
+    assert pose["result"]["fit"]["evaluations"] == full["fit"]["evaluations"]
+    assert minimal["result"] == {
+        "baseCenterWorld": full["baseCenterWorld"],
+        "yawDeg": full["yawDeg"],
+        "fitErrorL1": full["fit"]["errorL1"],
+    }
+
+    sequence = {"camera": CAMERA, "object": SHELF, "frames": DETECTIONS, "config": {"outputProfile": "minimal"}}
+    output = lift_cuboid_sequence(sequence)
+    assert set(output) == {"status", "mode", "profile", "summary", "frames"}
+    full_frames = lift_cuboid_sequence({**sequence, "config": {}})["frames"]
+    assert [frame["smoothedPose"]["yawDeg"] for frame in output["frames"]] == [
+        frame["smoothedPose"]["yawDeg"] for frame in full_frames
+    ]
+    with pytest.raises(ValueError, match="outputProfile"):
+        lift_cuboid({**payload, "config": {"outputProfile": "tiny"}})
+
+
+def test_binary_records_round_trip():
+    from simula_geometry.cuboid_lift import lift_cuboid_result, lift_cuboid_sequence_result
+    from simula_geometry.lift_binary import RECORD_FIELDS, pack_lift_results, unpack_lift_results
+
+    frames = [dict(DETECTIONS[index % 3]) for index in range(5)]
+    payload = {"camera": CAMERA, "object": SHELF, "frames": frames, "config": {"smoothingAlpha": 0.5}}
+    result = lift_cuboid_sequence_result(payload)
+    fields, records = unpack_lift_results(pack_lift_results(result))
+    assert fields == RECORD_FIELDS and len(records) == 5
+    for frame, record in zip(result.to_dict()["frames"], records):
+        values = dict(zip(fields, record))
+        assert values["index"] == frame["index"]
+        assert [values["baseX"], values["baseY"], values["baseZ"]] == pytest.approx(
+            frame["raw"]["baseCenterWorld"], rel=1e-6, abs=1e-6
+        )
+        assert values["smoothedYawDeg"] == pytest.approx(frame["smoothedPose"]["yawDeg"], rel=1e-6, abs=1e-5)
+        # No fit: evaluation count is missing.
+        assert math.isnan(values["evaluations"])
+
+    single = lift_cuboid_result({"camera": CAMERA, "detection": DETECTIONS[0], "object": SHELF, "config": {"fitYawFromBBox": True}})
+    _, (record,) = unpack_lift_results(pack_lift_results(single))
+    assert record[fields.index("evaluations")] == single.stats.evaluations
+    with pytest.raises(ValueError, match="truncados"):
+        unpack_lift_results(pack_lift_results(result)[:-3])
+
+
+# ──────────────────────────────────────────────
+# Latency budget
+# ──────────────────────────────────────────────
+
+def test_grid_blocks_cover_grid_once():
+    from simula_geometry.cuboid_lift import grid_blocks
+
+    for rows, columns in [(1, 9), (5, 72), (13, 3)]:
+        for anytime in (False, True):
+            cells = [(row, column) for row, block in grid_blocks(rows, columns, anytime) for column in block]
+            assert sorted(cells) == [(row, column) for row in range(rows) for column in range(columns)]
+    # Coarse to fine: both ends of the range come before the middle fills in.
+    assert [column for _, block in grid_blocks(1, 9, True) for column in block] == [0, 8, 4, 2, 6, 1, 3, 5, 7]
+
+
+@pytest.mark.parametrize("strategy", ["grid", "coarse+local"])
+@pytest.mark.parametrize("fit_offset", [False, True])
+def test_generous_latency_budget_keeps_pose(strategy, fit_offset):
+    config = {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": fit_offset, "fitStrategy": strategy}
+    for detection in DETECTIONS:
+        payload = {"camera": CAMERA, "detection": detection, "object": SHELF}
+        expected = lift_cuboid({**payload, "config": config})["result"]
+        actual = lift_cuboid({**payload, "config": {**config, "latencyBudgetMs": 60000.0}})["result"]
+        assert actual["fit"].pop("latencyBudgetMs") == 60000.0
+        assert expected["fit"].pop("latencyBudgetMs") is None
+        assert actual["fit"]["searchCompleted"] is True
+        assert actual == expected
+
+
+def test_latency_budget_cuts_search_short():
+    config = {
+        "fitYawFromBBox": True,
+        "fitCenterOffsetFromBBox": True,
+        "yawSearchStepDeg": 0.5,
+        "centerOffsetStepM": 0.02,
+        "centerOffsetMinM": -2.0,
+        "centerOffsetMaxM": 2.0,
+        "latencyBudgetMs": 5.0,
+    }
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": SHELF, "config": config}
+    fit = lift_cuboid(payload)["result"]["fit"]
+    assert fit["searchCompleted"] is False
+    assert 0 < fit["evaluations"] < 10000
+    assert math.isfinite(fit["errorL1"])
+
+    hint_only = lift_cuboid({**payload, "config": {**config, "latencyBudgetMs": 0}})["result"]["fit"]
+    assert hint_only["evaluations"] == 1
+    assert hint_only["searchCompleted"] is False
+    with pytest.raises(ValueError, match="latencyBudgetMs"):
+        lift_cuboid({**payload, "config": {**config, "latencyBudgetMs": -1}})
+
+
+# ──────────────────────────────────────────────
+# Floor homography
+# ──────────────────────────────────────────────
+
+def test_floor_homography_matches_ray_path():
+    np = pytest.importorskip("numpy")
+    from simula_geometry.cuboid_lift import intersect_ray_with_floor
+    from simula_geometry.floor_homography import floor_to_uv, uv_to_floor
+
+    camera = {**CAMERA, "pitchDeg": -10.0}
+    uvs = [(u / 6.0, v / 6.0) for u in range(7) for v in range(7)]
+    xz, valid = uv_to_floor(camera, uvs, plane_y=0.3)
+    assert not valid.all() and valid.any()
+    for (u, v), point, ok in zip(uvs, xz, valid):
+        origin, direction = ray_from_uv(camera, u, v)
+        expected = intersect_ray_with_floor(origin, direction, 0.3)
+        assert ok == (expected is not None)
+        if ok:
+            assert point == pytest.approx([expected[0], expected[2]], abs=1e-9)
+
+    floor = [(0.5, 3.0), (-1.0, 6.0), (0.0, -4.0)]
+    uv, valid = floor_to_uv(camera, floor, plane_y=0.3)
+    for (x, z), projected, ok in zip(floor, uv, valid):
+        expected = project_world_point((x, 0.3, z), camera)
+        assert ok == (expected is not None)
+        if ok:
+            assert projected == pytest.approx(expected[:2], abs=1e-9)
+        else:
+            assert np.isnan(projected).all()
+
+
+def test_lift_cuboids_batch_homography_anchor_mapping():
+    pytest.importorskip("numpy")
+    from simula_geometry.vectorized import lift_cuboids_batch
+
+    objects = [SHELF, {**SHELF, "elevationM": 0.4}, SHELF]
+    expected = lift_cuboids_batch(CAMERA, DETECTIONS, objects)
+    actual = lift_cuboids_batch(CAMERA, DETECTIONS, objects, {"batchAnchorMapping": "homography"})
+    assert_nested_close(actual, expected, tol=1e-9)
+    with pytest.raises(ValueError, match="batchAnchorMapping"):
+        lift_cuboids_batch(CAMERA, DETECTIONS, SHELF, {"batchAnchorMapping": "lut"})
+
+
+# ──────────────────────────────────────────────
+# Temporal warm start
+# ──────────────────────────────────────────────
+
+def moving_shelf_frames(count):
+    camera = CameraModel(CAMERA)
+    frames = []
+    for index in range(count):
+        corners = oriented_box_corners(
+            center_x=0.3 + 0.01 * index,
+            center_z=3.5 + 0.005 * index,
+            width_m=1.2,
+            depth_m=0.5,
+            height_m=1.8,
+            yaw_deg=20.0 + 0.3 * index,
+            base_y_m=0.0,
+        )
+        frames.append(bbox_from_projected_corners(corners, camera))
+    return frames
+
+
+@pytest.mark.parametrize("fit_offset", [False, True])
+def test_warm_start_sequence_matches_cold_error_with_fewer_evaluations(fit_offset):
+    frames = moving_shelf_frames(12)
+    config = {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": fit_offset, "yawSearchStepDeg": 4.0}
+    payload = {"camera": CAMERA, "object": {"sizeM": SHELF["sizeM"]}, "frames": frames}
+    cold = lift_cuboid_sequence({**payload, "config": config})
+    warm = lift_cuboid_sequence({**payload, "config": {**config, "fitWarmStart": True, "warmStartRefreshFrames": 5}})
+
+    summary = warm["summary"]
+    assert summary["fullSweepFrames"] == 2 and summary["warmStartedFrames"] == 10
+    assert [frame["raw"]["fit"]["warmStart"] for frame in warm["frames"][:7]] == [False] + [True] * 5 + [False]
+    cold_evaluations = sum(frame["raw"]["fit"]["evaluations"] for frame in cold["frames"])
+    warm_evaluations = sum(frame["raw"]["fit"]["evaluations"] for frame in warm["frames"])
+    assert warm_evaluations * 2 < cold_evaluations
+    assert summary["fitErrorMeanL1"] <= cold["summary"]["fitErrorMeanL1"] * 1.05 + 1e-3
+
+
+def test_warm_start_falls_back_to_full_search():
+    frames = moving_shelf_frames(4)
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 5.0}
+    payload = {"camera": CAMERA, "object": {"sizeM": SHELF["sizeM"]}, "frames": frames}
+    cold = lift_cuboid_sequence({**payload, "config": config})
+    # A negative jump threshold rejects every warm fit.
+    warm = lift_cuboid_sequence({**payload, "config": {**config, "fitWarmStart": True, "warmStartErrorJump": -1.0}})
+
+    assert warm["summary"]["warmStartFallbacks"] == 3
+    for cold_frame, warm_frame in zip(cold["frames"], warm["frames"]):
+        assert warm_frame["raw"]["fit"].pop("evaluations") >= cold_frame["raw"]["fit"].pop("evaluations")
+        assert warm_frame["raw"] == cold_frame["raw"]
+
+
+def test_warm_start_error_baseline_does_not_creep():
+    # Each frame's bbox grows a little taller than the box can explain, so
+    # the warm fit error rises by less than the jump per frame but more than
+    # it in total.
+    frames = [{**bbox, "height": bbox["height"] + 0.006 * index} for index, bbox in enumerate(moving_shelf_frames(8))]
+    config = {
+        "fitYawFromBBox": True,
+        "yawSearchStepDeg": 5.0,
+        "fitWarmStart": True,
+        "warmStartErrorJump": 0.02,
+        "warmStartRefreshFrames": 100,
+    }
+    output = lift_cuboid_sequence({"camera": CAMERA, "object": {"sizeM": SHELF["sizeM"]}, "frames": frames, "config": config})
+
+    assert output["summary"]["warmStartFallbacks"] >= 1
+    sweep_error = None
+    for frame in output["frames"]:
+        fit = frame["raw"]["fit"]
+        if fit["warmStart"]:
+            assert fit["errorL1"] <= sweep_error + 0.02
+        else:
+            sweep_error = fit["errorL1"]
+
+
+# ──────────────────────────────────────────────
+# Multi-track sequences
+# ──────────────────────────────────────────────
+
+def test_multi_track_matches_per_track_sequences():
+    track_a = [{**bbox, "trackId": "a"} for bbox in moving_shelf_frames(5)]
+    track_b = [{**bbox, "trackId": "b"} for bbox in DETECTIONS]
+    interleaved = [track_a[0], track_b[0], track_a[1], track_a[2], track_b[1], track_a[3], track_b[2], track_a[4]]
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0, "smoothCenterAlpha": 0.5, "fitWarmStart": True}
+    payload = {"camera": CAMERA, "object": {"sizeM": SHELF["sizeM"]}}
+
+    combined = lift_cuboid_sequence({**payload, "frames": interleaved, "config": {**config, "multiTrack": True}})
+    assert [frame["index"] for frame in combined["frames"]] == list(range(len(interleaved)))
+    assert combined["summary"]["trackCount"] == 2
+
+    for track in (track_a, track_b):
+        alone = lift_cuboid_sequence({**payload, "frames": track, "config": config})
+        picked = [frame for frame in combined["frames"] if frame["trackId"] == track[0]["trackId"]]
+        assert [frame["smoothedPose"] for frame in picked] == [frame["smoothedPose"] for frame in alone["frames"]]
+
+
+def test_multi_track_evicts_idle_tracks():
+    frames = [{**DETECTIONS[0], "trackId": "a"}] + [{**DETECTIONS[1], "trackId": "b"}] * 3 + [{**DETECTIONS[2], "trackId": "a"}]
+    config = {"smoothCenterAlpha": 0.5, "multiTrack": True, "trackIdleEvictFrames": 2}
+    output = lift_cuboid_sequence({"camera": CAMERA, "object": SHELF, "frames": frames, "config": config})
+
+    summary = output["summary"]
+    assert summary["evictedTrackCount"] == 1 and summary["trackCount"] == 3
+    # "a" came back after eviction, so its smoothing restarted from the raw pose.
+    last = output["frames"][-1]
+    assert last["smoothedPose"]["baseCenterWorld"] == last["raw"]["baseCenterWorld"]
+
+
+# ──────────────────────────────────────────────
+# Streaming
+# ──────────────────────────────────────────────
+
+def test_stream_matches_batch_and_is_lazy():
+    frames = [{**bbox, "timestamp": f"t{index}"} for index, bbox in enumerate(moving_shelf_frames(4))]
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0, "smoothCenterAlpha": 0.5}
+    batch = lift_cuboid_sequence({"camera": CAMERA, "object": SHELF, "frames": frames, "config": config})
+
+    consumed = []
+
+    def records():
+        yield {"camera": CAMERA, "object": SHELF, "config": config}
+        for frame in frames:
+            consumed.append(frame)
+            yield frame
+
+    stream = lift_cuboid_stream(records())
+    assert next(stream) == batch["frames"][0]
+    assert len(consumed) == 1
+    rest = list(stream)
+    assert rest[:-1] == batch["frames"][1:]
+    batch["summary"].pop("workers")
+    assert rest[-1] == {"status": "ok", "mode": "stream", "summary": batch["summary"]}
+
+
+def test_stream_reports_bad_records_and_continues():
+    lines = [
+        json.dumps({"camera": CAMERA, "object": SHELF}),
+        "",
+        "not json",
+        "[1, 2]",
+        json.dumps({"frames": [DETECTIONS[0], DETECTIONS[1]], "config": {"smoothCenterAlpha": 0.5}}),
+    ]
+    output = list(lift_cuboid_stream(read_ndjson(lines)))
+    assert output[0] == {"status": "error", "record": 1, "error": "JSON invalido en la linea 3: Expecting value (columna 1)"}
+    assert output[1] == {"status": "error", "record": 2, "error": "cada registro debe ser un objeto JSON"}
+    assert [record["index"] for record in output[2:4]] == [0, 1]
+    assert output[-1]["summary"]["frameCount"] == 2
+
+    assert list(lift_cuboid_stream([DETECTIONS[0]])) == [
+        {"status": "error", "record": 0, "error": "el primer registro debe traer camera y object"},
+        {"status": "ok", "mode": "stream", "summary": {"frameCount": 0}},
+    ]
+
+
+# ──────────────────────────────────────────────
+# JSON-RPC server
+# ──────────────────────────────────────────────
+
+def test_lift_service_dispatch_and_camera_cache():
+    from simula_geometry.lift_server import METHOD_NOT_FOUND, INVALID_PARAMS, LiftService
+
+    service = LiftService()
+    payload = {"camera": CAMERA, "detection": DETECTIONS[0], "object": SHELF, "config": {}}
+    for request_id in (1, 2):
+        response = service.handle({"jsonrpc": "2.0", "id": request_id, "method": "lift_cuboid", "params": payload})
+        assert response == {"jsonrpc": "2.0", "id": request_id, "result": lift_cuboid(payload)}
+    assert (service.cameras.hits, service.cameras.misses) == (1, 1)
+
+    unknown = service.handle({"jsonrpc": "2.0", "id": 3, "method": "nope"})
+    assert unknown["error"]["code"] == METHOD_NOT_FOUND
+    invalid = service.handle({"jsonrpc": "2.0", "id": 4, "method": "lift_cuboid", "params": {"detection": {}}})
+    assert invalid["error"]["code"] == INVALID_PARAMS
+    assert service.handle({"jsonrpc": "2.0", "method": "ping"}) is None
+
+
+def test_lift_server_unix_socket_concurrent_clients(tmp_path):
+    import socket
+    import threading
+
+    from simula_geometry.lift_server import LiftService, make_unix_server
+
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("no Unix sockets")
+    path = str(tmp_path / "lift.sock")
+    server = make_unix_server(LiftService(), path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        clients = []
+        for index, detection in enumerate(DETECTIONS):
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(path)
+            params = {"camera": CAMERA, "detection": detection, "object": SHELF}
+            request = {"jsonrpc": "2.0", "id": index, "method": "lift_cuboid", "params": params}
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            clients.append((client, params))
+        for index, (client, params) in enumerate(clients):
+            with client, client.makefile("r", encoding="utf-8") as reader:
+                response = json.loads(reader.readline())
+            assert response["id"] == index
+            assert response["result"] == lift_cuboid(params)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_lift_server_unix_socket_replaces_only_stale_sockets(tmp_path):
+    import socket
+
+    from simula_geometry.lift_server import LiftService, make_unix_server
+
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("no Unix sockets")
+    regular = tmp_path / "lift.sock"
+    regular.write_text("keep me", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        make_unix_server(LiftService(), str(regular))
+    assert regular.read_text(encoding="utf-8") == "keep me"
+
+    stale = str(tmp_path / "stale.sock")
+    make_unix_server(LiftService(), stale).server_close()
+    server = make_unix_server(LiftService(), stale)
+    server.server_close()
+
+
+# ──────────────────────────────────────────────
+# Parallel sequences
+# ──────────────────────────────────────────────
+
+def test_parallel_sequence_matches_serial():
+    frames = [{**bbox, "trackId": index % 2} for index, bbox in enumerate(moving_shelf_frames(6))]
+    frames.insert(2, {"note": "no detection"})
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0, "smoothCenterAlpha": 0.5, "multiTrack": True}
+    payload = {"camera": CAMERA, "object": SHELF, "frames": frames}
+
+    serial = lift_cuboid_sequence({**payload, "config": config})
+    parallel = lift_cuboid_sequence({**payload, "config": {**config, "workers": 2, "workerChunkSize": 2}})
+    assert (serial["summary"].pop("workers"), parallel["summary"].pop("workers")) == (1, 2)
+    assert parallel == serial
+
+    # Warm-started frames depend on their predecessor, so they stay serial.
+    warm = lift_cuboid_sequence({**payload, "config": {**config, "workers": 2, "fitWarmStart": True}})
+    assert warm["summary"]["workers"] == 1
+
+
+# ──────────────────────────────────────────────
+# Columnar recordings
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("suffix", [".npy", ".npz"])
+def test_columnar_recording_matches_json_sequence(tmp_path, suffix):
+    np = pytest.importorskip("numpy")
+    from simula_geometry.columnar import lift_columnar_result, load_columnar, save_columnar
+
+    frames = [{**bbox, "trackId": index % 2} for index, bbox in enumerate(moving_shelf_frames(6))]
+    frames[3]["anchorUV"] = [0.45, 0.7]
+    frames.insert(2, {"note": "no detection"})
+    rows = []
+    for index, frame in enumerate(frames):
+        anchor = frame.get("anchorUV", [math.nan, math.nan])
+        bbox = [frame.get(key, math.nan) for key in ("x", "y", "width", "height")]
+        rows.append([index * 0.04, frame.get("trackId", math.nan), *bbox, *anchor])
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0, "smoothCenterAlpha": 0.5, "multiTrack": True, "fitWarmStart": True}
+    path = str(tmp_path / f"recording{suffix}")
+    save_columnar(path, np.array(rows), CAMERA, SHELF, config)
+
+    recording = load_columnar(path)
+    if suffix == ".npy":
+        assert isinstance(recording.rows, np.memmap)
+    output = lift_columnar_result(recording).to_dict()
+    expected = lift_cuboid_sequence({"camera": CAMERA, "object": SHELF, "frames": frames, "config": config})
+    assert [frame.pop("timestamp") for frame in output["frames"]] == [index * 0.04 for index in (0, 1, 3, 4, 5, 6)]
+    for frame in expected["frames"]:
+        del frame["timestamp"]
+    assert output == expected
+
+
+# ──────────────────────────────────────────────
+# Trajectory smoothing
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("alpha_yaw", [0.3, 0.02])
+def test_causal_trajectory_smoothing_matches_step_filter(alpha_yaw):
+    np = pytest.importorskip("numpy")
+    from simula_geometry.cuboid_lift import smooth_pose_step
+    from simula_geometry.smoothing import smooth_trajectory
+
+    rng = np.random.default_rng(7)
+    count = 2000
+    center_x = np.cumsum(rng.normal(0.0, 0.05, count))
+    center_z = 3.0 + rng.normal(0.0, 0.2, count)
+    # Slow spin across the +-180 seam; with alpha_yaw 0.02 a half-turn flip
+    # leaves the smoothed yaw >= 180 degrees behind, forcing the step-by-step path.
+    yaw = (np.arange(count) * 0.7 + rng.normal(0.0, 2.0, count) + 180.0) % 360.0 - 180.0
+    yaw[1500:] = (yaw[1500:] + 360.0) % 360.0 - 180.0
+
+    smoothed = smooth_trajectory(center_x, center_z, yaw, 0.25, alpha_yaw)
+    state = None
+    for position in range(count):
+        state = smooth_pose_step(state, float(center_x[position]), float(center_z[position]), float(yaw[position]), 0.25, alpha_yaw)
+        assert smoothed[0][position] == pytest.approx(state["centerX"], abs=1e-9)
+        assert smoothed[1][position] == pytest.approx(state["centerZ"], abs=1e-9)
+        assert abs((smoothed[2][position] - state["yawDeg"] + 180.0) % 360.0 - 180.0) < 1e-9
+
+
+def test_zero_lag_sequence_smoothing():
+    pytest.importorskip("numpy")
+    frames = [{**bbox, "trackId": index % 2} for index, bbox in enumerate(moving_shelf_frames(40))]
+    config = {"fitYawFromBBox": True, "yawSearchStepDeg": 6.0, "smoothCenterAlpha": 0.3, "multiTrack": True}
+    payload = {"camera": CAMERA, "object": SHELF, "frames": frames}
+
+    causal = lift_cuboid_sequence({**payload, "config": config})
+    zero_lag = lift_cuboid_sequence({**payload, "config": {**config, "smoothingMode": "zero-lag"}})
+    assert zero_lag["smoothing"]["mode"] == "zero-lag"
+    assert [frame["raw"] for frame in zero_lag["frames"]] == [frame["raw"] for frame in causal["frames"]]
+
+    def lag(output):
+        # The shelf moves steadily along +x, so a causal EMA trails it.
+        return sum(
+            frame["smoothedPose"]["baseCenterWorld"][0] - frame["raw"]["baseCenterWorld"][0] for frame in output["frames"]
+        )
+
+    assert lag(causal) < -0.01
+    assert abs(lag(zero_lag)) < abs(lag(causal)) / 4
+
+    records = list(lift_cuboid_stream([{**payload, "config": {**config, "smoothingMode": "zero-lag"}}]))
+    assert records[0]["status"] == "error" and "smoothingMode" in records[0]["error"]
+
+
+# ──────────────────────────────────────────────
+# Lift cache
+# ──────────────────────────────────────────────
+
+def test_lift_cache_reuses_raw_lifts_across_smoothing_changes():
+    from simula_geometry.lift_cache import LiftCache
+
+    frames = [{**bbox, "trackId": index % 2} for index, bbox in enumerate(moving_shelf_frames(8))]
+    frames[5] = {**DETECTIONS[2], "trackId": 1}  # forces a warm-start fallback
+    config = {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": True, "yawSearchStepDeg": 6.0, "multiTrack": True, "fitWarmStart": True}
+    payload = {"camera": CAMERA, "object": SHELF, "frames": frames}
+    cache = LiftCache()
+
+    first = lift_cuboid_sequence({**payload, "config": config}, cache)
+    assert first["summary"]["liftCache"]["hits"] == 0 and first["summary"]["warmStartFallbacks"] >= 1
+    for alpha in (0.2, 0.5, 1.0):
+        swept = {**config, "smoothCenterAlpha": alpha}
+        cached = lift_cuboid_sequence({**payload, "config": swept}, cache)
+        assert cached["summary"].pop("liftCache") == {"hits": len(frames) + 1, "misses": 0}
+        assert cached == lift_cuboid_sequence({**payload, "config": swept})
+
+    changed = lift_cuboid_sequence({**payload, "config": {**config, "yawSearchStepDeg": 4.0}}, cache)
+    assert changed["summary"]["liftCache"]["hits"] == 0
+
+
+def test_lift_cache_directory_is_shared_between_instances(tmp_path):
+    from simula_geometry.lift_cache import LiftCache
+
+    payload = {"camera": CAMERA, "object": SHELF, "frames": moving_shelf_frames(4), "config": {"fitYawFromBBox": True}}
+    first = lift_cuboid_sequence(payload, LiftCache(str(tmp_path)))
+    assert len(list(tmp_path.glob("*/*.pickle"))) == 4
+
+    reloaded = LiftCache(str(tmp_path))
+    second = lift_cuboid_sequence(payload, reloaded)
+    assert second["summary"].pop("liftCache") == {"hits": 4, "misses": 0}
+    first["summary"].pop("liftCache")
+    assert second == first
+
+    budgeted = {**payload, "config": {"fitYawFromBBox": True, "latencyBudgetMs": 1000.0}}
+    assert lift_cuboid_sequence(budgeted, reloaded)["summary"]["liftCache"] == {"hits": 0, "misses": 0}
+
+
+# ──────────────────────────────────────────────
+# Stage timing
+# ──────────────────────────────────────────────
+
+def test_collect_timing_adds_stage_block_without_changing_the_lift():
+    from simula_geometry.cuboid_lift import TIMING_STAGES
+
+    config = {"fitYawFromBBox": True, "fitCenterOffsetFromBBox": True, "yawSearchStepDeg": 6.0}
+    payload = {"camera": CAMERA, "detection": DETECTIONS[1], "object": SHELF, "config": config}
+    plain = lift_cuboid(payload)
+    timed = lift_cuboid({**payload, "config": {**config, "collectTiming": True}})
+    timing = timed["result"].pop("timing")
+    assert timed == plain and "timing" not in plain["result"]
+
+    assert list(timing["stagesMs"]) == list(TIMING_STAGES)
+    assert all(value >= 0.0 for value in timing["stagesMs"].values())
+    assert timing["stagesMs"]["coarseGrid"] > 0.0 and timing["stagesMs"]["fineGrid"] > 0.0
+    assert timing["totalMs"] == pytest.approx(sum(timing["stagesMs"].values()))
+    assert timing["evaluations"] == plain["result"]["fit"]["evaluations"]
+    pruned_rows = (timing["projections"] - 8 * timing["evaluations"]) / 10
+    assert pruned_rows >= 0 and pruned_rows.is_integer()
+
+    unfitted = lift_cuboid({**payload, "config": {"collectTiming": True, "outputProfile": "minimal"}})
+    assert unfitted["result"]["timing"]["evaluations"] == 0
+    assert unfitted["result"]["timing"]["projections"] == 8
+
+
+def test_sequence_timing_totals_frames_and_skips_the_cache():
+    from simula_geometry.lift_cache import LiftCache
+
+    config = {"fitYawFromBBox": True, "fitWarmStart": True, "collectTiming": True, "outputProfile": "pose"}
+    payload = {"camera": CAMERA, "object": SHELF, "frames": moving_shelf_frames(6), "config": config}
+    output = lift_cuboid_sequence(payload, LiftCache())
+    frame_timings = [frame["raw"].pop("timing") for frame in output["frames"]]
+    summary = output["summary"]
+    assert summary["liftCache"] == {"hits": 0, "misses": 0}
+    assert summary["timing"]["evaluations"] == sum(timing["evaluations"] for timing in frame_timings)
+    assert summary["timing"]["evaluations"] == sum(frame["raw"]["fit"]["evaluations"] for frame in output["frames"])
+    for stage, total in summary["timing"]["stagesMs"].items():
+        assert total == pytest.approx(sum(timing["stagesMs"][stage] for timing in frame_timings))
+    assert summary["timing"]["stagesMs"]["output"] > 0.0
+
+    untimed = lift_cuboid_sequence({**payload, "config": {**config, "collectTiming": False}})
+    assert "timing" not in untimed["summary"]
+    summary.pop("timing")
+    summary.pop("liftCache")
+    assert output == untimed
+
+
+def test_profile_breakdown_table():
+    from simula_geometry.cuboid_lift import profile_breakdown
+
+    timing = {
+        "stagesMs": {"parse": 1.0, "ray": 1.0, "coarseGrid": 6.0, "fineGrid": 2.0, "output": 0.0},
+        "totalMs": 10.0,
+        "evaluations": 40,
+        "projections": 320,
+    }
+    lines = profile_breakdown(timing, 4).splitlines()
+    assert lines[3].split() == ["coarseGrid", "6.000", "1.5000", "60.0%"]
+    assert lines[6].split() == ["total", "10.000", "2.5000", "100.0%"]
+    assert lines[7] == "lifts 4  evaluations 40  projections 320"
+
+
+# ──────────────────────────────────────────────
+# Benchmarks
+# ──────────────────────────────────────────────
+
+def test_synthetic_scenes_are_reproducible_and_visible():
+    from simula_geometry.synthetic import synthetic_scenes, synthetic_sequence_payload
+
+    scenes = synthetic_scenes(7, 5)
+    again = synthetic_scenes(7, 5)
+    assert [scene.payloads() for scene in scenes] == [scene.payloads() for scene in again]
+    for scene in scenes:
+        assert 1 <= len(scene.detections) <= 8
+        for payload in scene.payloads({"fitYawFromBBox": True}):
+            lift_cuboid(payload)
+
+    payload, truth = synthetic_sequence_payload(3, 12, bbox_noise=0.002)
+    assert len(payload["frames"]) == len(truth) == 12
+    assert synthetic_sequence_payload(3, 12, bbox_noise=0.002)[0] == payload
+
+
+def test_bench_report_and_baseline_comparison():
+    from simula_geometry.bench import compare_results, run_benchmarks
+
+    report = run_benchmarks(["single", "yaw-fit", "batch"], seed=1, scale=0.01)
+    assert set(report["cases"]) == {"single", "yaw-fit", "batch"}
+    for case in report["cases"].values():
+        assert case["p50Ms"] <= case["p90Ms"] <= case["p99Ms"] <= case["maxMs"]
+        assert case["liftsPerSecond"] > 0
+    assert report["cases"]["single"]["evaluationsMean"] is None
+    assert report["cases"]["yaw-fit"]["evaluationsMean"] > 0
+    assert compare_results(report, report) == []
+
+    slower = json.loads(json.dumps(report))
+    slower["cases"]["yaw-fit"]["p50Ms"] *= 2.0
+    slower["cases"]["batch"]["evaluationsMean"] *= 1.5
+    del slower["cases"]["single"]
+    regressions = compare_results(slower, report)
+    assert [message.split(":")[0] for message in regressions] == ["single", "yaw-fit", "batch"]
+    assert compare_results(slower, report, tolerance=1.5)[1:] == [regressions[2]]
+    assert compare_results({**slower, "seed": 2}, report, tolerance=1.5) == regressions[:1]
+
+
+def test_fit_sweep_frontier_and_recommendation():
+    from simula_geometry.fit_sweep import pareto_frontier, recommend_setting, run_sweep, yaw_error_deg
+
+    assert yaw_error_deg(179.0, -1.0, 180.0) == pytest.approx(0.0)
+    assert yaw_error_deg(100.0, 10.0, 180.0) == pytest.approx(90.0)
+    assert yaw_error_deg(-44.0, 44.0, 90.0) == pytest.approx(2.0)
+
+    rows = [
+        {"msPerLift": 1.0, "yawErrorMeanDeg": 9.0, "centerErrorMeanM": 0.3},
+        {"msPerLift": 2.0, "yawErrorMeanDeg": 9.0, "centerErrorMeanM": 0.3},
+        {"msPerLift": 4.0, "yawErrorMeanDeg": 2.0, "centerErrorMeanM": 0.1},
+        {"msPerLift": 3.0, "yawErrorMeanDeg": 5.0, "centerErrorMeanM": 0.05},
+    ]
+    assert pareto_frontier(rows) == [rows[0], rows[3], rows[2]]
+    assert recommend_setting(pareto_frontier(rows), 3.5) is rows[3]
+    assert recommend_setting(pareto_frontier(rows), 0.5) is None
+
+    report = run_sweep(seed=2, detections=3, yaw_steps=(8.0, 16.0), offset_steps=(0.16,), range_fractions=(0.5,), budget_ms=1e6)
+    assert [row["yawSearchStepDeg"] for row in report["settings"]] == [8.0, 16.0]
+    assert report["detections"] == 3 and report["frontier"]
+    assert all(row in report["settings"] for row in report["frontier"])
+    assert report["recommended"] in report["frontier"]
+    for row in report["settings"]:
+        assert 0.0 <= row["yawErrorMeanDeg"] <= 90.0 and row["centerErrorMeanM"] >= 0.0
+
+
+# ──────────────────────────────────────────────
+# Many-payload runs
+# ──────────────────────────────────────────────
+
+def write_payload_files(directory):
+    payloads = {
+        f"cam{index}.json": {"camera": CAMERA, "detection": detection, "object": SHELF}
+        for index, detection in enumerate(DETECTIONS)
+    }
+    for name, payload in payloads.items():
+        (directory / name).write_text(json.dumps(payload), encoding="utf-8")
+    (directory / "broken.json").write_text("{", encoding="utf-8")
+    return payloads
+
+
+def test_resolve_payload_paths(tmp_path):
+    from simula_geometry.lift_files import resolve_payload_paths
+
+    write_payload_files(tmp_path)
+    names = ["broken.json", "cam0.json", "cam1.json", "cam2.json"]
+    assert resolve_payload_paths(str(tmp_path)) == [str(tmp_path / name) for name in names]
+    assert resolve_payload_paths(str(tmp_path / "cam*.json")) == [str(tmp_path / name) for name in names[1:]]
+    (tmp_path / "list.txt").write_text("# nightly\ncam2.json\n\ncam0.json\n", encoding="utf-8")
+    assert resolve_payload_paths(manifest_path=str(tmp_path / "list.txt")) == [
+        str(tmp_path / "cam2.json"),
+        str(tmp_path / "cam0.json"),
+    ]
+    with pytest.raises(ValueError):
+        resolve_payload_paths(str(tmp_path / "*.yaml"))
+
+    # Results written next to the inputs are not picked up as inputs.
+    (tmp_path / "cam0.out.json").write_text("{}", encoding="utf-8")
+    assert resolve_payload_paths(str(tmp_path)) == [str(tmp_path / name) for name in names]
+    assert resolve_payload_paths(str(tmp_path / "cam*.json")) == [str(tmp_path / name) for name in names[1:]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_payload_files(tmp_path, workers):
+    import io
+
+    from simula_geometry.lift_files import resolve_payload_paths, run_payload_files
+
+    payloads = write_payload_files(tmp_path)
+    paths = resolve_payload_paths(str(tmp_path))
+
+    out = io.StringIO()
+    summary = run_payload_files(paths, workers=workers, ndjson_out=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["input"] for record in records] == paths
+    assert records[0]["status"] == "error"
+    for record in records[1:]:
+        assert record["output"] == lift_cuboid(payloads[record["input"].rsplit("/", 1)[-1]])
+    assert summary["status"] == "partial"
+    assert (summary["summary"]["okCount"], summary["summary"]["failureCount"]) == (3, 1)
+    assert summary["failures"][0]["input"] == paths[0]
+
+    output_dir = tmp_path / "out"
+    run_payload_files(paths[1:], workers=workers, output_dir=str(output_dir))
+    written = json.loads((output_dir / "cam1.out.json").read_text(encoding="utf-8"))
+    assert written == lift_cuboid(payloads["cam1.json"])
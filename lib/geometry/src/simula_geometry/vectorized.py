@@ -0,0 +1,504 @@
+"""
+NumPy kernels for cuboid lifting.
+
+Array versions of the scalar helpers in cuboid_lift.py. Every kernel keeps
+the operation order of its scalar counterpart so a float64 run reproduces
+the per-detection results of lift_cuboid.
+
+Requires numpy (pip install "simula-geometry[numpy]").
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Sequence
+
+import numpy as np
+
+if __package__:
+    from .floor_homography import floor_homography
+    from .cuboid_lift import (
+        CameraModel,
+        FitSettings,
+        FitStats,
+        build_fit_block,
+        build_lift_output,
+        camera_model,
+        clamp01,
+        fit_pose,
+        get_number,
+        lap_stage,
+        parse_anchor_uv,
+        parse_bbox,
+        parse_object_size,
+        select_equivalent_yaw,
+        yaw_sweep_indices,
+    )
+else:  # script mode: cuboid_lift.py run directly
+    from floor_homography import floor_homography
+    from cuboid_lift import (
+        CameraModel,
+        FitSettings,
+        FitStats,
+        build_fit_block,
+        build_lift_output,
+        camera_model,
+        clamp01,
+        fit_pose,
+        get_number,
+        lap_stage,
+        parse_anchor_uv,
+        parse_bbox,
+        parse_object_size,
+        select_equivalent_yaw,
+        yaw_sweep_indices,
+    )
+
+
+ANCHOR_MAPPINGS = ("ray", "homography")
+
+# (sign_w, sign_d) per footprint corner, same order as oriented_box_corners.
+_FOOTPRINT_SIGNS = ((-1.0, -1.0), (1.0, -1.0), (1.0, 1.0), (-1.0, 1.0))
+
+
+def resolve_dtype(value: Any) -> np.dtype:
+    if value is None:
+        return np.dtype(np.float64)
+    dtype = np.dtype(value)
+    if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        raise ValueError("dtype debe ser float32 o float64")
+    return dtype
+
+
+class ArrayCamera:
+    """Camera constants as dtype scalars, resolved once per batch."""
+
+    __slots__ = ("dtype", "origin", "right", "up", "forward", "tan_half_v", "aspect")
+
+    def __init__(self, camera: dict[str, Any] | CameraModel, dtype: np.dtype):
+        model = camera_model(camera)
+        self.dtype = dtype
+        self.origin = np.asarray(model.origin, dtype=dtype)
+        self.right = np.asarray(model.right, dtype=dtype)
+        self.up = np.asarray(model.up, dtype=dtype)
+        self.forward = np.asarray(model.forward, dtype=dtype)
+        self.tan_half_v = dtype.type(model.tan_half_v)
+        self.aspect = dtype.type(model.aspect)
+
+
+def _dot3(x: np.ndarray, y: np.ndarray, z: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    return x * axis[0] + y * axis[1] + z * axis[2]
+
+
+def rays_from_uv(cam: ArrayCamera, uv: np.ndarray) -> np.ndarray:
+    """(N, 2) anchor UVs -> (N, 3) normalized world directions."""
+    u = np.clip(uv[:, 0], 0.0, 1.0)
+    v = np.clip(uv[:, 1], 0.0, 1.0)
+    x_ndc = (u * 2.0) - 1.0
+    y_ndc = 1.0 - (v * 2.0)
+    x_cam = x_ndc * cam.tan_half_v * cam.aspect
+    y_cam = y_ndc * cam.tan_half_v
+    z_cam = cam.dtype.type(1.0)
+
+    direction = np.empty((uv.shape[0], 3), dtype=cam.dtype)
+    for axis in range(3):
+        direction[:, axis] = cam.right[axis] * x_cam + cam.up[axis] * y_cam + cam.forward[axis] * z_cam
+    length = np.sqrt(direction[:, 0] * direction[:, 0] + direction[:, 1] * direction[:, 1] + direction[:, 2] * direction[:, 2])
+    degenerate = length <= 1e-9
+    safe_length = np.where(degenerate, 1.0, length)
+    direction = direction / safe_length[:, None]
+    direction[degenerate] = 0.0
+    return direction
+
+
+def intersect_rays_with_floor(origin: np.ndarray, directions: np.ndarray, floor_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Intersect rays sharing one origin with per-ray floor heights.
+
+    Returns (points, valid); rows with valid == False match the None cases of
+    intersect_ray_with_floor (ray parallel to floor or plane behind camera).
+    """
+    dy = directions[:, 1]
+    parallel = np.abs(dy) <= 1e-9
+    safe_dy = np.where(parallel, 1.0, dy)
+    t = (floor_y - origin[1]) / safe_dy
+    valid = ~parallel & (t > 0.0)
+    points = origin[None, :] + directions * t[:, None]
+    return points, valid
+
+
+def anchors_via_homography(
+    camera: CameraModel,
+    uv: np.ndarray,
+    plane_y: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same contract as rays_from_uv + intersect_rays_with_floor, through the
+    cached floor homography of each distinct plane height.
+    """
+    points = np.empty((uv.shape[0], 3), dtype=np.float64)
+    valid = np.zeros(uv.shape[0], dtype=bool)
+    for plane in np.unique(plane_y).tolist():
+        rows = plane_y == plane
+        xz, rows_valid = floor_homography(camera, plane).uv_to_floor(uv[rows])
+        points[rows, 0] = xz[:, 0]
+        points[rows, 1] = plane
+        points[rows, 2] = xz[:, 1]
+        valid[rows] = rows_valid
+    return points.astype(uv.dtype, copy=False), valid
+
+
+def box_corners(
+    center_x: np.ndarray,
+    center_z: np.ndarray,
+    width: np.ndarray,
+    depth: np.ndarray,
+    height: np.ndarray,
+    yaw_deg: np.ndarray,
+    base_y: np.ndarray,
+) -> np.ndarray:
+    """
+    Broadcasting version of oriented_box_corners.
+
+    Inputs broadcast against each other to a common shape S; returns S + (8, 3)
+    with the same corner order (footprint corner i at 2i, its top at 2i + 1).
+    """
+    center_x, center_z, width, depth, height, yaw_deg, base_y = np.broadcast_arrays(
+        center_x, center_z, width, depth, height, yaw_deg, base_y
+    )
+    half_w = width * 0.5
+    half_d = depth * 0.5
+    yaw = yaw_deg * math.pi / 180.0
+    c = np.cos(yaw)
+    s = np.sin(yaw)
+    top_y = base_y + height
+
+    corners = np.empty(center_x.shape + (8, 3), dtype=center_x.dtype)
+    for index, (sign_w, sign_d) in enumerate(_FOOTPRINT_SIGNS):
+        lx = half_w * sign_w
+        lz = half_d * sign_d
+        world_x = center_x + lx * c - lz * s
+        world_z = center_z + lx * s + lz * c
+        corners[..., 2 * index, 0] = world_x
+        corners[..., 2 * index, 1] = base_y
+        corners[..., 2 * index, 2] = world_z
+        corners[..., 2 * index + 1, 0] = world_x
+        corners[..., 2 * index + 1, 1] = top_y
+        corners[..., 2 * index + 1, 2] = world_z
+    return corners
+
+
+def project_points(points: np.ndarray, cam: ArrayCamera) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project (..., 3) world points. Returns (u, v, visible) with the shape of
+    points[..., 0]; u/v are meaningless where visible is False.
+    """
+    rel_x = points[..., 0] - cam.origin[0]
+    rel_y = points[..., 1] - cam.origin[1]
+    rel_z = points[..., 2] - cam.origin[2]
+    x_cam = _dot3(rel_x, rel_y, rel_z, cam.right)
+    y_cam = _dot3(rel_x, rel_y, rel_z, cam.up)
+    z_cam = _dot3(rel_x, rel_y, rel_z, cam.forward)
+    visible = z_cam > 1e-5
+    safe_z = np.where(visible, z_cam, 1.0)
+    x_ndc = x_cam / (safe_z * cam.tan_half_v * cam.aspect)
+    y_ndc = y_cam / (safe_z * cam.tan_half_v)
+    u = (x_ndc + 1.0) * 0.5
+    v = (1.0 - y_ndc) * 0.5
+    return u, v, visible
+
+
+def projected_bboxes(corners: np.ndarray, cam: ArrayCamera) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized bbox_from_projected_corners over (..., 8, 3) corners.
+
+    Returns (bboxes, valid): bboxes is (..., 4) as x, y, width, height and
+    valid marks rows where the scalar helper would not return None.
+    """
+    u, v, visible = project_points(corners, cam)
+    any_visible = visible.any(axis=-1)
+    min_u = np.where(visible, u, np.inf).min(axis=-1)
+    max_u = np.where(visible, u, -np.inf).max(axis=-1)
+    min_v = np.where(visible, v, np.inf).min(axis=-1)
+    max_v = np.where(visible, v, -np.inf).max(axis=-1)
+    min_u = np.clip(min_u, 0.0, 1.0)
+    max_u = np.clip(max_u, 0.0, 1.0)
+    min_v = np.clip(min_v, 0.0, 1.0)
+    max_v = np.clip(max_v, 0.0, 1.0)
+    valid = any_visible & (max_u > min_u) & (max_v > min_v)
+    bboxes = np.stack([min_u, min_v, max_u - min_u, max_v - min_v], axis=-1)
+    return bboxes, valid
+
+
+def bbox_fit_errors(observed: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Vectorized bbox_fit_error over (..., 4) x/y/width/height arrays."""
+    obs_cx = observed[..., 0] + observed[..., 2] * 0.5
+    obs_cy = observed[..., 1] + observed[..., 3] * 0.5
+    pred_cx = predicted[..., 0] + predicted[..., 2] * 0.5
+    pred_cy = predicted[..., 1] + predicted[..., 3] * 0.5
+    e_center = np.abs(obs_cx - pred_cx) + np.abs(obs_cy - pred_cy)
+    e_size = np.abs(observed[..., 2] - predicted[..., 2]) + np.abs(observed[..., 3] - predicted[..., 3])
+    return e_center * 2.0 + e_size
+
+
+def fit_yaw_vectorized(
+    camera: dict[str, Any] | CameraModel,
+    observed_bbox: dict[str, float],
+    anchor_world: tuple[float, float, float],
+    size: dict[str, float],
+    floor_y: float,
+    elevation_m: float,
+    coarse_step_deg: float,
+    yaw_hint_deg: float | None,
+    symmetry_period_deg: float = 360.0,
+    reference_yaw_deg: float | None = None,
+    stats: FitStats | None = None,
+) -> tuple[float, float, dict[str, float] | None]:
+    """
+    fit_yaw_from_bbox with each search pass evaluated as one (N, 8) corner tensor.
+
+    Candidate grids, tie-breaking (first strictly better candidate wins) and
+    the returned (yaw, error, bbox) tuple match the scalar fitter.
+    """
+    cam = ArrayCamera(camera, np.dtype(np.float64))
+    observed = np.asarray(
+        [observed_bbox["x"], observed_bbox["y"], observed_bbox["width"], observed_bbox["height"]],
+        dtype=np.float64,
+    )
+    base_y = floor_y + elevation_m
+
+    def eval_yaws(yaws: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if stats is not None:
+            stats.evaluations += int(yaws.shape[0])
+        corners = box_corners(
+            np.float64(anchor_world[0]),
+            np.float64(anchor_world[2]),
+            np.float64(size["width"]),
+            np.float64(size["depth"]),
+            np.float64(size["height"]),
+            yaws,
+            np.float64(base_y),
+        )
+        bboxes, valid = projected_bboxes(corners, cam)
+        errors = np.where(valid, bbox_fit_errors(observed, bboxes), np.inf)
+        return errors, bboxes
+
+    best_yaw = yaw_hint_deg if yaw_hint_deg is not None else 0.0
+    hint_errors, hint_bboxes = eval_yaws(np.asarray([best_yaw], dtype=np.float64))
+    best_error = float(hint_errors[0])
+    best_row = hint_bboxes[0] if math.isfinite(best_error) else None
+
+    step = max(0.25, coarse_step_deg)
+    sweep = yaw_sweep_indices(step, symmetry_period_deg)
+    yaws = -180.0 + np.arange(sweep.start, sweep.stop, dtype=np.float64) * step
+    errors, bboxes = eval_yaws(yaws)
+    index = int(np.argmin(errors))
+    if errors[index] < best_error:
+        best_yaw, best_error, best_row = float(yaws[index]), float(errors[index]), bboxes[index]
+    lap_stage(stats, "coarseGrid")
+
+    # The scalar fine pass re-centres its window on every improvement, so it is
+    # replayed in chunks: evaluate the rest of the window, jump to the first
+    # improvement, re-centre and continue from the next index.
+    fine_span = max(1.0, step * 2.0)
+    fine_step = max(0.1, step / 8.0)
+    fine_count = int(math.ceil((fine_span * 2.0) / fine_step)) + 1
+    start = 0
+    while start < fine_count:
+        indices = np.arange(start, fine_count, dtype=np.float64)
+        yaws = best_yaw - fine_span + indices * fine_step
+        errors, bboxes = eval_yaws(yaws)
+        improved = np.flatnonzero(errors < best_error)
+        if improved.size == 0:
+            break
+        first = int(improved[0])
+        best_yaw, best_error, best_row = float(yaws[first]), float(errors[first]), bboxes[first]
+        start += first + 1
+
+    best_bbox = _bbox_dict(best_row.tolist()) if best_row is not None else None
+    if symmetry_period_deg < 360.0:
+        best_yaw = select_equivalent_yaw(best_yaw, symmetry_period_deg, reference_yaw_deg)
+    normalized_yaw = ((best_yaw + 180.0) % 360.0) - 180.0
+    return normalized_yaw, best_error, best_bbox
+
+
+def _parse_detection_arrays(detections: Any) -> tuple[list[list[float]], list[tuple[float, float]]]:
+    if isinstance(detections, dict):
+        raw_bboxes = np.asarray(detections.get("bbox"), dtype=np.float64)
+        if raw_bboxes.ndim != 2 or raw_bboxes.shape[1] != 4:
+            raise ValueError("detections.bbox debe ser un arreglo (N, 4) de x, y, width, height")
+        bboxes = [[clamp01(float(value)) for value in row] for row in raw_bboxes]
+        raw_anchors = detections.get("anchorUV")
+        if raw_anchors is None:
+            anchors = [(clamp01(row[0] + row[2] * 0.5), clamp01(row[1] + row[3])) for row in raw_bboxes.tolist()]
+        else:
+            anchor_array = np.asarray(raw_anchors, dtype=np.float64)
+            if anchor_array.shape != (raw_bboxes.shape[0], 2):
+                raise ValueError("detections.anchorUV debe ser un arreglo (N, 2)")
+            anchors = [(clamp01(u), clamp01(v)) for u, v in anchor_array.tolist()]
+        return bboxes, anchors
+
+    if not isinstance(detections, (list, tuple)):
+        raise ValueError("detections debe ser una lista de detecciones o un dict de arreglos")
+    bboxes = []
+    anchors = []
+    for index, detection in enumerate(detections):
+        if not isinstance(detection, dict):
+            raise ValueError(f"detections[{index}] debe ser un objeto")
+        bbox = parse_bbox(detection)
+        bboxes.append([bbox["x"], bbox["y"], bbox["width"], bbox["height"]])
+        anchors.append(parse_anchor_uv(detection))
+    return bboxes, anchors
+
+
+def _parse_objects(objects: Any, count: int) -> list[dict[str, Any]]:
+    if isinstance(objects, dict):
+        return [objects] * count
+    if not isinstance(objects, (list, tuple)) or len(objects) != count:
+        raise ValueError("objects debe ser un objeto o una lista alineada con detections")
+    for index, obj in enumerate(objects):
+        if not isinstance(obj, dict):
+            raise ValueError(f"objects[{index}] debe ser un objeto")
+    return list(objects)
+
+
+def _bbox_dict(row: Sequence[float]) -> dict[str, float]:
+    return {"x": row[0], "y": row[1], "width": row[2], "height": row[3]}
+
+
+def lift_cuboids_batch(
+    camera: dict[str, Any] | CameraModel,
+    detections: Any,
+    objects: Any,
+    config: dict[str, Any] | None = None,
+    dtype: Any = None,
+) -> list[dict[str, Any]]:
+    """
+    Lift many detections seen by one camera in a single call.
+
+    Args:
+        camera: Camera dict, as in lift_cuboid payloads, or a CameraModel.
+        detections: List of detection dicts, or a dict of arrays with
+            "bbox" (N, 4) and optional "anchorUV" (N, 2).
+        objects: One object dict shared by every detection, or a list
+            aligned with detections.
+        config: lift_cuboid config, shared by every detection.
+        dtype: float32 or float64; defaults to config["batchDtype"] or float64.
+
+    config["batchAnchorMapping"] = "homography" maps anchors through the
+    cached floor homography instead of one ray per anchor; results agree with
+    the ray path to floating-point rounding.
+
+    Returns:
+        One lift_cuboid-shaped result per detection, in input order.
+    """
+    if not isinstance(camera, (dict, CameraModel)):
+        raise ValueError("camera es requerido")
+    camera = camera_model(camera)
+    if not isinstance(config, dict):
+        config = {}
+    dtype = resolve_dtype(dtype if dtype is not None else config.get("batchDtype"))
+
+    bboxes, anchors = _parse_detection_arrays(detections)
+    count = len(bboxes)
+    if count == 0:
+        return []
+    object_list = _parse_objects(objects, count)
+    sizes = [parse_object_size(obj) for obj in object_list]
+    elevations = [get_number(obj, ["elevationM", "elevation"], 0.0) or 0.0 for obj in object_list]
+    yaw_hints = [get_number(obj, ["yawDeg", "rotationDeg", "yaw"], None) for obj in object_list]
+
+    floor_y = get_number(config, ["floorY", "floor_y"], 0.0) or 0.0
+    settings = [FitSettings(config, size) for size in sizes]
+
+    cam = ArrayCamera(camera, dtype)
+    bbox_array = np.asarray(bboxes, dtype=dtype)
+    plane_y = np.asarray([floor_y + elevation for elevation in elevations], dtype=dtype)
+    width = np.asarray([size["width"] for size in sizes], dtype=dtype)
+    depth = np.asarray([size["depth"] for size in sizes], dtype=dtype)
+    height = np.asarray([size["height"] for size in sizes], dtype=dtype)
+
+    anchor_mapping = str(config.get("batchAnchorMapping", "ray"))
+    if anchor_mapping not in ANCHOR_MAPPINGS:
+        raise ValueError(f"batchAnchorMapping invalido: {anchor_mapping!r}")
+    anchor_uv = np.asarray(anchors, dtype=dtype)
+    if anchor_mapping == "homography":
+        anchor_world, valid = anchors_via_homography(camera, anchor_uv, plane_y)
+    else:
+        directions = rays_from_uv(cam, anchor_uv)
+        anchor_world, valid = intersect_rays_with_floor(cam.origin, directions, plane_y)
+    if not valid.all():
+        index = int(np.argmin(valid))
+        raise ValueError(f"detections[{index}]: no se pudo intersectar rayo con plano de piso")
+
+    center_x = anchor_world[:, 0].copy()
+    center_z = anchor_world[:, 2].copy()
+    yaw_deg = np.asarray([hint if hint is not None else 0.0 for hint in yaw_hints], dtype=dtype)
+    center_offsets = [0.0] * count
+    fit_errors: list[float | None] = [None] * count
+    fitted_bboxes: list[dict[str, float] | None] = [None] * count
+    fit_stats: list[FitStats | None] = [None] * count
+
+    fit_yaw = bool(config.get("fitYawFromBBox", False))
+    if fit_yaw:
+        # Fitting is a per-detection search; the anchors above are already batched.
+        anchors_world = anchor_world.tolist()
+        for index in range(count):
+            anchor = (anchors_world[index][0], anchors_world[index][1], anchors_world[index][2])
+            pose = fit_pose(
+                camera,
+                _bbox_dict(bboxes[index]),
+                anchor,
+                sizes[index],
+                floor_y,
+                elevations[index],
+                yaw_hints[index],
+                settings[index],
+                config,
+            )
+            yaw_deg[index] = pose.yaw_deg
+            center_x[index] = pose.center_x
+            center_z[index] = pose.center_z
+            center_offsets[index] = pose.center_offset_m
+            fit_errors[index] = pose.error
+            fitted_bboxes[index] = pose.projected_bbox
+            fit_stats[index] = pose.stats
+
+    corners = box_corners(center_x, center_z, width, depth, height, yaw_deg, plane_y)
+    if not fit_yaw:
+        projected_array, projected_valid = projected_bboxes(corners, cam)
+        error_array = bbox_fit_errors(bbox_array, projected_array)
+        projected_rows = projected_array.tolist()
+        error_rows = error_array.tolist()
+        valid_rows = projected_valid.tolist()
+        for index in range(count):
+            if valid_rows[index]:
+                fitted_bboxes[index] = _bbox_dict(projected_rows[index])
+                fit_errors[index] = error_rows[index]
+
+    anchor_rows = anchor_world.tolist()
+    center_x_rows = center_x.tolist()
+    center_z_rows = center_z.tolist()
+    plane_rows = plane_y.tolist()
+    yaw_rows = yaw_deg.tolist()
+    corner_rows = corners.tolist()
+
+    results: list[dict[str, Any]] = []
+    for index in range(count):
+        results.append(
+            build_lift_output(
+                anchor_uv=anchors[index],
+                bbox=_bbox_dict(bboxes[index]),
+                size=sizes[index],
+                anchor_world=anchor_rows[index],
+                center_world_x=center_x_rows[index],
+                center_world_z=center_z_rows[index],
+                base_y=plane_rows[index],
+                center_offset_m=center_offsets[index],
+                yaw_deg=yaw_rows[index],
+                projected_bbox=fitted_bboxes[index],
+                fit_block=build_fit_block(settings[index], fit_errors[index], fit_stats[index]),
+                corners=corner_rows[index],
+            )
+        )
+    return results